@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+Runner = Callable[[], None]
+Prepare = Callable[[int], Runner]
+
+
+@dataclass
+class BenchmarkResult:
+    case: str
+    accesses: int
+    capacity: int
+    measured_accesses: int
+    seconds: float
+    accesses_per_sec: float
+    peak_bytes: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return result_key(self.case, self.accesses, self.capacity)
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+
+def result_key(case: str, accesses: int, capacity: int) -> str:
+    return f"{case}/n={accesses}/cap={capacity}"
+
+
+def time_run(run: Runner) -> float:
+    began = time.perf_counter()
+    run()
+    return time.perf_counter() - began
+
+
+def measure(prepare: Prepare, accesses: int, budget: float, start: int = 1000, growth: int = 8):
+    """Time ``prepare(n)()`` for the largest n <= accesses that fits the budget.
+
+    The run is repeated with a growing prefix of the trace until either all
+    accesses were measured or the next size would exceed ``budget`` seconds,
+    so quadratic policies still report a rate at large scales.
+    """
+    n = min(accesses, start)
+    while True:
+        elapsed = time_run(prepare(n))
+        if n >= accesses or elapsed * growth > budget:
+            return n, elapsed
+        n = min(accesses, n * growth)
+
+
+def measure_peak_memory(prepare: Prepare, n: int) -> int:
+    tracemalloc.start()
+    try:
+        prepare(n)()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_case(
+    name: str, prepare: Prepare, accesses: int, capacity: int, budget: float,
+    memory: bool = True, measured: Optional[int] = None
+):
+    """Benchmark one case; ``measured`` fixes the prefix, e.g. to the baseline's, ignoring the budget."""
+    if measured is None:
+        n, elapsed = measure(prepare, accesses, budget)
+    else:
+        n = min(accesses, measured)
+        elapsed = time_run(prepare(n))
+    return BenchmarkResult(
+        case=name,
+        accesses=accesses,
+        capacity=capacity,
+        measured_accesses=n,
+        seconds=elapsed,
+        accesses_per_sec=n / elapsed if elapsed > 0 else float("inf"),
+        peak_bytes=measure_peak_memory(prepare, n) if memory else None,
+    )
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_results(path: str, results: List[BenchmarkResult]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = {
+        "environment": environment(),
+        "results": {r.key: asdict(r) for r in results},
+    }
+    with open(path, "w") as fh:
+        json.dump(payload, fh, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path) as fh:
+        return json.load(fh)["results"]
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, dict], tolerance: float = 0.15) -> List[Regression]:
+    """Report throughput drops and peak-memory growth beyond ``tolerance``.
+
+    Rates are only comparable on the same prefix of the trace. A case that
+    fit a shorter prefix into the budget than the baseline did is reported
+    as a ``measured_accesses`` regression; see ``longer_prefixes`` for the
+    other way round.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        if result.measured_accesses != base["measured_accesses"]:
+            if result.measured_accesses < base["measured_accesses"]:
+                regressions.append(
+                    Regression(result.key, "measured_accesses", base["measured_accesses"], result.measured_accesses)
+                )
+            continue
+
+        if result.accesses_per_sec < base["accesses_per_sec"] * (1 - tolerance):
+            regressions.append(Regression(result.key, "accesses_per_sec", base["accesses_per_sec"], result.accesses_per_sec))
+
+        base_peak = base.get("peak_bytes")
+        if result.peak_bytes is not None and base_peak and result.peak_bytes > base_peak * (1 + tolerance):
+            regressions.append(Regression(result.key, "peak_bytes", base_peak, result.peak_bytes))
+    return regressions
+
+
+def longer_prefixes(results: List[BenchmarkResult], baseline: Dict[str, dict]) -> List[str]:
+    """Keys of cases that measured more accesses than the baseline, which compare() skips."""
+    return [
+        r.key for r in results
+        if r.key in baseline and r.measured_accesses > baseline[r.key]["measured_accesses"]
+    ]
+
+
+def format_result(result: BenchmarkResult) -> str:
+    partial = "" if result.measured_accesses == result.accesses else f" (measured {result.measured_accesses})"
+    memory = "" if result.peak_bytes is None else f" | peak {result.peak_bytes / 1024:,.0f} KiB"
+    return f"{result.key:<48} {result.accesses_per_sec:>14,.0f} acc/s{memory}{partial}"
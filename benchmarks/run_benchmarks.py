@@ -0,0 +1,229 @@
+"""Throughput benchmarks for the engine, controller, policies and TLB.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --scale quick
+    python -m benchmarks.run_benchmarks --scale full --save-baseline
+
+baseline.json is committed and holds the quick scale. Regenerate it with
+``--scale quick --save-baseline`` when a change is meant to move the numbers,
+and commit it with that change. Rates depend on the machine, so compare runs
+made on the same one.
+"""
+import argparse
+import os
+import sys
+from typing import Callable, Dict, List
+
+from benchmarks.harness import (
+    compare, format_result, load_results, longer_prefixes, result_key, run_case, save_results
+)
+from simulator.registry import available_policies, get_policy, policy_info
+from simulator.simulation_controller import SimulationController
+from simulator.simulation_engine import SimulationEngine
+from simulator.tlb import TLB
+from simulator.trace import Trace
+from simulator.vm_config import VMConfig
+from simulator.workload import MixtureWorkload, SequentialWorkload, ZipfWorkload, generate_trace
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+OFFSET_BITS = 12
+TLB_ENTRIES = 64
+SEED = 1234
+
+SCALES = {
+    "quick": {"accesses": [1_000, 100_000], "capacity": [4, 256]},
+    "full": {"accesses": [1_000, 100_000, 1_000_000, 10_000_000], "capacity": [4, 64, 4096, 65536]},
+}
+
+def make_config(frames: int) -> VMConfig:
+    return VMConfig(
+        virtual_memory_size=1 << 48,
+        physical_memory_size=frames << OFFSET_BITS,
+        offset_bits=OFFSET_BITS,
+    )
+
+
+def make_trace(accesses: int, capacity: int) -> Trace:
+    pages = max(16, capacity * 4)
+    workload = MixtureWorkload([
+        (ZipfWorkload(pages, alpha=0.9), 0.7),
+        (SequentialWorkload(pages * 4, base_page=pages), 0.3),
+    ], burst=16)
+    return generate_trace(workload, accesses, 1 << OFFSET_BITS, seed=SEED)
+
+
+def engine_step_case(policy_cls):
+    def build(trace: Trace, capacity: int):
+        cfg = make_config(capacity)
+
+        def prepare(n):
+            engine = SimulationEngine(cfg, trace[:n], policy_cls(), TLB_ENTRIES)
+
+            def run():
+                step = engine.step
+                for _ in range(n):
+                    step()
+            return run
+        return prepare
+    return build
+
+
+def controller_run_all_case(policy_cls):
+    def build(trace: Trace, capacity: int):
+        cfg = make_config(capacity)
+
+        def prepare(n):
+            controller = SimulationController(cfg, trace[:n], policy_cls(), TLB_ENTRIES)
+            return controller.run_all
+        return prepare
+    return build
+
+
+def fast_run_case(policy_cls):
+    def build(trace: Trace, capacity: int):
+        cfg = make_config(capacity)
+
+        def prepare(n):
+            controller = SimulationController(cfg, trace[:n], policy_cls(), TLB_ENTRIES, engine_mode="fast")
+            return controller.run
+        return prepare
+    return build
+
+
+def policy_case(policy_cls):
+    def build(trace: Trace, capacity: int):
+        pages = trace.pages(OFFSET_BITS).tolist()
+
+        def prepare(n):
+            policy = policy_cls()
+            frames = [None] * capacity
+            resident: Dict[int, int] = {}
+
+            def run():
+                free = 0
+                for i in range(n):
+                    page = pages[i]
+                    if page in resident:
+                        continue
+                    if free < capacity:
+                        index = free
+                        free += 1
+                    else:
+                        index = policy.select_victim(frames, pages, i)
+                        del resident[frames[index]]
+                    frames[index] = page
+                    resident[page] = index
+            return run
+        return prepare
+    return build
+
+
+def tlb_case(ways=None):
+    def build(trace: Trace, capacity: int):
+        return tlb_prepare(trace, capacity, ways if ways is not None and capacity % ways == 0 else None)
+    return build
+
+
+def tlb_prepare(trace: Trace, capacity: int, ways):
+    pages = trace.pages(OFFSET_BITS).tolist()
+
+    def prepare(n):
+        tlb = TLB(capacity, ways)
+
+        def run():
+            lookup = tlb.lookup
+            insert = tlb.insert
+            for i in range(n):
+                page = pages[i]
+                if lookup(page, i) is None:
+                    insert(page, page, i)
+        return run
+    return prepare
+
+
+def build_cases() -> Dict[str, Callable]:
+    cases = {}
+    # Every registered policy, including third-party ones from entry points.
+    for name in available_policies():
+        policy_cls = get_policy(name)
+        cases[f"engine.step[{name}]"] = engine_step_case(policy_cls)
+        cases[f"controller.run_all[{name}]"] = controller_run_all_case(policy_cls)
+        if policy_info(name).fast_kernel is not None:
+            cases[f"controller.run[fast-{name}]"] = fast_run_case(policy_cls)
+        cases[f"policy[{name}]"] = policy_case(policy_cls)
+    cases["tlb"] = tlb_case()
+    cases["tlb[4-way]"] = tlb_case(4)
+    return cases
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run simulator throughput benchmarks.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    parser.add_argument("--accesses", type=int, nargs="+", help="Override the trace lengths of the scale.")
+    parser.add_argument("--capacity", type=int, nargs="+", help="Override the frame / TLB entry counts of the scale.")
+    parser.add_argument("--cases", nargs="+", help="Only run cases whose name contains one of these strings.")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds allowed per case before it is measured on a prefix.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    scale = SCALES[args.scale]
+    accesses_list: List[int] = args.accesses or scale["accesses"]
+    capacities: List[int] = args.capacity or scale["capacity"]
+
+    cases = build_cases()
+    if args.cases:
+        cases = {name: build for name, build in cases.items() if any(f in name for f in args.cases)}
+
+    # Cases in the baseline are measured on the same prefix of the trace as
+    # there, so their rates stay comparable however much slower they got.
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        baseline = load_results(args.baseline)
+
+    results = []
+    for capacity in capacities:
+        for accesses in accesses_list:
+            trace = make_trace(accesses, capacity)
+            for name, build in cases.items():
+                measured = baseline.get(result_key(name, accesses, capacity), {}).get("measured_accesses")
+                result = run_case(
+                    name, build(trace, capacity), accesses, capacity, args.budget,
+                    memory=not args.no_memory, measured=measured
+                )
+                results.append(result)
+                print(format_result(result), flush=True)
+
+    save_results(args.output, results)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("No baseline found; run with --save-baseline to create one.")
+        return 0
+
+    for key in longer_prefixes(results, baseline):
+        print(f"NOTE {key}: measured on a longer prefix than the baseline, not compared.")
+    regressions = compare(results, baseline, args.tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r.key} {r.metric}: {r.baseline:,.0f} -> {r.current:,.0f} ({r.change:+.1%})")
+    if not regressions:
+        print("No regressions against baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,6 @@
-from simulator.replacement_policies.fifo import FIFOAlgorithm
 from simulator.vm_config import VMConfig
 from simulator.simulation_controller import SimulationController
-from simulator.replacement_policies.lru import LRUAlgorithm
-from simulator.replacement_policies.optimal import OptimalAlgorithm
+from simulator.registry import create_policy
 
 def main():
 
@@ -33,7 +31,7 @@ def main():
     controller = SimulationController(
         vm,
         reference,
-        policy=OptimalAlgorithm(),
+        policy=create_policy("optimal"),
         tlb_entries=10
     )
 
@@ -44,7 +42,7 @@ def main():
             f"page={s.page} offset={s.offset} | "
             f"TLB={'HIT' if s.tlb_hit else 'MISS'} | "
             f"{'HIT' if s.hit else 'FAULT'} | "
-            f"frames={s.frames_snapshot} "
+            f"frames={controller.frames_at(s.step_index)} "
             f"{'(evicted ' + str(s.evicted_page) + ')' if s.evicted_page else ''}"
         )
 
@@ -1,9 +1,4 @@
 import sys
-import os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-if current_dir not in sys.path:
-    sys.path.append(current_dir)
 
 try:
     import pygame
@@ -0,0 +1 @@
+from simulator.registry import available_policies, create_policy, get_policy
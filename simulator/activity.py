@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import List, Tuple
+
+import numpy as np
+
+from simulator.simulation_step_result import SimulationStepResult
+
+
+class FrameActivity:
+    """Per-frame state for aggregate views, updated in O(1) per step.
+
+    Tracks whether each frame holds a page, whether it was written since it
+    was loaded, how often it was accessed since then and when it was last
+    accessed.
+    """
+
+    def __init__(self, num_frames: int):
+        self.resident = np.zeros(num_frames, dtype=bool)
+        self.dirty = np.zeros(num_frames, dtype=bool)
+        self.accesses = np.zeros(num_frames, dtype=np.int64)
+        self.last_access = np.full(num_frames, -1, dtype=np.int64)
+        self.steps = 0
+
+    def __len__(self) -> int:
+        return len(self.resident)
+
+    def record(self, result: SimulationStepResult):
+        for frame_index, page in result.frame_deltas():
+            self.resident[frame_index] = page is not None
+            self.dirty[frame_index] = False
+            self.accesses[frame_index] = 0
+            self.last_access[frame_index] = -1
+
+        frame_index = result.frame_index
+        if frame_index is not None:
+            self.accesses[frame_index] += 1
+            self.last_access[frame_index] = result.step_index
+            if result.operation == "W":
+                self.dirty[frame_index] = True
+        self.steps = result.step_index + 1
+
+    def colors(self) -> np.ndarray:
+        """RGB per frame: red for dirty, green for access frequency (log scale), blue for recency."""
+        n = len(self)
+        rgb = np.full((n, 3), 60, dtype=np.uint8)
+        if not n:
+            return rgb
+
+        freq = np.log1p(self.accesses)
+        peak = freq.max()
+        if peak > 0:
+            rgb[:, 1] = (60 + 195 * freq / peak).astype(np.uint8)
+        # A frame accessed a full turnover of frames ago has faded out.
+        age = self.steps - self.last_access
+        recency = np.where(self.last_access >= 0, np.clip(1 - age / max(n, 1), 0, 1), 0)
+        rgb[:, 2] = (60 + 195 * recency).astype(np.uint8)
+        rgb[self.dirty, 0] = 230
+        rgb[~self.resident] = 30
+        return rgb
+
+    def heatmap(self, width: int, height: int) -> Tuple[np.ndarray, int]:
+        """Lay ``colors()`` out in at most ``width`` x ``height`` cells.
+
+        Returns the image indexed [x, y] like ``pygame.surfarray`` and the
+        number of consecutive frames per cell; a cell that covers several
+        frames shows their per-channel maximum.
+        """
+        rgb = self.colors()
+        per_cell = max(1, -(-len(rgb) // (width * height)))
+        if per_cell > 1:
+            pad = -len(rgb) % per_cell
+            rgb = np.concatenate([rgb, np.zeros((pad, 3), dtype=np.uint8)])
+            rgb = rgb.reshape(-1, per_cell, 3).max(axis=1)
+
+        cells = max(1, len(rgb))
+        cols = min(width, math.ceil(math.sqrt(cells * width / height)))
+        rows = -(-cells // cols)
+        if rows > height:
+            cols = -(-cells // height)
+            rows = -(-cells // cols)
+        grid = np.zeros((rows * cols, 3), dtype=np.uint8)
+        grid[:len(rgb)] = rgb
+        return grid.reshape(rows, cols, 3).transpose(1, 0, 2), per_cell
+
+
+class RateTimeline:
+    """Fault and TLB hit rates over consecutive windows of ``window`` steps.
+
+    Only the last ``capacity`` windows are kept, so the timeline has a fixed
+    size however long the run gets.
+    """
+
+    def __init__(self, window: int = 64, capacity: int = 120):
+        if window <= 0 or capacity <= 0:
+            raise ValueError("Window and capacity must be positive.")
+        self.window = window
+        self.fault_rates: deque[float] = deque(maxlen=capacity)
+        self.tlb_hit_rates: deque[float] = deque(maxlen=capacity)
+        self._steps = 0
+        self._faults = 0
+        self._tlb_hits = 0
+
+    def record(self, result: SimulationStepResult):
+        self._steps += 1
+        self._faults += result.fault
+        self._tlb_hits += result.tlb_hit
+        if self._steps == self.window:
+            self.fault_rates.append(self._faults / self._steps)
+            self.tlb_hit_rates.append(self._tlb_hits / self._steps)
+            self._steps = self._faults = self._tlb_hits = 0
+
+    def points(self) -> Tuple[List[float], List[float]]:
+        """Fault and TLB hit rates per window, including the window in progress."""
+        faults, tlb_hits = list(self.fault_rates), list(self.tlb_hit_rates)
+        if self._steps:
+            faults.append(self._faults / self._steps)
+            tlb_hits.append(self._tlb_hits / self._steps)
+        return faults, tlb_hits
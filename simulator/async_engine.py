@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, replace
+from heapq import heappop, heappush
+from itertools import count
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from simulator.base_policy import ReplacementPolicy
+from simulator.simulation_engine import SimulationEngine
+from simulator.statistics_tracker import StatisticsTracker
+from simulator.tlb import TLB
+from simulator.vm_config import VMConfig
+
+# Event kinds. At equal times completions run first, so a process woken by a
+# page-in can use the page before another access evicts it.
+IO_DONE = 0
+ISSUE = 1
+
+
+@dataclass
+class ProcessStats:
+    pid: int
+    accesses: int = 0
+    page_faults: int = 0
+    blocked_time: int = 0
+    finish_time: int = 0
+
+
+@dataclass
+class AsyncReport:
+    queue_depth: int
+    io_latency: int
+    makespan: int
+    accesses: int
+    page_faults: int
+    io_requests: int
+    coalesced_faults: int
+    total_io_wait: int
+    max_queue_length: int
+    processes: List[ProcessStats]
+
+    @property
+    def throughput(self) -> float:
+        """Accesses completed per time unit."""
+        return self.accesses / max(1, self.makespan)
+
+    @property
+    def device_utilization(self) -> float:
+        return self.io_requests * self.io_latency / max(1, self.queue_depth * self.makespan)
+
+    @property
+    def mean_io_wait(self) -> float:
+        """Mean time from submitting a page-in to its completion, queueing included."""
+        return self.total_io_wait / max(1, self.io_requests)
+
+
+class AsyncSimulation:
+    """Event-driven run of several processes over one SimulationEngine.
+
+    Every process issues its accesses in order. A resident page costs
+    ``hit_latency``. A page fault sends a page-in to an I/O device that serves
+    up to ``queue_depth`` requests at a time, each taking ``io_latency``;
+    further requests wait in FIFO order. The faulting process blocks until its
+    page arrives while the other processes keep running, and a fault on a page
+    that is already being read waits for that read instead of issuing another.
+
+    Each process gets its own ``virtual_memory_size`` slice of the address
+    space unless ``shared_address_space`` is set (threads of one process).
+    Accesses reach the engine in the order they complete, so the engine's
+    reference string is built as the run goes and Optimal replacement, which
+    needs the whole string up front, is rejected.
+    """
+
+    def __init__(
+        self,
+        vm_config: VMConfig,
+        traces: Sequence,
+        policy: ReplacementPolicy,
+        tlb_entries: int,
+        queue_depth: int = 1,
+        io_latency: int = 1000,
+        hit_latency: int = 1,
+        shared_address_space: bool = False,
+        tlb_factory: Optional[Callable[[], TLB]] = None
+    ):
+        if type(policy).needs_future_knowledge:
+            raise ValueError(
+                f"{type(policy).display_name or type(policy).__name__} needs the whole reference string up front."
+            )
+        if queue_depth <= 0:
+            raise ValueError("The I/O queue depth must be positive.")
+
+        self.traces = list(traces)
+        self.queue_depth = queue_depth
+        self.io_latency = io_latency
+        self.hit_latency = hit_latency
+        self.shared_address_space = shared_address_space
+
+        if shared_address_space:
+            self._span = 0
+        else:
+            self._span = vm_config.virtual_memory_size
+            vm_config = replace(vm_config, virtual_memory_size=self._span * max(1, len(self.traces)))
+        self.cfg = vm_config
+
+        self.reference_string: List[Tuple[int, str]] = []
+        self.engine = SimulationEngine(
+            vm_config, self.reference_string, policy, tlb_entries, tlb_factory=tlb_factory
+        )
+        self.stats = StatisticsTracker()
+        self.stats.attach_tlb(self.engine.tlb)
+        self.processes = [ProcessStats(pid) for pid in range(len(self.traces))]
+
+        self._events: List[Tuple[int, int, int, int]] = []
+        self._seq = count()
+        self._position = [0] * len(self.traces)
+        self._blocked_since = [0] * len(self.traces)
+        # Page being read -> processes waiting for it, the one that faulted first leading.
+        self._in_flight: Dict[int, List[int]] = {}
+        self._io_queue: Deque[Tuple[int, int]] = deque()
+        self._busy = 0
+
+        self.io_requests = 0
+        self.coalesced_faults = 0
+        self.total_io_wait = 0
+        self.max_queue_length = 0
+
+    def _push(self, time: int, kind: int, value: int):
+        heappush(self._events, (time, kind, next(self._seq), value))
+
+    def _address(self, pid: int) -> Tuple[int, str]:
+        address, operation = self.traces[pid][self._position[pid]]
+        return address + pid * self._span, operation
+
+    def _access(self, pid: int, time: int):
+        self.reference_string.append(self._address(pid))
+        result = self.engine.step()
+        self.stats.record_step(result)
+
+        proc = self.processes[pid]
+        proc.accesses += 1
+        if result.fault:
+            proc.page_faults += 1
+
+        self._position[pid] += 1
+        done = time + self.hit_latency
+        if self._position[pid] < len(self.traces[pid]):
+            self._push(done, ISSUE, pid)
+        else:
+            proc.finish_time = done
+
+    def _submit(self, page: int, time: int):
+        self.io_requests += 1
+        if self._busy < self.queue_depth:
+            self._busy += 1
+            self.total_io_wait += self.io_latency
+            self._push(time + self.io_latency, IO_DONE, page)
+        else:
+            self._io_queue.append((page, time))
+            self.max_queue_length = max(self.max_queue_length, len(self._io_queue))
+
+    def _issue(self, pid: int, time: int):
+        address, _ = self._address(pid)
+        page = address >> self.cfg.offset_bits
+        pte = self.engine.page_table.get(page)
+        if pte is not None and pte.present:
+            self._access(pid, time)
+            return
+
+        self._blocked_since[pid] = time
+        waiters = self._in_flight.get(page)
+        if waiters is not None:
+            waiters.append(pid)
+            self.coalesced_faults += 1
+            return
+        self._in_flight[page] = [pid]
+        self._submit(page, time)
+
+    def _complete(self, page: int, time: int):
+        self._busy -= 1
+        if self._io_queue:
+            queued, submitted = self._io_queue.popleft()
+            self._busy += 1
+            self.total_io_wait += time + self.io_latency - submitted
+            self._push(time + self.io_latency, IO_DONE, queued)
+
+        first, *others = self._in_flight.pop(page)
+        for pid in (first, *others):
+            self.processes[pid].blocked_time += time - self._blocked_since[pid]
+        # The leading access installs the page; the others retry and normally hit.
+        self._access(first, time)
+        for pid in others:
+            self._push(time, ISSUE, pid)
+
+    def run(self) -> AsyncReport:
+        for pid, trace in enumerate(self.traces):
+            if len(trace):
+                self._push(0, ISSUE, pid)
+
+        events = self._events
+        while events:
+            time, kind, _, value = heappop(events)
+            if kind == IO_DONE:
+                self._complete(value, time)
+            else:
+                self._issue(value, time)
+
+        return AsyncReport(
+            queue_depth=self.queue_depth,
+            io_latency=self.io_latency,
+            makespan=max((p.finish_time for p in self.processes), default=0),
+            accesses=self.stats.total_accesses,
+            page_faults=self.stats.page_faults,
+            io_requests=self.io_requests,
+            coalesced_faults=self.coalesced_faults,
+            total_io_wait=self.total_io_wait,
+            max_queue_length=self.max_queue_length,
+            processes=self.processes,
+        )
+
+
+def compare_queue_depths(
+    vm_config: VMConfig,
+    traces: Sequence,
+    policy_factory: Callable[[], ReplacementPolicy],
+    tlb_entries: int,
+    depths: Sequence[int] = (1, 2, 4, 8, 16),
+    **kwargs
+) -> List[AsyncReport]:
+    """Run the same traces once per queue depth with a fresh policy each time."""
+    return [
+        AsyncSimulation(vm_config, traces, policy_factory(), tlb_entries, queue_depth=depth, **kwargs).run()
+        for depth in depths
+    ]
+
+
+def format_async_reports(reports: Sequence[AsyncReport]) -> str:
+    lines = [f"{'depth':>6}{'makespan':>12}{'acc/kt':>10}{'faults':>9}{'coalesced':>11}{'util':>8}{'mean wait':>11}{'max queue':>11}"]
+    for r in reports:
+        lines.append(
+            f"{r.queue_depth:>6}{r.makespan:>12,}{r.throughput * 1000:>10.1f}{r.page_faults:>9,}"
+            f"{r.coalesced_faults:>11,}{r.device_utilization:>8.1%}{r.mean_io_wait:>11,.0f}{r.max_queue_length:>11,}"
+        )
+    return "\n".join(lines)
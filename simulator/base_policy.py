@@ -5,6 +5,16 @@ from typing import Optional
 
 
 class ReplacementPolicy(ABC):
+    # Metadata reported by simulator.registry.
+    display_name: Optional[str] = None
+    needs_future_knowledge = False
+    # Incremental policies get on_access() for every demand access and can
+    # keep their own bookkeeping instead of scanning the reference string.
+    incremental = False
+    # Kernel in simulator.fast_engine that reproduces this exact class. Not
+    # inherited: a subclass that changes behaviour must opt in again.
+    fast_kernel: Optional[str] = None
+
     @abstractmethod
     def select_victim(
         self,
@@ -13,3 +23,21 @@ class ReplacementPolicy(ABC):
         current_index: int,
     ) -> int:
         raise NotImplementedError
+
+    def select_victim_among(
+        self,
+        frames: list[Optional[int]],
+        reference_string: list[int],
+        current_index: int,
+        candidates: list[int],
+    ) -> int:
+        """Like select_victim, but the victim must be one of the ``candidates`` frame indices.
+
+        The default shows select_victim only the candidate frames. Policies that
+        keep state per frame index must override it.
+        """
+        chosen = self.select_victim([frames[i] for i in candidates], reference_string, current_index)
+        return candidates[chosen]
+
+    def on_access(self, frame_index: int, page: int, step: int, fault: bool) -> None:
+        """Called after each demand access when ``incremental`` is set."""
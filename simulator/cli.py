@@ -0,0 +1,348 @@
+"""Headless command-line runner.
+
+    python -m simulator trace.txt --physical 65536 --offset-bits 12 --policy lru
+    python -m simulator trace.vmt --format json --output summary.json
+    python -m simulator trace.txt --steps --format csv > steps.csv
+    python -m simulator trace.vmt --export run1 --columns step fault evicted_page
+    python -m simulator trace.vmt --compare fifo lru optimal
+    python -m simulator trace.vmt --mrc --sample-rate 0.01 --exact
+
+Trace files are either binary traces written by ``Trace.save`` or text
+traces as read by ``simulator.trace_parser``, e.g. one ``address [R|W|X]``
+per line. With ``--steps`` the output holds only the step records, so it
+stays valid CSV or JSON lines; the run summary then goes to stderr as text.
+This module must not import pygame or anything under ``ui``.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import Dict, TextIO
+
+from simulator.comparison import PolicyComparison
+from simulator.mrc import default_sizes, exact_lru_curve, miniature_curve, shards_lru_curve
+from simulator.registry import available_policies, create_policy, fastest_engine
+from simulator.results import STEP_COLUMNS, ColumnarStepWriter, CsvStepWriter, JsonLinesStepWriter
+from simulator.simulation_controller import SimulationController
+from simulator.trace_parser import TraceParser, parse_trace_file
+from simulator.vm_config import VMConfig
+
+FORMATS = ("text", "json", "csv")
+# Per-step results are simulated and written this many at a time.
+STEP_BATCH = 4096
+
+
+def load_reference(path: str):
+    if path == "-":
+        parser = TraceParser()
+        for line in sys.stdin:
+            parser.feed(line)
+        return parser.finish()
+    return parse_trace_file(path)
+
+
+def choose_engine_mode(requested: str, policy_name: str, per_step: bool) -> str:
+    if requested != "auto":
+        return requested
+    return fastest_engine(policy_name, per_step)
+
+
+def summary(controller: SimulationController, elapsed: float) -> Dict[str, object]:
+    stats = controller.stats
+    return {
+        "engine": controller.engine_mode,
+        "policy": type(controller.policy).__name__,
+        "frames": controller.vm_config.num_frames,
+        "tlb_entries": controller.tlb_entries,
+        "accesses": stats.total_accesses,
+        "tlb_hits": stats.tlb_hits,
+        "tlb_misses": stats.tlb_misses,
+        "tlb_hit_ratio": stats.tlb_hit_ratio,
+        "page_hits": stats.page_hits,
+        "page_faults": stats.page_faults,
+        "page_fault_ratio": stats.page_fault_ratio,
+        "disk_writes": stats.disk_writes,
+        "elapsed_s": elapsed,
+        "accesses_per_s": stats.total_accesses / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+class Progress:
+    """Throttled progress line on stderr."""
+
+    def __init__(self, total: int, stream: TextIO, enabled: bool, interval: float = 0.5):
+        self.total = total
+        self.stream = stream
+        self.enabled = enabled
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, done: int, force: bool = False):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = now - self.start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        percent = done / self.total if self.total else 1.0
+        self.stream.write(f"\r{done:,}/{self.total:,} ({percent:.0%}) {rate:,.0f} acc/s")
+        self.stream.flush()
+
+    def finish(self, done: int):
+        if self.enabled:
+            self.update(done, force=True)
+            self.stream.write("\n")
+
+
+class TextStepWriter:
+    """Human-readable per-step lines; always shows the same fields."""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+
+    def write(self, results):
+        lines = []
+        for result in results:
+            evicted = f" (evicted {result.evicted_page})" if result.evicted_page is not None else ""
+            lines.append(
+                f"Step {result.step_index:06d} | VA {result.virtual_address} | "
+                f"page={result.page} offset={result.offset} | "
+                f"TLB={'HIT' if result.tlb_hit else 'MISS'} | "
+                f"{'HIT' if result.hit else 'FAULT'} | frame={result.frame_index}{evicted}\n"
+            )
+        self.out.write("".join(lines))
+
+    def close(self):
+        pass
+
+
+def step_writer(out: TextIO, fmt: str, columns):
+    if fmt == "csv":
+        return CsvStepWriter(out, columns)
+    if fmt == "json":
+        return JsonLinesStepWriter(out, columns)
+    return TextStepWriter(out)
+
+
+def write_summary(out: TextIO, fmt: str, data: Dict[str, object]):
+    if fmt == "json":
+        out.write(json.dumps(data, indent=2) + "\n")
+    elif fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(list(data))
+        writer.writerow(list(data.values()))
+    else:
+        width = max(len(k) for k in data)
+        for key, value in data.items():
+            if isinstance(value, float):
+                value = f"{value:,.4f}" if value < 1 else f"{value:,.2f}"
+            elif isinstance(value, int):
+                value = f"{value:,}"
+            out.write(f"{key:<{width}}  {value}\n")
+
+
+def write_comparison(out: TextIO, fmt: str, comparison: PolicyComparison):
+    rows = comparison.rows()
+    if fmt == "json":
+        out.write(json.dumps(rows, indent=2) + "\n")
+    elif fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        out.write(comparison.table() + "\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simulator", description="Run a virtual memory simulation without the GUI.")
+    parser.add_argument("trace", help="Binary trace file, text trace file, or '-' for text on stdin.")
+    parser.add_argument("--virtual", type=int, default=1 << 32, help="Virtual memory size in bytes.")
+    parser.add_argument("--physical", type=int, default=1 << 24, help="Physical memory size in bytes.")
+    parser.add_argument("--offset-bits", type=int, default=12, help="Page offset bits (page size = 2^bits).")
+    parser.add_argument("--policy", choices=available_policies(), default="lru")
+    parser.add_argument(
+        "--compare", nargs="+", choices=available_policies(), metavar="POLICY",
+        help="Run these policies side by side in one pass instead of --policy.",
+    )
+    parser.add_argument("--mrc", action="store_true", help="Compute a miss-ratio curve for --policy instead of one run.")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Frame counts on the curve (default: powers of two up to --physical).")
+    parser.add_argument("--sample-rate", type=float, help="Approximate the curve from this fraction of pages (SHARDS).")
+    parser.add_argument("--sample-pages", type=int, help="LRU only: sample at most this many distinct pages.")
+    parser.add_argument("--exact", action="store_true", help="Also compute the exact curve and report the error.")
+    parser.add_argument("--tlb", type=int, default=64, help="TLB entries.")
+    parser.add_argument("--format", choices=FORMATS, default="text")
+    parser.add_argument("--steps", action="store_true", help="Write one record per access before the summary.")
+    parser.add_argument(
+        "--columns", nargs="+", choices=list(STEP_COLUMNS), metavar="COLUMN",
+        help=f"Columns for --steps (csv/json) and --export: {', '.join(STEP_COLUMNS)}.",
+    )
+    parser.add_argument("--export", metavar="DIR", help="Write per-step results to a binary columnar result directory.")
+    parser.add_argument("--engine", choices=("auto", "reference", "fast"), default="auto")
+    parser.add_argument("--chunk", type=int, default=100_000, help="Accesses per progress update.")
+    parser.add_argument("--progress", dest="progress", action="store_true", default=None)
+    parser.add_argument("--no-progress", dest="progress", action="store_false")
+    parser.add_argument("--output", help="Write results here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def run(args, out: TextIO, err: TextIO) -> int:
+    try:
+        vm_config = VMConfig(args.virtual, args.physical, args.offset_bits)
+        reference = load_reference(args.trace)
+    except (OSError, ValueError) as e:
+        err.write(f"error: {e}\n")
+        return 2
+    if vm_config.num_frames <= 0 or args.tlb <= 0:
+        err.write("error: need at least one frame and one TLB entry\n")
+        return 2
+
+    if args.compare:
+        return run_comparison(args, vm_config, reference, out, err)
+    if args.mrc:
+        return run_mrc(args, vm_config, reference, out, err)
+
+    policy = create_policy(args.policy)
+    per_step = args.steps or args.export is not None
+    mode = choose_engine_mode(args.engine, args.policy, per_step)
+    if per_step and mode == "fast":
+        err.write("error: per-step output needs the reference engine\n")
+        return 2
+
+    controller = SimulationController(
+        vm_config, reference, policy, args.tlb, record_history=False, engine_mode=mode
+    )
+    total = len(reference)
+    show_progress = args.progress if args.progress is not None else err.isatty()
+    progress = Progress(total, err, show_progress)
+
+    writers = []
+    if args.steps:
+        writers.append(step_writer(out, args.format, args.columns))
+    exporter = ColumnarStepWriter(args.export, args.columns) if args.export is not None else None
+    if exporter is not None:
+        writers.append(exporter)
+
+    start = time.perf_counter()
+    done = 0
+    if per_step:
+        batch_size = min(STEP_BATCH, args.chunk)
+        while not controller.is_finished():
+            batch = []
+            while len(batch) < batch_size and not controller.is_finished():
+                batch.append(controller.step())
+            for writer in writers:
+                writer.write(batch)
+            done += len(batch)
+            progress.update(done)
+    else:
+        while not controller.is_finished():
+            done += controller.run(args.chunk)
+            progress.update(done)
+    elapsed = time.perf_counter() - start
+    progress.finish(done)
+
+    data = summary(controller, elapsed)
+    if exporter is not None:
+        exporter.close(data)
+    if args.steps:
+        writers[0].close()
+        write_summary(err, "text", data)
+    else:
+        write_summary(out, args.format, data)
+    return 0
+
+
+def run_comparison(args, vm_config: VMConfig, reference, out: TextIO, err: TextIO) -> int:
+    if args.steps or args.export is not None:
+        err.write("error: --steps and --export cannot be combined with --compare\n")
+        return 2
+    if args.engine == "fast":
+        err.write("error: --compare picks the engine per policy; use --engine auto or reference\n")
+        return 2
+
+    comparison = PolicyComparison(vm_config, reference, args.compare, args.tlb, engine_mode=args.engine)
+    show_progress = args.progress if args.progress is not None else err.isatty()
+    progress = Progress(len(reference), err, show_progress)
+    done = 0
+    while not comparison.is_finished():
+        done += comparison.run(args.chunk)
+        progress.update(done)
+    progress.finish(done)
+    write_comparison(out, args.format, comparison)
+    return 0
+
+
+def run_mrc(args, vm_config: VMConfig, reference, out: TextIO, err: TextIO) -> int:
+    if args.steps or args.export is not None:
+        err.write("error: --steps and --export cannot be combined with --mrc\n")
+        return 2
+    sampled = args.sample_rate is not None or args.sample_pages is not None
+    if args.sample_pages is not None and args.policy != "lru":
+        err.write("error: --sample-pages is only supported for lru; use --sample-rate\n")
+        return 2
+    sizes = args.sizes or default_sizes(vm_config.num_frames)
+    bits = vm_config.offset_bits
+
+    def exact():
+        if args.policy == "lru":
+            return exact_lru_curve(reference, bits, sizes)
+        return miniature_curve(reference, bits, args.policy, sizes)
+
+    try:
+        if not sampled:
+            curve = exact()
+        elif args.policy == "lru":
+            curve = shards_lru_curve(reference, bits, sizes, args.sample_rate, args.sample_pages)
+        else:
+            curve = miniature_curve(reference, bits, args.policy, sizes, args.sample_rate)
+    except ValueError as e:
+        err.write(f"error: {e}\n")
+        return 2
+    exact_curve = exact() if sampled and args.exact else None
+
+    rows = []
+    for k, size in enumerate(curve.sizes.tolist()):
+        row = {"frames": size, "miss_ratio": float(curve.miss_ratios[k])}
+        if exact_curve is not None:
+            row["exact_miss_ratio"] = float(exact_curve.miss_ratios[k])
+        rows.append(row)
+    error = curve.error(exact_curve) if exact_curve is not None else None
+
+    if args.format == "json":
+        data = {
+            "policy": args.policy, "accesses": curve.accesses, "sampled": curve.sampled,
+            "rate": curve.rate, "curve": rows,
+        }
+        if error is not None:
+            data["error"] = {"mean_abs": error.mean_abs, "max_abs": error.max_abs}
+        out.write(json.dumps(data, indent=2) + "\n")
+    elif args.format == "csv":
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        out.write(f"{args.policy}: {curve.sampled:,} of {curve.accesses:,} accesses simulated (rate {curve.rate:.4g})\n")
+        for row in rows:
+            line = f"{row['frames']:>10,}  {row['miss_ratio']:8.4f}"
+            if "exact_miss_ratio" in row:
+                line += f"  exact {row['exact_miss_ratio']:8.4f}"
+            out.write(line + "\n")
+        if error is not None:
+            out.write(f"error vs exact: mean {error.mean_abs:.4f}, max {error.max_abs:.4f}\n")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            return run(args, out, sys.stderr)
+    return run(args, sys.stdout, sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
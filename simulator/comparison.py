@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+from simulator.base_policy import ReplacementPolicy
+from simulator.fast_engine import DecodedTrace, fast_policy_kind
+from simulator.registry import create_policy, policy_info
+from simulator.simulation_controller import SimulationController
+from simulator.vm_config import VMConfig
+
+
+@dataclass
+class ComparisonLane:
+    name: str
+    controller: SimulationController
+    # Seconds spent simulating this policy.
+    elapsed: float = 0.0
+
+
+class PolicyComparison:
+    """Runs several policies over one trace in a single pass.
+
+    The trace is decoded once and shared by every policy that has a fast
+    kernel; the others run on the reference engine. All policies advance in
+    lockstep, ``chunk_size`` accesses at a time, so the chunk of the trace
+    being simulated stays hot in the cache and a partial run can be compared
+    at any point.
+    """
+
+    def __init__(
+        self,
+        vm_config: VMConfig,
+        reference_string,
+        policies: Sequence[Union[str, ReplacementPolicy]],
+        tlb_entries: int,
+        chunk_size: int = 1 << 16,
+        engine_mode: str = "auto"
+    ):
+        if not policies:
+            raise ValueError("Give at least one policy to compare.")
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive.")
+        if engine_mode not in ("auto", "reference"):
+            raise ValueError(f"Unknown engine mode '{engine_mode}'.")
+
+        self.vm_config = vm_config
+        self.reference_string = reference_string
+        self.chunk_size = chunk_size
+        self.decoded: Optional[DecodedTrace] = None
+        self.lanes: List[ComparisonLane] = []
+        for policy in policies:
+            if isinstance(policy, str):
+                name = policy_info(policy).display_name
+                policy = create_policy(policy)
+            else:
+                name = type(policy).display_name or type(policy).__name__
+            mode = "fast" if engine_mode == "auto" and fast_policy_kind(policy) is not None else "reference"
+            if mode == "fast" and self.decoded is None:
+                self.decoded = DecodedTrace(reference_string, vm_config.offset_bits)
+            controller = SimulationController(
+                vm_config, reference_string, policy, tlb_entries,
+                record_history=False, engine_mode=mode, decoded=self.decoded
+            )
+            self.lanes.append(ComparisonLane(name, controller))
+        self.current_step = 0
+
+    def __len__(self) -> int:
+        return len(self.reference_string)
+
+    def is_finished(self) -> bool:
+        return self.current_step >= len(self)
+
+    def run(self, max_steps: Optional[int] = None) -> int:
+        """Advance every policy by up to max_steps accesses (all remaining if None)."""
+        end = len(self)
+        if max_steps is not None:
+            end = min(end, self.current_step + max_steps)
+        start = self.current_step
+        while self.current_step < end:
+            steps = min(self.chunk_size, end - self.current_step)
+            for lane in self.lanes:
+                began = time.perf_counter()
+                lane.controller.run(steps)
+                lane.elapsed += time.perf_counter() - began
+            self.current_step += steps
+        return self.current_step - start
+
+    def rows(self) -> List[dict]:
+        rows = []
+        for lane in self.lanes:
+            stats = lane.controller.stats
+            rows.append({
+                "policy": lane.name,
+                "engine": lane.controller.engine_mode,
+                "accesses": stats.total_accesses,
+                "page_faults": stats.page_faults,
+                "page_fault_ratio": stats.page_fault_ratio,
+                "tlb_hit_ratio": stats.tlb_hit_ratio,
+                "disk_writes": stats.disk_writes,
+                "elapsed_s": lane.elapsed,
+            })
+        return rows
+
+    def table(self) -> str:
+        """The rows side by side as a plain text table."""
+        header = ["Policy", "Engine", "Faults", "Fault %", "TLB hit %", "Disk writes", "Time (s)"]
+        body = [
+            [
+                row["policy"], row["engine"], f"{row['page_faults']:,}",
+                f"{row['page_fault_ratio']:.2%}", f"{row['tlb_hit_ratio']:.2%}",
+                f"{row['disk_writes']:,}", f"{row['elapsed_s']:.3f}",
+            ]
+            for row in self.rows()
+        ]
+        widths = [max(len(line[col]) for line in [header] + body) for col in range(len(header))]
+        lines = []
+        for line in [header] + body:
+            # Left-align the names, right-align the numbers.
+            cells = [
+                cell.ljust(width) if col < 2 else cell.rjust(width)
+                for col, (cell, width) in enumerate(zip(line, widths))
+            ]
+            lines.append("  ".join(cells).rstrip())
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
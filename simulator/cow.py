@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from simulator.base_policy import ReplacementPolicy
+from simulator.frame import Frame
+from simulator.page_table import PageTableEntry
+from simulator.simulation_engine import SimulationEngine
+from simulator.tlb import TLB
+from simulator.vm_config import VMConfig
+
+
+class ForkingEngine(SimulationEngine):
+    """SimulationEngine for processes that fork and share memory copy-on-write.
+
+    Reference string entries are ``(pid, address, operation)``. ``forks``
+    lists ``(step, parent, child)`` events applied just before access
+    ``step``. Every process has its own address space: pages are keyed as
+    ``pid << pid_shift | page`` in the page table, the frames and the TLB,
+    so the TLB is effectively ASID-tagged.
+
+    A fork shares every resident page of the parent with the child and
+    write-protects both mappings. A write to a protected mapping is a COW
+    fault: the writer gets a private copy, or just write access when it is
+    the last sharer. Evicting a shared frame unmaps all of its sharers
+    through the engine's reverse map. A shared frame reports the key of one
+    of its sharers as its page, and replacement policies see it through that
+    key.
+    """
+
+    def __init__(
+        self,
+        vm_config: VMConfig,
+        reference_string: Sequence[Tuple[int, int, str]],
+        policy: ReplacementPolicy,
+        tlb_entries: int,
+        forks: Sequence[Tuple[int, int, int]] = (),
+        tlb_factory: Optional[Callable[[], TLB]] = None
+    ):
+        self.address_bits = max(1, (vm_config.virtual_memory_size - 1).bit_length())
+        self.pid_shift = self.address_bits - vm_config.offset_bits
+        tagged = [((pid << self.address_bits) | address, op) for pid, address, op in reference_string]
+        super().__init__(vm_config, tagged, policy, tlb_entries, tlb_factory=tlb_factory)
+
+        self.accesses = reference_string
+        self.forked: Set[int] = set()
+        self._forks: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for step, parent, child in forks:
+            self._forks[step].append((parent, child))
+
+    def key(self, pid: int, page: int) -> int:
+        return (pid << self.pid_shift) | page
+
+    def split_key(self, key: int) -> Tuple[int, int]:
+        return key >> self.pid_shift, key & ((1 << self.pid_shift) - 1)
+
+    def _unmap_shared(self, frame: Frame, pte: PageTableEntry) -> Optional[Tuple[int, int]]:
+        """Drop one sharer of ``frame``; returns the frame's new (index, page) if that changed."""
+        sharers = self.rmap[frame.index]
+        sharers.discard(pte.page)
+        frame.ref_count -= 1
+        self._shootdown(pte.page)
+
+        update = None
+        if frame.page == pte.page:
+            frame.page = next(iter(sharers))
+            update = (frame.index, frame.page)
+        if pte.dirty:
+            # The shared copy still holds the unsaved data.
+            self.page_table.get(frame.page).dirty = True
+
+        pte.present = False
+        pte.frame_index = None
+        pte.dirty = False
+        pte.cow = False
+        return update
+
+    def fork(self, parent: int, child: int):
+        if child == parent or child in self.forked:
+            raise ValueError(f"Process {child} cannot be forked from {parent}.")
+        self.forked.add(child)
+
+        offset = (child - parent) << self.pid_shift
+        for key, pte in self.page_table.all_entries().items():
+            if not pte.present or key >> self.pid_shift != parent:
+                continue
+            child_pte = self.page_table.get_or_create(key + offset)
+            child_pte.present = True
+            child_pte.frame_index = pte.frame_index
+            child_pte.cow = True
+            pte.cow = True
+            self.rmap[pte.frame_index].add(child_pte.page)
+            self.frames[pte.frame_index].ref_count += 1
+            # Write-protecting the parent's mappings flushes their TLB entries.
+            self._shootdown(key)
+
+    def _cow_fault(self, pte: PageTableEntry) -> dict:
+        shared = self.frames[pte.frame_index]
+        if shared.ref_count == 1:
+            pte.cow = False
+            return {"cow_fault": True}
+
+        updates = []
+        update = self._unmap_shared(shared, pte)
+        if update is not None:
+            updates.append(update)
+        frame, victim_frame_index, evicted_page, write_back = self._allocate_frame(page=pte.page)
+        self._map(frame, pte)
+        updates.append((frame.index, pte.page))
+        return {
+            "cow_fault": True,
+            "cow_copy": True,
+            "frame_updates": tuple(updates),
+            "victim_frame_index": victim_frame_index,
+            "evicted_page": evicted_page,
+            "write_back": write_back,
+        }
+
+    def step(self):
+        if self.has_finished():
+            raise StopIteration("Simulation finished.")
+        for parent, child in self._forks.pop(self.current_step, ()):
+            self.fork(parent, child)
+
+        cow = None
+        address, operation = self.reference_string[self.current_step]
+        if operation == "W":
+            pte = self.page_table.get(address >> self.cfg.offset_bits)
+            if pte is not None and pte.present and pte.cow:
+                cow = self._cow_fault(pte)
+
+        result = super().step()
+        if cow is not None:
+            cow["frame_updates"] = cow.get("frame_updates", ()) + result.frame_updates
+            for name, value in cow.items():
+                setattr(result, name, value)
+        return result
+
+    def resident_set(self, pid: int) -> Tuple[int, float]:
+        """(RSS, PSS) of ``pid`` in pages; PSS splits each shared frame between its sharers."""
+        rss = 0
+        pss = 0.0
+        for sharers in self.rmap.values():
+            mine = sum(1 for key in sharers if key >> self.pid_shift == pid)
+            if mine:
+                rss += mine
+                pss += mine / len(sharers)
+        return rss, pss
+
+    def shared_frames(self) -> int:
+        return sum(1 for f in self.frames if f.is_shared)
@@ -0,0 +1,490 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
+from typing import Callable, Dict, List, Optional
+
+from simulator.base_policy import ReplacementPolicy
+from simulator.vm_config import VMConfig
+
+
+def fast_policy_kind(policy) -> Optional[str]:
+    """The kernel that reproduces ``policy`` (a policy or its class), if any."""
+    cls = policy if isinstance(policy, type) else type(policy)
+    # Read from the class itself so subclasses do not inherit the kernel.
+    kind = vars(cls).get("fast_kernel")
+    return kind if kind in KERNELS else None
+
+
+class DecodedTrace:
+    """Reference string decoded once into dense page ids and write flags.
+
+    Page numbers are renumbered 0..num_pages-1 in order of first use so that
+    all per-page state can live in flat lists.
+    """
+
+    def __init__(self, reference_string, offset_bits: int):
+        self.offset_bits = offset_bits
+        pages_fn = getattr(reference_string, "pages", None)
+        if pages_fn is not None:
+            self._decode_arrays(pages_fn(offset_bits), reference_string.writes)
+        else:
+            self._decode_pairs(reference_string)
+        self._next_use: Optional[List[int]] = None
+
+    def _decode_pairs(self, reference_string):
+        index: Dict[int, int] = {}
+        ids = []
+        writes = []
+        for addr, op in reference_string:
+            page = addr >> self.offset_bits
+            page_id = index.get(page)
+            if page_id is None:
+                page_id = index[page] = len(index)
+            ids.append(page_id)
+            writes.append(op == "W")
+        self.ids = ids
+        self.writes = writes
+        self.page_of_id = list(index)
+
+    def _decode_arrays(self, pages, writes):
+        import numpy as np
+
+        uniques, first, inverse = np.unique(pages, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        self.ids = rank[inverse].tolist()
+        self.writes = np.asarray(writes, dtype=bool).tolist()
+        self.page_of_id = uniques[order].tolist()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.page_of_id)
+
+    @property
+    def next_use(self) -> List[int]:
+        """next_use[i] is the next index that touches ids[i], or len(trace)."""
+        if self._next_use is None:
+            n = len(self.ids)
+            next_use = [n] * n
+            seen = [n] * self.num_pages
+            ids = self.ids
+            for i in range(n - 1, -1, -1):
+                page_id = ids[i]
+                next_use[i] = seen[page_id]
+                seen[page_id] = i
+            self._next_use = next_use
+        return self._next_use
+
+
+@dataclass
+class KernelCounts:
+    steps: int = 0
+    tlb_hits: int = 0
+    page_hits: int = 0
+    page_faults: int = 0
+    disk_writes: int = 0
+
+    @property
+    def tlb_misses(self) -> int:
+        return self.steps - self.tlb_hits
+
+
+class FastState:
+    """Integer-only simulation state shared by the fast kernels."""
+
+    def __init__(self, num_frames: int, num_pages: int, tlb_entries: int):
+        if num_frames <= 0:
+            raise ValueError("The fast engine needs at least one frame.")
+        if tlb_entries <= 0:
+            raise ValueError("The fast engine needs at least one TLB entry.")
+
+        self.num_frames = num_frames
+        self.tlb_size = tlb_entries
+
+        self.page_frame = [-1] * num_pages
+        self.frame_page = [-1] * num_frames
+        self.dirty = bytearray(num_pages)
+        self.used_frames = 0
+
+        self.tlb_slot = [-1] * num_pages
+        self.slot_page = [-1] * tlb_entries
+        # TLB slots in recency order, sentinel at index tlb_entries: most
+        # recently used right after it, free slots at the tail.
+        self.tlb_next = list(range(1, tlb_entries + 1)) + [0]
+        self.tlb_prev = [tlb_entries] + list(range(tlb_entries))
+
+        # FIFO: next frame to replace.
+        self.hand = 0
+        # LRU: doubly linked list of frames, sentinel at index num_frames,
+        # most recently used right after the sentinel.
+        self.lru_next = list(range(1, num_frames + 1)) + [0]
+        self.lru_prev = [num_frames] + list(range(num_frames))
+        # Optimal: heap of encoded (next use, frame) keys plus the live next use per frame.
+        self.opt_heap: List[int] = []
+        self.frame_next_use = [-1] * num_frames
+
+
+def _run_fifo(s: FastState, trace: DecodedTrace, start: int, end: int) -> KernelCounts:
+    ids = trace.ids
+    writes = trace.writes
+    page_frame = s.page_frame
+    frame_page = s.frame_page
+    dirty = s.dirty
+    tlb_slot = s.tlb_slot
+    slot_page = s.slot_page
+    tlb_next = s.tlb_next
+    tlb_prev = s.tlb_prev
+    tlb_head = s.tlb_size
+    num_frames = s.num_frames
+    used = s.used_frames
+    hand = s.hand
+    tlb_hits = page_hits = faults = disk_writes = 0
+
+    for i in range(start, end):
+        p = ids[i]
+        slot = tlb_slot[p]
+        if slot >= 0:
+            if tlb_next[tlb_head] != slot:
+                a = tlb_prev[slot]
+                b = tlb_next[slot]
+                tlb_next[a] = b
+                tlb_prev[b] = a
+                first = tlb_next[tlb_head]
+                tlb_next[slot] = first
+                tlb_prev[first] = slot
+                tlb_prev[slot] = tlb_head
+                tlb_next[tlb_head] = slot
+            tlb_hits += 1
+            page_hits += 1
+            if writes[i]:
+                dirty[p] = 1
+            continue
+
+        f = page_frame[p]
+        if f >= 0:
+            page_hits += 1
+        else:
+            faults += 1
+            if used < num_frames:
+                f = used
+                used += 1
+            else:
+                f = hand
+                hand += 1
+                if hand == num_frames:
+                    hand = 0
+                old = frame_page[f]
+                if dirty[old]:
+                    disk_writes += 1
+                    dirty[old] = 0
+                page_frame[old] = -1
+                old_slot = tlb_slot[old]
+                if old_slot >= 0:
+                    # The slot is free now: it goes to the tail and is reused first.
+                    tlb_slot[old] = -1
+                    slot_page[old_slot] = -1
+                    a = tlb_prev[old_slot]
+                    b = tlb_next[old_slot]
+                    tlb_next[a] = b
+                    tlb_prev[b] = a
+                    last = tlb_prev[tlb_head]
+                    tlb_prev[old_slot] = last
+                    tlb_next[last] = old_slot
+                    tlb_next[old_slot] = tlb_head
+                    tlb_prev[tlb_head] = old_slot
+            frame_page[f] = p
+            page_frame[p] = f
+        if writes[i]:
+            dirty[p] = 1
+
+        # The tail is a free slot if there is one, else the least recently used.
+        slot = tlb_prev[tlb_head]
+        victim = slot_page[slot]
+        if victim >= 0:
+            tlb_slot[victim] = -1
+        tlb_slot[p] = slot
+        slot_page[slot] = p
+        if tlb_next[tlb_head] != slot:
+            last = tlb_prev[slot]
+            tlb_next[last] = tlb_head
+            tlb_prev[tlb_head] = last
+            first = tlb_next[tlb_head]
+            tlb_next[slot] = first
+            tlb_prev[first] = slot
+            tlb_prev[slot] = tlb_head
+            tlb_next[tlb_head] = slot
+
+    s.used_frames = used
+    s.hand = hand
+    return KernelCounts(end - start, tlb_hits, page_hits, faults, disk_writes)
+
+
+def _run_lru(s: FastState, trace: DecodedTrace, start: int, end: int) -> KernelCounts:
+    ids = trace.ids
+    writes = trace.writes
+    page_frame = s.page_frame
+    frame_page = s.frame_page
+    dirty = s.dirty
+    tlb_slot = s.tlb_slot
+    slot_page = s.slot_page
+    tlb_next = s.tlb_next
+    tlb_prev = s.tlb_prev
+    tlb_head = s.tlb_size
+    num_frames = s.num_frames
+    nxt = s.lru_next
+    prv = s.lru_prev
+    head = num_frames
+    used = s.used_frames
+    tlb_hits = page_hits = faults = disk_writes = 0
+
+    for i in range(start, end):
+        p = ids[i]
+        slot = tlb_slot[p]
+        tlb_hit = slot >= 0
+        if tlb_hit:
+            if tlb_next[tlb_head] != slot:
+                a = tlb_prev[slot]
+                b = tlb_next[slot]
+                tlb_next[a] = b
+                tlb_prev[b] = a
+                first = tlb_next[tlb_head]
+                tlb_next[slot] = first
+                tlb_prev[first] = slot
+                tlb_prev[slot] = tlb_head
+                tlb_next[tlb_head] = slot
+            tlb_hits += 1
+            page_hits += 1
+            f = page_frame[p]
+        else:
+            f = page_frame[p]
+            if f >= 0:
+                page_hits += 1
+            else:
+                faults += 1
+                if used < num_frames:
+                    f = used
+                    used += 1
+                else:
+                    f = prv[head]
+                    old = frame_page[f]
+                    if dirty[old]:
+                        disk_writes += 1
+                        dirty[old] = 0
+                    page_frame[old] = -1
+                    old_slot = tlb_slot[old]
+                    if old_slot >= 0:
+                        # The slot is free now: it goes to the tail and is reused first.
+                        tlb_slot[old] = -1
+                        slot_page[old_slot] = -1
+                        a = tlb_prev[old_slot]
+                        b = tlb_next[old_slot]
+                        tlb_next[a] = b
+                        tlb_prev[b] = a
+                        last = tlb_prev[tlb_head]
+                        tlb_prev[old_slot] = last
+                        tlb_next[last] = old_slot
+                        tlb_next[old_slot] = tlb_head
+                        tlb_prev[tlb_head] = old_slot
+                frame_page[f] = p
+                page_frame[p] = f
+
+        if nxt[head] != f:
+            a = prv[f]
+            b = nxt[f]
+            nxt[a] = b
+            prv[b] = a
+            first = nxt[head]
+            nxt[f] = first
+            prv[first] = f
+            prv[f] = head
+            nxt[head] = f
+
+        if writes[i]:
+            dirty[p] = 1
+        if tlb_hit:
+            continue
+
+        # The tail is a free slot if there is one, else the least recently used.
+        slot = tlb_prev[tlb_head]
+        victim = slot_page[slot]
+        if victim >= 0:
+            tlb_slot[victim] = -1
+        tlb_slot[p] = slot
+        slot_page[slot] = p
+        if tlb_next[tlb_head] != slot:
+            last = tlb_prev[slot]
+            tlb_next[last] = tlb_head
+            tlb_prev[tlb_head] = last
+            first = tlb_next[tlb_head]
+            tlb_next[slot] = first
+            tlb_prev[first] = slot
+            tlb_prev[slot] = tlb_head
+            tlb_next[tlb_head] = slot
+
+    s.used_frames = used
+    return KernelCounts(end - start, tlb_hits, page_hits, faults, disk_writes)
+
+
+def _run_optimal(s: FastState, trace: DecodedTrace, start: int, end: int) -> KernelCounts:
+    ids = trace.ids
+    writes = trace.writes
+    next_use = trace.next_use
+    n = len(ids)
+    page_frame = s.page_frame
+    frame_page = s.frame_page
+    dirty = s.dirty
+    tlb_slot = s.tlb_slot
+    slot_page = s.slot_page
+    tlb_next = s.tlb_next
+    tlb_prev = s.tlb_prev
+    tlb_head = s.tlb_size
+    num_frames = s.num_frames
+    heap = s.opt_heap
+    frame_next_use = s.frame_next_use
+    heap_limit = 4 * num_frames + 1024
+    used = s.used_frames
+    tlb_hits = page_hits = faults = disk_writes = 0
+
+    for i in range(start, end):
+        p = ids[i]
+        slot = tlb_slot[p]
+        tlb_hit = slot >= 0
+        if tlb_hit:
+            if tlb_next[tlb_head] != slot:
+                a = tlb_prev[slot]
+                b = tlb_next[slot]
+                tlb_next[a] = b
+                tlb_prev[b] = a
+                first = tlb_next[tlb_head]
+                tlb_next[slot] = first
+                tlb_prev[first] = slot
+                tlb_prev[slot] = tlb_head
+                tlb_next[tlb_head] = slot
+            tlb_hits += 1
+            page_hits += 1
+            f = page_frame[p]
+        else:
+            f = page_frame[p]
+            if f >= 0:
+                page_hits += 1
+            else:
+                faults += 1
+                if used < num_frames:
+                    f = used
+                    used += 1
+                else:
+                    # Keys order by farthest next use, then lowest frame index.
+                    while True:
+                        key = heappop(heap)
+                        f = key % num_frames
+                        if frame_next_use[f] == n - key // num_frames:
+                            break
+                    old = frame_page[f]
+                    if dirty[old]:
+                        disk_writes += 1
+                        dirty[old] = 0
+                    page_frame[old] = -1
+                    old_slot = tlb_slot[old]
+                    if old_slot >= 0:
+                        # The slot is free now: it goes to the tail and is reused first.
+                        tlb_slot[old] = -1
+                        slot_page[old_slot] = -1
+                        a = tlb_prev[old_slot]
+                        b = tlb_next[old_slot]
+                        tlb_next[a] = b
+                        tlb_prev[b] = a
+                        last = tlb_prev[tlb_head]
+                        tlb_prev[old_slot] = last
+                        tlb_next[last] = old_slot
+                        tlb_next[old_slot] = tlb_head
+                        tlb_prev[tlb_head] = old_slot
+                frame_page[f] = p
+                page_frame[p] = f
+
+        nu = next_use[i]
+        frame_next_use[f] = nu
+        heappush(heap, (n - nu) * num_frames + f)
+        if len(heap) > heap_limit:
+            heap[:] = [(n - frame_next_use[g]) * num_frames + g for g in range(used)]
+            heapify(heap)
+
+        if writes[i]:
+            dirty[p] = 1
+        if tlb_hit:
+            continue
+
+        # The tail is a free slot if there is one, else the least recently used.
+        slot = tlb_prev[tlb_head]
+        victim = slot_page[slot]
+        if victim >= 0:
+            tlb_slot[victim] = -1
+        tlb_slot[p] = slot
+        slot_page[slot] = p
+        if tlb_next[tlb_head] != slot:
+            last = tlb_prev[slot]
+            tlb_next[last] = tlb_head
+            tlb_prev[tlb_head] = last
+            first = tlb_next[tlb_head]
+            tlb_next[slot] = first
+            tlb_prev[first] = slot
+            tlb_prev[slot] = tlb_head
+            tlb_next[tlb_head] = slot
+
+    s.used_frames = used
+    return KernelCounts(end - start, tlb_hits, page_hits, faults, disk_writes)
+
+
+KERNELS: Dict[str, Callable[[FastState, DecodedTrace, int, int], KernelCounts]] = {
+    "fifo": _run_fifo,
+    "lru": _run_lru,
+    "optimal": _run_optimal,
+}
+
+
+class FastSimulationEngine:
+    """Allocation-free engine variant producing the same statistics as SimulationEngine.
+
+    It does not build per-step results; use ``run`` to advance it in batches.
+    Only policies whose class names a kernel in ``fast_kernel`` can run on it.
+    """
+
+    def __init__(
+        self,
+        vm_config: VMConfig,
+        reference_string,
+        policy: ReplacementPolicy,
+        tlb_entries: int,
+        decoded: Optional[DecodedTrace] = None
+    ):
+        kind = fast_policy_kind(policy)
+        if kind is None:
+            raise ValueError(f"No fast kernel for policy {type(policy).__name__}.")
+
+        self.cfg = vm_config
+        self.reference_string = reference_string
+        self.policy = policy
+        self.kind = kind
+        self.trace = decoded or DecodedTrace(reference_string, vm_config.offset_bits)
+        self.state = FastState(vm_config.num_frames, self.trace.num_pages, tlb_entries)
+        self._kernel = KERNELS[kind]
+        self.current_step = 0
+
+    def has_finished(self):
+        return self.current_step >= len(self.trace)
+
+    def run(self, max_steps: Optional[int] = None) -> KernelCounts:
+        end = len(self.trace)
+        if max_steps is not None:
+            end = min(end, self.current_step + max_steps)
+        counts = self._kernel(self.state, self.trace, self.current_step, end)
+        self.current_step = end
+        return counts
+
+    def frame_pages(self) -> List[Optional[int]]:
+        page_of_id = self.trace.page_of_id
+        return [page_of_id[p] if p >= 0 else None for p in self.state.frame_page]
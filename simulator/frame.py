@@ -7,6 +7,11 @@ class Frame:
     page: Optional[int] = None
     loaded_time: int = -1
     last_access_time: int = -1
+    ref_count: int = 0
+
+    @property
+    def is_shared(self) -> bool:
+        return self.ref_count > 1
 
     @property
     def is_free(self) -> bool:
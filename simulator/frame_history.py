@@ -0,0 +1,62 @@
+from array import array
+from typing import List, Optional
+
+from simulator.simulation_step_result import SimulationStepResult
+
+
+class FrameHistory:
+    """Delta log of frame contents that can rebuild the frame view of any step.
+
+    Only the frames changed by a step are stored. A full copy of the frames is
+    kept every ``checkpoint_interval`` steps so reconstruction replays at most
+    one interval of deltas.
+    """
+
+    def __init__(self, num_frames: int, checkpoint_interval: Optional[int] = None):
+        self.num_frames = num_frames
+        self.checkpoint_interval = checkpoint_interval or max(256, num_frames)
+
+        self._delta_frames = array("q")
+        self._delta_pages = array("q")
+        self._step_end = array("q")
+        self._checkpoints: List[List[Optional[int]]] = []
+        self._current: List[Optional[int]] = [None] * num_frames
+
+    def __len__(self) -> int:
+        return len(self._step_end)
+
+    def record(self, result: SimulationStepResult):
+        for frame_index, page in result.frame_deltas():
+            self._delta_frames.append(frame_index)
+            self._delta_pages.append(-1 if page is None else page)
+            self._current[frame_index] = page
+        self._step_end.append(len(self._delta_frames))
+
+        if len(self._step_end) % self.checkpoint_interval == 0:
+            self._checkpoints.append(list(self._current))
+
+    def frames_at(self, step_index: int) -> List[Optional[int]]:
+        """Return the frame contents as they were right after ``step_index``."""
+        if not 0 <= step_index < len(self._step_end):
+            raise IndexError(f"Step {step_index} has not been recorded.")
+
+        checkpoint = (step_index + 1) // self.checkpoint_interval
+        if checkpoint:
+            frames = list(self._checkpoints[checkpoint - 1])
+            start_step = checkpoint * self.checkpoint_interval
+        else:
+            frames = [None] * self.num_frames
+            start_step = 0
+
+        start = self._step_end[start_step - 1] if start_step else 0
+        end = self._step_end[step_index]
+        for i in range(start, end):
+            page = self._delta_pages[i]
+            frames[self._delta_frames[i]] = None if page < 0 else page
+        return frames
+
+    def latest(self) -> List[Optional[int]]:
+        return list(self._current)
+
+    def reset(self):
+        self.__init__(self.num_frames, self.checkpoint_interval)
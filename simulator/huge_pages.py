@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set
+
+from simulator.tlb import TLB
+from simulator.units import format_bytes
+from simulator.vm_config import VMConfig
+
+HUGE_2M_SHIFT = 21
+HUGE_1G_SHIFT = 30
+# The page-size tag sits above the page number so set indexing still uses
+# the low page-number bits.
+SIZE_TAG_SHIFT = 58
+
+
+def tlb_key(address: int, shift: int) -> int:
+    """TLB tag for the page of ``address``, tagged with the page size."""
+    return (shift << SIZE_TAG_SHIFT) | (address >> shift)
+
+
+def key_page_size(key: int) -> int:
+    return 1 << (key >> SIZE_TAG_SHIFT)
+
+
+class PageSizePolicy(ABC):
+    """Decides which page size backs each access."""
+
+    def __init__(self, cfg: VMConfig):
+        self.cfg = cfg
+        self.promotions = 0
+        self.demotions = 0
+
+    @abstractmethod
+    def page_shift(self, address: int, step: int, tlb: TLB) -> int:
+        raise NotImplementedError
+
+
+class BasePagePolicy(PageSizePolicy):
+    def page_shift(self, address, step, tlb):
+        return self.cfg.offset_bits
+
+
+class StaticRegionPolicy(PageSizePolicy):
+    """Uses the per-region page sizes from ``VMConfig.page_regions``."""
+
+    def page_shift(self, address, step, tlb):
+        return self.cfg.page_shift_for(address)
+
+
+class ThresholdPromotionPolicy(PageSizePolicy):
+    """khugepaged-style promotion with utilisation-based demotion.
+
+    A huge-aligned region is promoted once ``promote_fraction`` of its base
+    pages have been touched. Every ``window`` accesses, promoted regions that
+    touched fewer than ``demote_fraction`` of their base pages in that window
+    are split back into base pages. TLB entries of the old size are
+    invalidated on every change.
+    """
+
+    def __init__(
+        self,
+        cfg: VMConfig,
+        huge_shift: int = HUGE_2M_SHIFT,
+        promote_fraction: float = 0.5,
+        demote_fraction: float = 0.05,
+        window: int = 100_000,
+    ):
+        super().__init__(cfg)
+        if huge_shift <= cfg.offset_bits:
+            raise ValueError("Huge pages must be larger than base pages.")
+        self.huge_shift = huge_shift
+        self.subpages = 1 << (huge_shift - cfg.offset_bits)
+        self.promote_count = max(1, int(self.subpages * promote_fraction))
+        self.demote_count = self.subpages * demote_fraction
+        self.window = window
+
+        self.promoted: Set[int] = set()
+        self._touched: Dict[int, Set[int]] = {}
+        self._window_touched: Dict[int, Set[int]] = {}
+        self._window_end = window
+
+    def page_shift(self, address, step, tlb):
+        if step >= self._window_end:
+            self._end_window(tlb)
+            self._window_end = step + self.window
+
+        region = address >> self.huge_shift
+        base_page = address >> self.cfg.offset_bits
+        if region in self.promoted:
+            self._window_touched.setdefault(region, set()).add(base_page)
+            return self.huge_shift
+
+        touched = self._touched.setdefault(region, set())
+        touched.add(base_page)
+        if len(touched) < self.promote_count:
+            return self.cfg.offset_bits
+
+        first = tlb_key(region << self.huge_shift, self.cfg.offset_bits)
+        tlb.invalidate_range(first, first + self.subpages)
+        del self._touched[region]
+        self.promoted.add(region)
+        self._window_touched[region] = {base_page}
+        self.promotions += 1
+        return self.huge_shift
+
+    def _end_window(self, tlb: TLB):
+        for region in list(self.promoted):
+            used = self._window_touched.get(region, set())
+            if len(used) < self.demote_count:
+                tlb.invalidate(tlb_key(region << self.huge_shift, self.huge_shift))
+                self.promoted.discard(region)
+                self._touched[region] = set(used)
+                self.demotions += 1
+        self._window_touched = {}
+
+
+@dataclass
+class HugePageReport:
+    name: str
+    accesses: int
+    tlb_misses: int
+    mean_reach_bytes: float
+    max_reach_bytes: int
+    huge_accesses: int
+    promotions: int
+    demotions: int
+
+    @property
+    def miss_rate(self) -> float:
+        return self.tlb_misses / max(1, self.accesses)
+
+    @property
+    def huge_fraction(self) -> float:
+        return self.huge_accesses / max(1, self.accesses)
+
+
+def tlb_reach(tlb: TLB) -> int:
+    """Bytes of virtual memory currently covered by the TLB's entries."""
+    return sum(key_page_size(key) for key in tlb.entries)
+
+
+def simulate_page_sizes(
+    name: str,
+    policy: PageSizePolicy,
+    reference_string,
+    tlb_entries: int,
+    ways: Optional[int] = None,
+    sample_interval: int = 1024,
+) -> HugePageReport:
+    """Run the trace through a size-tagged TLB and measure misses and reach."""
+    tlb = TLB(tlb_entries, ways, name=name)
+    base_shift = policy.cfg.offset_bits
+    addresses = getattr(reference_string, "addresses", None)
+    addresses = addresses.tolist() if addresses is not None else [addr for addr, _ in reference_string]
+
+    reach_sum = 0
+    reach_max = 0
+    samples = 0
+    huge_accesses = 0
+    for step, address in enumerate(addresses):
+        shift = policy.page_shift(address, step, tlb)
+        if shift != base_shift:
+            huge_accesses += 1
+        key = tlb_key(address, shift)
+        if tlb.lookup(key, step) is None:
+            tlb.insert(key, key, step)
+
+        if step % sample_interval == 0:
+            reach = tlb_reach(tlb)
+            reach_sum += reach
+            reach_max = max(reach_max, reach)
+            samples += 1
+
+    return HugePageReport(
+        name=name,
+        accesses=len(addresses),
+        tlb_misses=tlb.stats.misses,
+        mean_reach_bytes=reach_sum / max(1, samples),
+        max_reach_bytes=reach_max,
+        huge_accesses=huge_accesses,
+        promotions=policy.promotions,
+        demotions=policy.demotions,
+    )
+
+
+def compare_page_sizes(
+    cfg: VMConfig,
+    reference_string,
+    tlb_entries: int,
+    ways: Optional[int] = None,
+    policies: Optional[Dict[str, PageSizePolicy]] = None,
+) -> List[HugePageReport]:
+    """Compare base pages against the configured regions and threshold promotion."""
+    if policies is None:
+        policies = {"base pages": BasePagePolicy(cfg)}
+        if cfg.page_regions:
+            policies["static regions"] = StaticRegionPolicy(cfg)
+        policies["promotion (2M)"] = ThresholdPromotionPolicy(cfg)
+    return [
+        simulate_page_sizes(name, policy, reference_string, tlb_entries, ways)
+        for name, policy in policies.items()
+    ]
+
+
+def format_reports(reports: Sequence[HugePageReport]) -> str:
+    lines = [f"{'policy':<20}{'miss rate':>11}{'mean reach':>14}{'max reach':>14}{'huge acc':>10}{'promo':>7}{'demo':>7}"]
+    for r in reports:
+        lines.append(
+            f"{r.name:<20}{r.miss_rate:>11.2%}{format_bytes(r.mean_reach_bytes):>14}"
+            f"{format_bytes(r.max_reach_bytes):>14}{r.huge_fraction:>10.1%}{r.promotions:>7}{r.demotions:>7}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Phase name -> (engine attribute holding the object, method name).
+# An empty attribute means the method lives on the engine itself.
+ENGINE_PHASES: Dict[str, Tuple[str, str]] = {
+    "step": ("", "step"),
+    "tlb.lookup": ("tlb", "lookup"),
+    "page_table.get_or_create": ("page_table", "get_or_create"),
+    "_find_free_frame": ("", "_find_free_frame"),
+    "policy.select_victim": ("policy", "select_victim"),
+    "snapshot": ("", "_frames_snapshot"),
+    "result": ("", "_make_result"),
+}
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+class EngineProfiler:
+    """Opt-in per-phase timing for SimulationEngine.
+
+    Attaching replaces the phase methods of one engine with timed wrappers on
+    the instances themselves; detaching removes them again, so an engine that
+    was never attached runs the original code with no extra checks.
+    """
+
+    def __init__(self, phases: Optional[List[str]] = None, trace_events: bool = False, max_events: int = 1_000_000):
+        unknown = set(phases or ()) - set(ENGINE_PHASES)
+        if unknown:
+            raise ValueError(f"Unknown phases: {', '.join(sorted(unknown))}")
+
+        self.phases = list(phases or ENGINE_PHASES)
+        self.stats: Dict[str, PhaseStats] = {name: PhaseStats() for name in self.phases}
+        self.trace_events = trace_events
+        self.max_events = max_events
+        self.events: List[Tuple[str, int, int]] = []
+        self.dropped_events = 0
+
+        self._origin_ns = perf_counter_ns()
+        self._patched: List[Tuple[object, str]] = []
+
+    def _wrap(self, name: str, fn: Callable) -> Callable:
+        stats = self.stats[name]
+        events = self.events if self.trace_events else None
+
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                stats.calls += 1
+                stats.total_ns += elapsed
+                if elapsed > stats.max_ns:
+                    stats.max_ns = elapsed
+                if events is not None:
+                    if len(events) < self.max_events:
+                        events.append((name, start, elapsed))
+                    else:
+                        self.dropped_events += 1
+        return timed
+
+    def attach(self, engine) -> EngineProfiler:
+        self.detach()
+        for name in self.phases:
+            owner_attr, method = ENGINE_PHASES[name]
+            owner = getattr(engine, owner_attr) if owner_attr else engine
+            setattr(owner, method, self._wrap(name, getattr(owner, method)))
+            self._patched.append((owner, method))
+        return self
+
+    def detach(self):
+        for owner, method in self._patched:
+            if method in vars(owner):
+                delattr(owner, method)
+        self._patched = []
+
+    @property
+    def attached(self) -> bool:
+        return bool(self._patched)
+
+    def reset(self):
+        for stats in self.stats.values():
+            stats.calls = stats.total_ns = stats.max_ns = 0
+        self.events.clear()
+        self.dropped_events = 0
+        self._origin_ns = perf_counter_ns()
+
+    def as_dict(self) -> Dict[str, dict]:
+        return {
+            name: {
+                "calls": s.calls,
+                "total_ns": s.total_ns,
+                "mean_ns": s.mean_ns,
+                "max_ns": s.max_ns,
+            }
+            for name, s in self.stats.items()
+        }
+
+    def report(self) -> str:
+        step_total = self.stats["step"].total_ns if "step" in self.stats else 0
+        lines = [f"{'phase':<26}{'calls':>12}{'total ms':>12}{'mean ns':>12}{'max ns':>12}{'% step':>9}"]
+        for name, s in self.stats.items():
+            share = f"{s.total_ns / step_total:>9.1%}" if step_total else f"{'-':>9}"
+            lines.append(
+                f"{name:<26}{s.calls:>12,}{s.total_ns / 1e6:>12.2f}{s.mean_ns:>12,.0f}{s.max_ns:>12,}{share}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Trace Event Format, loadable by chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        tid = threading.get_ident()
+        events = [
+            {
+                "name": name,
+                "cat": "engine",
+                "ph": "X",
+                "ts": (start - self._origin_ns) / 1000,
+                "dur": elapsed / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, elapsed in self.events
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ns",
+            "otherData": {"dropped_events": self.dropped_events},
+        }
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w") as fh:
+            json.dump(self.chrome_trace(), fh)
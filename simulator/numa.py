@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from simulator.frame import Frame
+from simulator.vm_config import VMConfig
+
+NUMA_PLACEMENTS = ("first-touch", "interleave", "preferred")
+
+
+@dataclass
+class NumaNodeStats:
+    # Demand faults whose page landed on this node.
+    faults: int = 0
+    allocations: int = 0
+    local_accesses: int = 0
+    remote_accesses: int = 0
+    migrations_in: int = 0
+    migrations_out: int = 0
+
+    @property
+    def accesses(self) -> int:
+        return self.local_accesses + self.remote_accesses
+
+    @property
+    def locality(self) -> float:
+        return self.local_accesses / max(1, self.accesses)
+
+
+class NumaAllocator:
+    """Places pages on the NUMA nodes of ``VMConfig.numa_nodes``.
+
+    ``cpu_nodes`` gives the node of the CPU issuing each access, either one
+    node for the whole trace or one per access. Placement picks the node a
+    new page should live on:
+
+    - ``first-touch``: the node of the CPU that faults the page in,
+    - ``interleave``: page number modulo the number of nodes,
+    - ``preferred``: ``preferred_node``.
+
+    When that node has no free frame the cheapest other node with one is
+    used. Once memory is full the replacement policy picks the victim among
+    the frames of the target node only, as per-node reclaim does.
+
+    With ``migrate_threshold`` set, a page accessed that many times in a row
+    from the same remote node is migrated there, as automatic NUMA balancing
+    does. If that node is full the policy evicts one of its pages first.
+    """
+
+    def __init__(
+        self,
+        cfg: VMConfig,
+        placement: str = "first-touch",
+        cpu_nodes: Union[int, Sequence[int]] = 0,
+        preferred_node: int = 0,
+        migrate_threshold: Optional[int] = None,
+    ):
+        if placement not in NUMA_PLACEMENTS:
+            raise ValueError(f"Unknown NUMA placement '{placement}'.")
+        if not cfg.numa_nodes:
+            raise ValueError("The configuration has no NUMA nodes.")
+
+        self.cfg = cfg
+        self.placement = placement
+        self.cpu_nodes = cpu_nodes
+        self.preferred_node = preferred_node
+        self.migrate_threshold = migrate_threshold
+
+        self._ranges: List[Tuple[int, int]] = []
+        self._frame_node: List[int] = []
+        start = 0
+        for node, spec in enumerate(cfg.numa_nodes):
+            self._ranges.append((start, start + spec.num_frames))
+            self._frame_node += [node] * spec.num_frames
+            start += spec.num_frames
+        # Fallback order per CPU node: cheapest memory first.
+        self._order = [
+            sorted(range(cfg.num_nodes), key=lambda m: (cfg.access_cost(cpu, m), m))
+            for cpu in range(cfg.num_nodes)
+        ]
+        self.reset()
+
+    def reset(self):
+        self.stats = [NumaNodeStats() for _ in self.cfg.numa_nodes]
+        self.access_cost = 0
+        self._streaks: Dict[int, Tuple[int, int]] = {}
+
+    def cpu_node(self, step: int) -> int:
+        if isinstance(self.cpu_nodes, int):
+            return self.cpu_nodes
+        return self.cpu_nodes[step]
+
+    def node_of(self, frame_index: int) -> int:
+        return self._frame_node[frame_index]
+
+    def _target(self, page: Optional[int], step: int) -> int:
+        if self.placement == "interleave" and page is not None:
+            return page % self.cfg.num_nodes
+        if self.placement == "preferred":
+            return self.preferred_node
+        return self.cpu_node(step)
+
+    def frames_on(self, node: int) -> range:
+        return range(*self._ranges[node])
+
+    def free_frame_on(self, frames: List[Frame], node: int) -> Optional[Frame]:
+        for i in self.frames_on(node):
+            if frames[i].is_free:
+                return frames[i]
+        return None
+
+    def free_frame(self, frames: List[Frame], page: Optional[int], step: int) -> Optional[Frame]:
+        for node in self._order[self._target(page, step)]:
+            frame = self.free_frame_on(frames, node)
+            if frame is not None:
+                self.stats[node].allocations += 1
+                return frame
+        return None
+
+    def victim_frames(self, page: Optional[int], step: int, allowed: Optional[List[int]] = None) -> List[int]:
+        """Frames to evict from for ``page`` once memory is full.
+
+        These are the target node's frames, or those of the cheapest node that
+        has any, limited to ``allowed`` if given. The new page is counted as
+        allocated on that node.
+        """
+        allowed_set = None if allowed is None else set(allowed)
+        for node in self._order[self._target(page, step)]:
+            candidates = [i for i in self.frames_on(node) if allowed_set is None or i in allowed_set]
+            if candidates:
+                self.stats[node].allocations += 1
+                return candidates
+        return []
+
+    def record_access(self, frame_index: int, page: int, step: int, fault: bool = False) -> Optional[int]:
+        """Account for one access; return the node to migrate ``page`` to, if any."""
+        cpu = self.cpu_node(step)
+        node = self._frame_node[frame_index]
+        if fault:
+            self.stats[node].faults += 1
+        self.access_cost += self.cfg.access_cost(cpu, node)
+        if node == cpu:
+            self.stats[node].local_accesses += 1
+            self._streaks.pop(page, None)
+            return None
+
+        self.stats[node].remote_accesses += 1
+        if self.migrate_threshold is None:
+            return None
+        streak_node, count = self._streaks.get(page, (cpu, 0))
+        count = count + 1 if streak_node == cpu else 1
+        if count >= self.migrate_threshold:
+            self._streaks.pop(page, None)
+            return cpu
+        self._streaks[page] = (cpu, count)
+        return None
+
+    def record_migration(self, source_frame: int, target_frame: int):
+        self.stats[self._frame_node[source_frame]].migrations_out += 1
+        self.stats[self._frame_node[target_frame]].migrations_in += 1
+
+    def report(self) -> str:
+        lines = [f"{'node':>5}{'faults':>9}{'allocs':>9}{'local':>10}{'remote':>10}{'locality':>10}{'mig in':>8}{'mig out':>9}"]
+        for node, s in enumerate(self.stats):
+            lines.append(
+                f"{node:>5}{s.faults:>9,}{s.allocations:>9,}{s.local_accesses:>10,}{s.remote_accesses:>10,}"
+                f"{s.locality:>10.1%}{s.migrations_in:>8,}{s.migrations_out:>9,}"
+            )
+        accesses = sum(s.accesses for s in self.stats)
+        lines.append(f"mean access cost {self.access_cost / max(1, accesses):.2f}")
+        return "\n".join(lines)
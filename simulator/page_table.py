@@ -1,5 +1,6 @@
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 @dataclass
 class PageTableEntry:
@@ -8,14 +9,25 @@ class PageTableEntry:
     present: bool = False
     referenced: bool = False
     dirty: bool = False
+    prefetched: bool = False
+    cow: bool = False
+    swap_slot: Optional[int] = None
 
 class PageTable:
     def __init__(self):
         self._entries: Dict[int, PageTableEntry] = {}
+        # Touched pages in ascending order for the GUI's window. Pages created
+        # since the last lookup wait in _new_pages, so the engine only appends.
+        self._sorted_pages: List[int] = []
+        self._new_pages: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
     def get_or_create(self, page: int) -> PageTableEntry:
         if page not in self._entries:
             self._entries[page] = PageTableEntry(page=page)
+            self._new_pages.append(page)
         return self._entries[page]
 
     def get(self, page: int) -> Optional[PageTableEntry]:
@@ -23,3 +35,20 @@ class PageTable:
 
     def all_entries(self):
         return dict(self._entries)
+
+    def _sorted(self) -> List[int]:
+        if self._new_pages:
+            # Timsort merges the sorted run with the sorted new pages in linear time.
+            self._new_pages.sort()
+            self._sorted_pages += self._new_pages
+            self._sorted_pages.sort()
+            self._new_pages = []
+        return self._sorted_pages
+
+    def index_of(self, page: int) -> int:
+        """Position of ``page`` among the touched pages in ascending order, or where it would go."""
+        return bisect_left(self._sorted(), page)
+
+    def entries_from(self, index: int, count: int) -> List[PageTableEntry]:
+        """Up to ``count`` entries in page order, starting at sorted position ``index``."""
+        return [self._entries[page] for page in self._sorted()[index:index + count]]
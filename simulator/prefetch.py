@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from typing import List
+
+
+class Prefetcher(ABC):
+    """Predicts pages that are likely to be accessed soon.
+
+    ``on_access`` is called once per access with whether that access missed
+    (a page fault for page prefetchers, a TLB miss for TLB prefetchers) and
+    returns the pages to bring in ahead of time.
+    """
+
+    @abstractmethod
+    def on_access(self, page: int, miss: bool, step: int) -> List[int]:
+        raise NotImplementedError
+
+    def reset(self):
+        pass
+
+
+class SequentialPrefetcher(Prefetcher):
+    """Linux-style read-ahead with a window that doubles on sequential streams."""
+
+    def __init__(self, initial_window: int = 2, max_window: int = 32):
+        self.initial_window = initial_window
+        self.max_window = max_window
+        self.reset()
+
+    def reset(self):
+        self.window = self.initial_window
+        self._last_page = None
+        self._next_ahead = None
+
+    def on_access(self, page, miss, step):
+        last = self._last_page
+        if page == last:
+            return []
+        self._last_page = page
+
+        if last is None or page != last + 1:
+            self.window = self.initial_window
+            self._next_ahead = page + 1
+            return []
+
+        # Sequential: read further ahead once the stream is within half a
+        # window of the end of what was already read. A miss means the
+        # earlier read-ahead did not stick, so read again from here.
+        ahead = page + 1 if miss else max(self._next_ahead, page + 1)
+        if not miss and ahead - page > self.window // 2:
+            return []
+
+        self.window = min(self.window * 2, self.max_window)
+        end = page + 1 + self.window
+        self._next_ahead = end
+        return list(range(ahead, end))
+
+
+class StridePrefetcher(Prefetcher):
+    """Prefetches ``degree`` pages along a stride seen ``confidence`` times in a row."""
+
+    def __init__(self, degree: int = 2, confidence: int = 2):
+        self.degree = degree
+        self.confidence = confidence
+        self.reset()
+
+    def reset(self):
+        self._last_page = None
+        self._stride = 0
+        self._seen = 0
+
+    def on_access(self, page, miss, step):
+        if self._last_page is None:
+            self._last_page = page
+            return []
+
+        stride = page - self._last_page
+        self._last_page = page
+        if stride == 0:
+            return []
+        if stride == self._stride:
+            self._seen += 1
+        else:
+            self._stride = stride
+            self._seen = 1
+
+        if self._seen < self.confidence:
+            return []
+        return [page + stride * k for k in range(1, self.degree + 1) if page + stride * k >= 0]
+
+
+class MarkovPrefetcher(Prefetcher):
+    """Miss-correlation prefetcher.
+
+    Learns which miss tends to follow which and, on a miss, prefetches the
+    ``degree`` most frequent successors. The table keeps ``max_entries``
+    source pages (LRU) with at most ``max_successors`` successors each.
+    """
+
+    def __init__(self, degree: int = 2, max_entries: int = 4096, max_successors: int = 4):
+        self.degree = degree
+        self.max_entries = max_entries
+        self.max_successors = max_successors
+        self.reset()
+
+    def reset(self):
+        self._table: OrderedDict[int, Counter] = OrderedDict()
+        self._last_miss = None
+
+    def on_access(self, page, miss, step):
+        if not miss:
+            return []
+
+        last = self._last_miss
+        self._last_miss = page
+        if last is not None and last != page:
+            successors = self._table.get(last)
+            if successors is None:
+                successors = self._table[last] = Counter()
+                if len(self._table) > self.max_entries:
+                    self._table.popitem(last=False)
+            else:
+                self._table.move_to_end(last)
+            successors[page] += 1
+            if len(successors) > self.max_successors:
+                del successors[min(successors, key=successors.__getitem__)]
+
+        successors = self._table.get(page)
+        if not successors:
+            return []
+        self._table.move_to_end(page)
+        return [p for p, _ in successors.most_common(self.degree)]
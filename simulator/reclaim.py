@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+# (frame_index, page, write_back) for every page reclaimed.
+Reclaimed = Tuple[int, int, bool]
+
+
+@dataclass
+class ReclaimStats:
+    direct_stalls: int = 0
+    direct_reclaimed: int = 0
+    background_reclaimed: int = 0
+    kswapd_wakeups: int = 0
+    scanned: int = 0
+    activations: int = 0
+    deactivations: int = 0
+    write_backs: int = 0
+    # Pages scanned by each direct reclaim stall -> number of stalls.
+    stall_scans: Counter = field(default_factory=Counter)
+
+    @property
+    def direct_fraction(self) -> float:
+        return self.direct_reclaimed / max(1, self.direct_reclaimed + self.background_reclaimed)
+
+    def stall_percentile(self, q: float) -> int:
+        """Pages scanned by the stall at quantile ``q`` (0-1) of all direct reclaim stalls."""
+        total = sum(self.stall_scans.values())
+        if not total:
+            return 0
+        seen = 0
+        for scanned in sorted(self.stall_scans):
+            seen += self.stall_scans[scanned]
+            if seen >= q * total:
+                return scanned
+        return max(self.stall_scans)
+
+
+class Reclaimer:
+    """kswapd-style reclaim over Linux-like active/inactive lists.
+
+    Newly mapped frames join the head of the inactive list. Reclaim scans the
+    inactive tail: a frame whose page was referenced since the last scan is
+    activated, anything else is evicted. Whenever the inactive list is
+    shorter than the active one, the active tail is deactivated with its
+    referenced bit cleared.
+
+    After every access, kswapd wakes once the free frames drop below
+    ``low_watermark`` and reclaims up to ``kswapd_batch`` pages per access
+    until ``high_watermark`` frames are free again. A fault that still finds
+    no free frame stalls in direct reclaim, which frees ``direct_batch``
+    pages synchronously. The engine's replacement policy is not consulted.
+    """
+
+    def __init__(self, low_watermark: int, high_watermark: int, kswapd_batch: int = 32, direct_batch: int = 1):
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low <= high.")
+        if kswapd_batch <= 0 or direct_batch <= 0:
+            raise ValueError("Reclaim batches must be positive.")
+
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.kswapd_batch = kswapd_batch
+        self.direct_batch = direct_batch
+        self.engine = None
+
+    def attach(self, engine):
+        if self.high_watermark >= len(engine.frames):
+            raise ValueError("The high watermark must be below the number of frames.")
+        self.engine = engine
+        # Oldest first: the tail is popped with popitem(last=False).
+        self.active: OrderedDict[int, None] = OrderedDict()
+        self.inactive: OrderedDict[int, None] = OrderedDict()
+        self.kswapd_awake = False
+        self.stats = ReclaimStats()
+
+    @property
+    def free_frames(self) -> int:
+        return len(self.engine.frames) - len(self.active) - len(self.inactive)
+
+    def on_map(self, frame_index: int):
+        self.inactive[frame_index] = None
+
+    def on_unmap(self, frame_index: int):
+        self.active.pop(frame_index, None)
+        self.inactive.pop(frame_index, None)
+
+    def _test_and_clear_referenced(self, frame_index: int) -> bool:
+        page_table = self.engine.page_table
+        referenced = False
+        for key in self.engine.rmap[frame_index]:
+            pte = page_table.get(key)
+            referenced = referenced or pte.referenced
+            pte.referenced = False
+        return referenced
+
+    def _deactivate(self):
+        frame_index, _ = self.active.popitem(last=False)
+        self._test_and_clear_referenced(frame_index)
+        self.inactive[frame_index] = None
+        self.stats.deactivations += 1
+
+    def _reclaim(self, target: int) -> Tuple[List[Reclaimed], int]:
+        evicted: List[Reclaimed] = []
+        scanned = 0
+        while len(evicted) < target:
+            if self.active and len(self.inactive) < len(self.active):
+                self._deactivate()
+            if not self.inactive:
+                break
+
+            frame_index, _ = self.inactive.popitem(last=False)
+            scanned += 1
+            if self._test_and_clear_referenced(frame_index):
+                self.active[frame_index] = None
+                self.stats.activations += 1
+                continue
+
+            frame = self.engine.frames[frame_index]
+            page = frame.page
+            write_back = self.engine._evict(frame)
+            evicted.append((frame_index, page, write_back))
+            self.stats.write_backs += write_back
+
+        self.stats.scanned += scanned
+        return evicted, scanned
+
+    def direct_reclaim(self) -> List[Reclaimed]:
+        evicted, scanned = self._reclaim(self.direct_batch)
+        self.stats.direct_stalls += 1
+        self.stats.direct_reclaimed += len(evicted)
+        self.stats.stall_scans[scanned] += 1
+        return evicted
+
+    def background(self) -> List[Reclaimed]:
+        """Run kswapd for one access worth of time."""
+        free = self.free_frames
+        if not self.kswapd_awake:
+            if free >= self.low_watermark:
+                return []
+            self.kswapd_awake = True
+            self.stats.kswapd_wakeups += 1
+
+        evicted, _ = self._reclaim(min(self.kswapd_batch, self.high_watermark - free))
+        self.stats.background_reclaimed += len(evicted)
+        if self.free_frames >= self.high_watermark:
+            self.kswapd_awake = False
+        return evicted
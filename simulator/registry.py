@@ -0,0 +1,136 @@
+"""Replacement policies looked up by name.
+
+Every module in ``simulator.replacement_policies`` provides one
+``ReplacementPolicy`` subclass and is registered under its module name. The
+names come from a directory listing, so nothing is imported until a policy
+is actually requested.
+
+Other packages can add policies through the ``virtual_memory_simulator.policies``
+entry point group, e.g. in their pyproject.toml::
+
+    [project.entry-points."virtual_memory_simulator.policies"]
+    clock = "my_policies.clock:ClockPolicy"
+
+Entry points are only scanned when a name is not a bundled policy or when
+the full list is asked for. A bundled policy always wins a name clash.
+"""
+from __future__ import annotations
+
+import importlib
+import os
+
+POLICY_PACKAGE = "simulator.replacement_policies"
+ENTRY_POINT_GROUP = "virtual_memory_simulator.policies"
+_POLICY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replacement_policies")
+
+# Kept free of the typing and dataclasses modules so importing simulator stays cheap.
+_names: list[str] = []
+_classes: dict[str, type] = {}
+_plugins: dict | None = None
+
+
+class PolicyInfo:
+    """What the registry knows about a policy, read from its class attributes."""
+
+    __slots__ = ("name", "display_name", "source", "needs_future_knowledge", "incremental", "fast_kernel")
+
+    def __init__(self, name: str, policy_class: type, source: str):
+        from simulator.fast_engine import fast_policy_kind
+
+        self.name = name
+        self.display_name = policy_class.display_name or name.upper()
+        # "builtin" or the distribution that provides the entry point.
+        self.source = source
+        self.needs_future_knowledge = policy_class.needs_future_knowledge
+        self.incremental = policy_class.incremental
+        self.fast_kernel = fast_policy_kind(policy_class)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"PolicyInfo({fields})"
+
+
+def _builtin_names() -> list[str]:
+    if not _names:
+        _names.extend(sorted(
+            entry[:-3] for entry in os.listdir(_POLICY_DIR)
+            if entry.endswith(".py") and not entry.startswith("_")
+        ))
+    return _names
+
+
+def _entry_points() -> dict:
+    global _plugins
+    if _plugins is None:
+        from importlib.metadata import entry_points
+
+        builtin = _builtin_names()
+        _plugins = {}
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            key = entry_point.name.lower()
+            if key not in builtin:
+                _plugins.setdefault(key, entry_point)
+    return _plugins
+
+
+def refresh():
+    """Forget discovered policies, e.g. after installing a plugin at runtime."""
+    global _plugins
+    _names.clear()
+    _classes.clear()
+    _plugins = None
+
+
+def available_policies() -> list[str]:
+    return sorted(set(_builtin_names()) | set(_entry_points()))
+
+
+def get_policy(name: str) -> type:
+    """Return the policy class registered as ``name`` (case-insensitive)."""
+    key = name.lower()
+    if key in _classes:
+        return _classes[key]
+
+    from simulator.base_policy import ReplacementPolicy
+
+    if key in _builtin_names():
+        module = importlib.import_module(f"{POLICY_PACKAGE}.{key}")
+        for value in vars(module).values():
+            if isinstance(value, type) and issubclass(value, ReplacementPolicy) and value.__module__ == module.__name__:
+                _classes[key] = value
+                return value
+        raise ValueError(f"Module '{module.__name__}' does not define a replacement policy.")
+
+    entry_point = _entry_points().get(key)
+    if entry_point is None:
+        raise ValueError(f"Unknown policy '{name}'. Available: {', '.join(available_policies())}.")
+    value = entry_point.load()
+    if not (isinstance(value, type) and issubclass(value, ReplacementPolicy)):
+        raise ValueError(f"Entry point '{entry_point.value}' is not a ReplacementPolicy subclass.")
+    _classes[key] = value
+    return value
+
+
+def policy_info(name: str) -> PolicyInfo:
+    policy_class = get_policy(name)
+    key = name.lower()
+    if key in _builtin_names():
+        source = "builtin"
+    else:
+        dist = getattr(_entry_points()[key], "dist", None)
+        source = dist.name if dist is not None else "entry point"
+    return PolicyInfo(key, policy_class, source)
+
+
+def fastest_engine(name: str, per_step: bool = False) -> str:
+    """The fastest engine mode that can run policy ``name``.
+
+    The fast engine needs a kernel for the policy and reports no per-step results.
+    """
+    if per_step or policy_info(name).fast_kernel is None:
+        return "reference"
+    return "fast"
+
+
+def create_policy(name: str, **kwargs):
+    return get_policy(name)(**kwargs)
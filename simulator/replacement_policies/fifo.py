@@ -7,6 +7,8 @@ from simulator.base_policy import ReplacementPolicy
 
 
 class FIFOAlgorithm(ReplacementPolicy):
+    display_name = "FIFO"
+    fast_kernel = "fifo"
 
     def __init__(self) -> None:
         self._order: deque[int] = deque()
@@ -29,3 +31,21 @@ class FIFOAlgorithm(ReplacementPolicy):
         victim = self._order.popleft()
         self._order.append(victim)
         return victim
+
+    def select_victim_among(
+        self,
+        frames: list[Optional[int]],
+        reference_string: list[int],
+        current_index: int,
+        candidates: list[int],
+    ) -> int:
+        self._ensure_initialized(frames)
+
+        if not self._order:
+            return candidates[0]
+
+        allowed = set(candidates)
+        victim = next(f for f in self._order if f in allowed)
+        self._order.remove(victim)
+        self._order.append(victim)
+        return victim
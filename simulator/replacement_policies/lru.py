@@ -5,6 +5,8 @@ from simulator.base_policy import ReplacementPolicy
 
 
 class LRUAlgorithm(ReplacementPolicy):
+    display_name = "LRU"
+    fast_kernel = "lru"
 
     def select_victim(
         self,
@@ -5,6 +5,9 @@ from simulator.base_policy import ReplacementPolicy
 
 
 class OptimalAlgorithm(ReplacementPolicy):
+    display_name = "Optimal"
+    needs_future_knowledge = True
+    fast_kernel = "optimal"
 
     def select_victim(
         self,
@@ -0,0 +1,220 @@
+"""Streaming export of per-step results.
+
+Writers take ``SimulationStepResult`` objects in batches and only keep the
+current batch in memory, so runs of any length can be logged. Every writer
+can be limited to a subset of ``STEP_COLUMNS``; e.g. ``["step", "fault",
+"evicted_page"]`` is enough to study faults and evictions.
+
+``ColumnarStepWriter`` stores one raw little-endian file per column in a
+directory, next to a ``columns.json`` manifest that records the dtypes, the
+row count and an optional run summary. ``read_step_columns`` loads (or
+memory-maps) only the columns asked for.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence, TextIO
+
+import numpy as np
+
+from simulator.simulation_step_result import SimulationStepResult
+from simulator.trace import OP_FETCH, OP_READ, OP_WRITE
+
+# Column name -> (binary dtype, step result attribute). Missing frames and
+# pages (None) are stored as -1 in binary files and left empty in CSV.
+STEP_COLUMNS: Dict[str, tuple] = {
+    "step": ("<i8", "step_index"),
+    "virtual_address": ("<u8", "virtual_address"),
+    "operation": ("u1", "operation"),
+    "page": ("<u8", "page"),
+    "offset": ("<u8", "offset"),
+    "tlb_hit": ("?", "tlb_hit"),
+    "hit": ("?", "hit"),
+    "frame": ("<i8", "frame_index"),
+    "evicted_page": ("<i8", "evicted_page"),
+    "write_back": ("?", "write_back"),
+    "fault": ("?", "fault"),
+    "victim_frame": ("<i8", "victim_frame_index"),
+    "prefetch_hit": ("?", "prefetch_hit"),
+    "tlb_shootdowns": ("<i4", "tlb_shootdowns"),
+    "direct_reclaimed": ("<i4", "direct_reclaimed"),
+    "background_reclaimed": ("<i4", "background_reclaimed"),
+}
+DEFAULT_COLUMNS = [
+    "step", "virtual_address", "operation", "page", "offset",
+    "tlb_hit", "hit", "frame", "evicted_page", "write_back",
+]
+MANIFEST = "columns.json"
+FORMAT_VERSION = 1
+
+_OP_CODES = {"R": OP_READ, "W": OP_WRITE, "X": OP_FETCH}
+
+
+def check_columns(columns: Optional[Sequence[str]]) -> List[str]:
+    columns = list(DEFAULT_COLUMNS if columns is None else columns)
+    unknown = [c for c in columns if c not in STEP_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(STEP_COLUMNS)}.")
+    if not columns or len(set(columns)) != len(columns):
+        raise ValueError("Give at least one column, each at most once.")
+    return columns
+
+
+def column_values(results: Sequence[SimulationStepResult], column: str) -> list:
+    attr = STEP_COLUMNS[column][1]
+    return [getattr(r, attr) for r in results]
+
+
+def column_array(results: Sequence[SimulationStepResult], column: str) -> np.ndarray:
+    values = column_values(results, column)
+    dtype = STEP_COLUMNS[column][0]
+    if column == "operation":
+        values = [_OP_CODES[op] for op in values]
+    elif dtype == "<i8":
+        values = [-1 if v is None else v for v in values]
+    return np.array(values, dtype=dtype)
+
+
+class ColumnarStepWriter:
+    """Appends batches of step results to a columnar result directory."""
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None):
+        self.path = path
+        self.columns = check_columns(columns)
+        self.count = 0
+        os.makedirs(path, exist_ok=True)
+        self._files = {c: open(os.path.join(path, f"{c}.bin"), "wb") for c in self.columns}
+
+    def write(self, results: Sequence[SimulationStepResult]):
+        for column, fh in self._files.items():
+            column_array(results, column).tofile(fh)
+        self.count += len(results)
+
+    def close(self, summary: Optional[dict] = None):
+        """Finish the files; ``summary`` is stored in the manifest."""
+        if not self._files:
+            return
+        for fh in self._files.values():
+            fh.close()
+        self._files = {}
+        manifest = {
+            "version": FORMAT_VERSION,
+            "rows": self.count,
+            "columns": {c: STEP_COLUMNS[c][0] for c in self.columns},
+            "summary": summary,
+        }
+        with open(os.path.join(self.path, MANIFEST), "w") as fh:
+            json.dump(manifest, fh, indent=2)
+
+    def __enter__(self) -> ColumnarStepWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_manifest(path: str) -> dict:
+    try:
+        with open(os.path.join(path, MANIFEST)) as fh:
+            manifest = json.load(fh)
+    except FileNotFoundError:
+        raise ValueError(f"'{path}' is not a result directory.") from None
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result format version {manifest.get('version')}.")
+    return manifest
+
+
+def read_step_columns(path: str, columns: Optional[Sequence[str]] = None, mmap: bool = False) -> Dict[str, np.ndarray]:
+    """Load the given columns (all stored ones by default) of a result directory."""
+    manifest = read_manifest(path)
+    stored = manifest["columns"]
+    columns = list(stored) if columns is None else list(columns)
+    missing = [c for c in columns if c not in stored]
+    if missing:
+        raise ValueError(f"Columns not in '{path}': {', '.join(missing)}.")
+
+    rows = manifest["rows"]
+    arrays = {}
+    for column in columns:
+        file = os.path.join(path, f"{column}.bin")
+        dtype = np.dtype(stored[column])
+        if mmap and rows:
+            arrays[column] = np.memmap(file, dtype=dtype, mode="r", shape=(rows,))
+        else:
+            arrays[column] = np.fromfile(file, dtype=dtype, count=rows)
+    return arrays
+
+
+def _csv_cell(value) -> str:
+    return "" if value is None else str(value)
+
+
+class CsvStepWriter:
+    """Writes step results as CSV, formatting and writing a whole batch at a time.
+
+    Rows are buffered until ``buffer_rows`` are pending, so small batches do
+    not turn into many small writes.
+    """
+
+    def __init__(self, out: TextIO, columns: Optional[Sequence[str]] = None, buffer_rows: int = 8192, header: bool = True):
+        if buffer_rows <= 0:
+            raise ValueError("The buffer must hold at least one row.")
+        self.out = out
+        self.columns = check_columns(columns)
+        self.buffer_rows = buffer_rows
+        self.count = 0
+        self._pending: List[str] = []
+        self._pending_rows = 0
+        if header:
+            self._pending.append(",".join(self.columns) + "\r\n")
+
+    def write(self, results: Sequence[SimulationStepResult]):
+        if not results:
+            return
+        cells = [map(_csv_cell, column_values(results, c)) for c in self.columns]
+        self._pending.append("\r\n".join(map(",".join, zip(*cells))) + "\r\n")
+        self._pending_rows += len(results)
+        self.count += len(results)
+        if self._pending_rows >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.out.write("".join(self._pending))
+            self._pending = []
+            self._pending_rows = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> CsvStepWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JsonLinesStepWriter:
+    """Writes one JSON object per step result with the selected columns."""
+
+    def __init__(self, out: TextIO, columns: Optional[Sequence[str]] = None):
+        self.out = out
+        self.columns = check_columns(columns)
+        self.count = 0
+
+    def write(self, results: Sequence[SimulationStepResult]):
+        if not results:
+            return
+        cells = [column_values(results, c) for c in self.columns]
+        self.out.write("".join(json.dumps(dict(zip(self.columns, row))) + "\n" for row in zip(*cells)))
+        self.count += len(results)
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> JsonLinesStepWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
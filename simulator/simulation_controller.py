@@ -1,8 +1,13 @@
 from simulator.simulation_engine import SimulationEngine
+from simulator.fast_engine import FastSimulationEngine
 from simulator.statistics_tracker import StatisticsTracker
+from simulator.frame_history import FrameHistory
+from simulator.instrumentation import EngineProfiler
 from simulator.vm_config import VMConfig
 from simulator.base_policy import ReplacementPolicy
 
+ENGINE_MODES = ("reference", "fast")
+
 class SimulationController:
 
     def __init__(
@@ -10,32 +15,128 @@ class SimulationController:
         vm_config: VMConfig,
         reference_string,
         policy: ReplacementPolicy,
-        tlb_entries: int
+        tlb_entries: int,
+        record_history: bool = True,
+        profiler: EngineProfiler = None,
+        engine_mode: str = "reference",
+        tlb_factory=None,
+        page_prefetcher=None,
+        tlb_prefetcher=None,
+        backing_store=None,
+        numa=None,
+        reclaimer=None,
+        decoded=None
     ):
+        if engine_mode not in ENGINE_MODES:
+            raise ValueError(f"Unknown engine mode '{engine_mode}'.")
+        if engine_mode == "fast" and profiler is not None:
+            raise ValueError("Profiling requires the reference engine.")
+        if engine_mode == "fast" and tlb_factory is not None:
+            raise ValueError("The fast engine only models a fully associative TLB.")
+        if engine_mode == "fast" and (page_prefetcher is not None or tlb_prefetcher is not None):
+            raise ValueError("Prefetching requires the reference engine.")
+        if engine_mode == "fast" and backing_store is not None:
+            raise ValueError("Swap modelling requires the reference engine.")
+        if engine_mode == "fast" and numa is not None:
+            raise ValueError("NUMA modelling requires the reference engine.")
+        if engine_mode == "fast" and reclaimer is not None:
+            raise ValueError("Reclaim modelling requires the reference engine.")
+
         self.vm_config = vm_config
         self.reference_string = reference_string
         self.policy = policy
         self.tlb_entries = tlb_entries
+        self.engine_mode = engine_mode
+        self.tlb_factory = tlb_factory
+        self.page_prefetcher = page_prefetcher
+        self.tlb_prefetcher = tlb_prefetcher
+        self.backing_store = backing_store
+        self.numa = numa
+        self.reclaimer = reclaimer
+        # Fast controllers over the same trace can share one DecodedTrace.
+        self._decoded = decoded
 
-        self.engine = SimulationEngine(vm_config, reference_string, policy, tlb_entries)
+        self.engine = self._build_engine()
         self.stats = StatisticsTracker()
+        self._attach_tlb()
+        self.history = FrameHistory(vm_config.num_frames) if record_history and not self.is_fast else None
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.attach(self.engine)
+
+    def _attach_tlb(self):
+        if not self.is_fast:
+            self.stats.attach_tlb(self.engine.tlb)
+
+    @property
+    def is_fast(self):
+        return self.engine_mode == "fast"
+
+    def _build_engine(self):
+        if self.is_fast:
+            engine = FastSimulationEngine(
+                self.vm_config, self.reference_string, self.policy, self.tlb_entries, decoded=self._decoded
+            )
+            self._decoded = engine.trace
+            return engine
+        for prefetcher in (self.page_prefetcher, self.tlb_prefetcher):
+            if prefetcher is not None:
+                prefetcher.reset()
+        return SimulationEngine(
+            self.vm_config, self.reference_string, self.policy, self.tlb_entries,
+            tlb_factory=self.tlb_factory,
+            page_prefetcher=self.page_prefetcher,
+            tlb_prefetcher=self.tlb_prefetcher,
+            backing_store=self.backing_store,
+            numa=self.numa,
+            reclaimer=self.reclaimer
+        )
 
     def step(self):
+        if self.is_fast:
+            raise RuntimeError("Per-step results are not available in fast mode; use run().")
         if self.engine.has_finished():
             return None
         step = self.engine.step()
         self.stats.record_step(step)
+        if self.history is not None:
+            self.history.record(step)
         return step
 
+    def frames_at(self, step_index: int):
+        if self.history is None:
+            raise RuntimeError("Frame history is disabled for this controller.")
+        return self.history.frames_at(step_index)
+
+    def run(self, max_steps: int = None):
+        """Advance up to max_steps accesses (all remaining if None) and return how many ran."""
+        if self.is_fast:
+            counts = self.engine.run(max_steps)
+            self.stats.record_counts(counts)
+            return counts.steps
+
+        done = 0
+        while not self.engine.has_finished() and (max_steps is None or done < max_steps):
+            self.step()
+            done += 1
+        return done
+
     def run_all(self):
+        if self.is_fast:
+            raise RuntimeError("Per-step results are not available in fast mode; use run().")
         results = []
         while not self.engine.has_finished():
             results.append(self.step())
         return results
 
     def reset(self):
-        self.engine = SimulationEngine(self.vm_config, self.reference_string, self.policy, self.tlb_entries)
+        self.engine = self._build_engine()
         self.stats.reset()
+        self._attach_tlb()
+        if self.profiler is not None:
+            self.profiler.attach(self.engine)
+        if self.history is not None:
+            self.history.reset()
 
     def is_finished(self):
         return self.engine.has_finished()
@@ -1,7 +1,11 @@
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Set
 from simulator.vm_config import VMConfig
 from simulator.tlb import TLB
-from simulator.page_table import PageTable
+from simulator.page_table import PageTable, PageTableEntry
+from simulator.prefetch import Prefetcher
+from simulator.swap import BackingStore
+from simulator.numa import NumaAllocator
+from simulator.reclaim import Reclaimer
 from simulator.frame import Frame
 from simulator.simulation_step_result import SimulationStepResult
 from simulator.base_policy import ReplacementPolicy
@@ -14,27 +18,284 @@ class SimulationEngine:
         vm_config: VMConfig,
         reference_string: List[tuple[int, str]],
         policy: ReplacementPolicy,
-        tlb_entries: int
+        tlb_entries: int,
+        tlb_factory: Optional[Callable[[], TLB]] = None,
+        page_prefetcher: Optional[Prefetcher] = None,
+        tlb_prefetcher: Optional[Prefetcher] = None,
+        backing_store: Optional[BackingStore] = None,
+        numa: Optional[NumaAllocator] = None,
+        reclaimer: Optional[Reclaimer] = None
     ):
         self.cfg = vm_config
         self.reference_string = reference_string
         self.policy = policy
+        self._policy_hook = policy.on_access if policy.incremental else None
 
-        self.tlb = TLB(tlb_entries)
+        self.tlb = tlb_factory() if tlb_factory is not None else TLB(tlb_entries)
         self.frames: List[Frame] = [Frame(i) for i in range(self.cfg.num_frames)]
         self.page_table = PageTable()
+        # Frame index -> keys of every page table entry mapping it.
+        self.rmap: Dict[int, Set[int]] = {}
+        self._step_shootdowns = 0
+        self.page_prefetcher = page_prefetcher
+        self.tlb_prefetcher = tlb_prefetcher
+        self._evicted_by_prefetch: Set[int] = set()
+        self._tlb_prefetched: Set[int] = set()
+        self.backing_store = backing_store
+        if backing_store is not None:
+            backing_store.attach(self.page_table)
+        self.numa = numa
+        if numa is not None:
+            numa.reset()
+        self.reclaimer = reclaimer
+        if reclaimer is not None:
+            reclaimer.attach(self)
+        self._step_reclaimed: List[int] = []
+        self._step_direct_reclaimed = 0
+        self._step_background_reclaimed = 0
+        self._step_reclaim_write_backs = 0
 
         self.current_step = 0
+        self._page_trace: Optional[List[int]] = None
 
-    def _find_free_frame(self) -> Optional[Frame]:
+    def _find_free_frame(self, page: Optional[int] = None) -> Optional[Frame]:
+        if self.numa is not None:
+            return self.numa.free_frame(self.frames, page, self.current_step)
         for f in self.frames:
             if f.is_free:
                 return f
         return None
 
+    def _pages(self) -> List[int]:
+        if self._page_trace is None:
+            pages = getattr(self.reference_string, "pages", None)
+            if pages is not None:
+                self._page_trace = pages(self.cfg.offset_bits).tolist()
+            else:
+                self._page_trace = [addr >> self.cfg.offset_bits for addr, _ in self.reference_string]
+        elif len(self._page_trace) < len(self.reference_string):
+            # Event-driven runs append to the reference string as accesses are issued.
+            shift = self.cfg.offset_bits
+            self._page_trace.extend(
+                addr >> shift for addr, _ in self.reference_string[len(self._page_trace):]
+            )
+        return self._page_trace
+
     def _frames_snapshot(self):
         return [f.page for f in self.frames]
 
+    def _allocate_frame(self, exclude: Optional[int] = None, page: Optional[int] = None):
+        """Pick a frame for a page about to be loaded, evicting its page if needed.
+
+        Returns (frame, victim_frame_index, evicted_page, write_back).
+        Prefetching passes the frame of the page that was just demanded as
+        ``exclude``: the policy then sees the current access as already past
+        and picks among the other frames, leaving out pages that were
+        prefetched and not used yet, since replacing them would only churn.
+        The frame is None when no frame is left to pick.
+        """
+        free_frame = self._find_free_frame(page)
+        if free_frame:
+            return free_frame, None, None, False
+        if self.reclaimer is not None:
+            # Prefetching never stalls in direct reclaim.
+            if exclude is not None:
+                return None, None, None, False
+            return self._direct_reclaim(page)
+
+        frames, pages = self._frames_snapshot(), self._pages()
+        step = self.current_step if exclude is None else self.current_step + 1
+        candidates = None
+        if exclude is not None:
+            candidates = [
+                f.index for f in self.frames
+                if f.index != exclude and not self.page_table.get(f.page).prefetched
+            ]
+        if self.numa is not None:
+            candidates = self.numa.victim_frames(page, self.current_step, candidates)
+        if candidates is None:
+            victim_frame_index = self.policy.select_victim(frames, pages, step)
+        elif candidates:
+            victim_frame_index = self.policy.select_victim_among(frames, pages, step, candidates)
+        else:
+            return None, None, None, False
+        frame = self.frames[victim_frame_index]
+
+        evicted_page = frame.page
+        write_back = self._evict(frame)
+        return frame, victim_frame_index, evicted_page, write_back
+
+    def _direct_reclaim(self, page: Optional[int]):
+        evicted = self.reclaimer.direct_reclaim()
+        frame = self._find_free_frame(page)
+        victim_frame_index = evicted_page = None
+        write_back = False
+        for frame_index, old_page, dirty in evicted:
+            if frame_index == frame.index:
+                victim_frame_index, evicted_page, write_back = frame_index, old_page, dirty
+            else:
+                self._step_reclaimed.append(frame_index)
+                self._step_reclaim_write_backs += dirty
+        self._step_direct_reclaimed += len(evicted)
+        return frame, victim_frame_index, evicted_page, write_back
+
+    def _background_reclaim(self):
+        evicted = self.reclaimer.background()
+        for frame_index, _, dirty in evicted:
+            self._step_reclaimed.append(frame_index)
+            self._step_reclaim_write_backs += dirty
+        self._step_background_reclaimed += len(evicted)
+
+    def _reclaim_extras(self) -> dict:
+        """Step-result fields for this step's reclaim, resetting the per-step counters."""
+        extras = {
+            "direct_reclaimed": self._step_direct_reclaimed,
+            "background_reclaimed": self._step_background_reclaimed,
+            "reclaim_write_backs": self._step_reclaim_write_backs,
+            # Reclaimed frames that were not reused by this step are now empty.
+            "frame_updates": tuple((i, None) for i in self._step_reclaimed if self.frames[i].is_free),
+        }
+        self._step_reclaimed = []
+        self._step_direct_reclaimed = self._step_background_reclaimed = self._step_reclaim_write_backs = 0
+        return extras
+
+    def _shootdown(self, page: int):
+        if self.tlb.invalidate(page):
+            self._step_shootdowns += 1
+
+    def _evict(self, frame: Frame) -> bool:
+        """Unmap every page mapping ``frame``; return whether it must be written back."""
+        if self.reclaimer is not None:
+            self.reclaimer.on_unmap(frame.index)
+        mappings = [self.page_table.get(key) for key in self.rmap.pop(frame.index, ())]
+        write_back = any(pte.dirty for pte in mappings)
+        if self.backing_store is not None:
+            self.backing_store.page_out(self.page_table.get(frame.page), write_back)
+
+        for pte in mappings:
+            pte.present = False
+            pte.frame_index = None
+            pte.referenced = False
+            pte.dirty = False
+            pte.prefetched = False
+            pte.cow = False
+            self._shootdown(pte.page)
+
+        frame.page = None
+        frame.ref_count = 0
+        return write_back
+
+    def _map(self, frame: Frame, pte: PageTableEntry, prefetched: bool = False):
+        if self.backing_store is not None:
+            self.backing_store.page_in(pte)
+        frame.page = pte.page
+        frame.loaded_time = self.current_step
+        frame.last_access_time = self.current_step
+        frame.ref_count = 1
+
+        pte.present = True
+        pte.frame_index = frame.index
+        pte.referenced = not prefetched
+        pte.prefetched = prefetched
+        self.rmap[frame.index] = {pte.page}
+        if self.reclaimer is not None:
+            self.reclaimer.on_map(frame.index)
+
+    def _migrate(self, frame_index: int, node: int):
+        """Move the page in ``frame_index`` to a frame on ``node``.
+
+        Evicts a page on ``node`` if it has no free frame, unless a reclaimer
+        manages the free frames. Returns (frame changes, write_back).
+        """
+        target = self.numa.free_frame_on(self.frames, node)
+        write_back = False
+        if target is None:
+            candidates = list(self.numa.frames_on(node))
+            if self.reclaimer is not None or not candidates:
+                return (), False
+            victim_frame_index = self.policy.select_victim_among(
+                self._frames_snapshot(), self._pages(), self.current_step + 1, candidates
+            )
+            target = self.frames[victim_frame_index]
+            write_back = self._evict(target)
+        source = self.frames[frame_index]
+        target.page = source.page
+        target.loaded_time = source.loaded_time
+        target.last_access_time = self.current_step
+        target.ref_count = source.ref_count
+
+        keys = self.rmap.pop(frame_index)
+        self.rmap[target.index] = keys
+        for key in keys:
+            self.page_table.get(key).frame_index = target.index
+            self._shootdown(key)
+
+        source.page = None
+        source.ref_count = 0
+        if self.reclaimer is not None:
+            self.reclaimer.on_unmap(frame_index)
+            self.reclaimer.on_map(target.index)
+        self.numa.record_migration(frame_index, target.index)
+        return ((frame_index, None), (target.index, target.page)), write_back
+
+    def _prefetch_pages(self, page: int, fault: bool, frame_index: int):
+        loaded = []
+        write_backs = 0
+        for candidate in self.page_prefetcher.on_access(page, fault, self.current_step):
+            if candidate == page or not 0 <= candidate < self.cfg.num_virtual_pages:
+                continue
+            pte = self.page_table.get_or_create(candidate)
+            if pte.present:
+                continue
+
+            frame, _, evicted_page, write_back = self._allocate_frame(exclude=frame_index, page=candidate)
+            if frame is None:
+                break
+            if evicted_page is not None:
+                self._evicted_by_prefetch.add(evicted_page)
+            self._evicted_by_prefetch.discard(candidate)
+            write_backs += write_back
+
+            self._map(frame, pte, prefetched=True)
+            loaded.append((frame.index, candidate, evicted_page))
+        return tuple(loaded), write_backs
+
+    def _prefetch_tlb(self, page: int, tlb_hit: bool, fetch: bool) -> int:
+        issued = 0
+        for candidate in self.tlb_prefetcher.on_access(page, not tlb_hit, self.current_step):
+            if candidate == page or candidate in self.tlb:
+                continue
+            pte = self.page_table.get(candidate)
+            if pte is None or not pte.present:
+                continue
+            self.tlb.insert(candidate, pte.frame_index, self.current_step, fetch)
+            self._tlb_prefetched.add(candidate)
+            issued += 1
+
+        if len(self._tlb_prefetched) > 4 * self.tlb.size:
+            self._tlb_prefetched = {p for p in self._tlb_prefetched if p in self.tlb}
+        return issued
+
+    def _make_result(
+        self, virtual_address, operation, page, offset, hit, fault, tlb_hit,
+        frame_index, victim_frame_index, evicted_page, write_back, **extra
+    ) -> SimulationStepResult:
+        return SimulationStepResult(
+            step_index=self.current_step,
+            virtual_address=virtual_address,
+            operation=operation,
+            page=page,
+            offset=offset,
+            hit=hit,
+            fault=fault,
+            tlb_hit=tlb_hit,
+            frame_index=frame_index,
+            victim_frame_index=victim_frame_index,
+            evicted_page=evicted_page,
+            write_back=write_back,
+            **extra
+        )
+
     def has_finished(self):
         return self.current_step >= len(self.reference_string)
 
@@ -47,13 +308,21 @@ class SimulationEngine:
         page = virtual_address >> self.cfg.offset_bits
         offset = virtual_address & (self.cfg.page_size - 1)
 
-        tlb_frame = self.tlb.lookup(page, self.current_step)
+        fetch = operation == "X"
+        tlb_frame = self.tlb.lookup(page, self.current_step, fetch)
         tlb_hit = tlb_frame is not None
         write_back = False
-        
+        prefetch_hit = False
+        prefetch_pollution = False
+        tlb_prefetch_hit = False
+
         victim_frame_index = None
         evicted_page = None
 
+        if self._tlb_prefetched:
+            tlb_prefetch_hit = tlb_hit and page in self._tlb_prefetched
+            self._tlb_prefetched.discard(page)
+
         if tlb_hit:
             frame_index = tlb_frame
             frame = self.frames[frame_index]
@@ -63,6 +332,9 @@ class SimulationEngine:
             pte.referenced = True
             if operation == "W":
                 pte.dirty = True
+            if pte.prefetched:
+                pte.prefetched = False
+                prefetch_hit = True
 
             hit = True
             fault = False
@@ -80,71 +352,72 @@ class SimulationEngine:
                 pte.referenced = True
                 if operation == "W":
                     pte.dirty = True
+                if pte.prefetched:
+                    pte.prefetched = False
+                    prefetch_hit = True
 
-                self.tlb.insert(page, frame_index, self.current_step)
+                self.tlb.insert(page, frame_index, self.current_step, fetch)
 
             else:
                 hit = False
                 fault = True
 
-                free_frame = self._find_free_frame()
-                evicted_page = None
-                victim_frame_index = None
-
-                if free_frame:
-                    frame = free_frame
-                else:
-                    frames_list = self._frames_snapshot()
-                    victim_frame_index = self.policy.select_victim(
-                        frames_list,
-                        [addr >> self.cfg.offset_bits for addr, _ in self.reference_string],
-                        self.current_step
-                    )
-                    frame = self.frames[victim_frame_index]
-
-                    evicted_page = frame.page
-                    old_pte = self.page_table.get_or_create(evicted_page)
-                    
-                    if old_pte.dirty:
-                        write_back = True
-                    
-                    old_pte.present = False
-                    old_pte.frame_index = None
-                    old_pte.referenced = False
-                    old_pte.dirty = False
-
-                    if evicted_page in self.tlb.entries:
-                        del self.tlb.entries[evicted_page]
-
-                frame.page = page
-                frame.loaded_time = self.current_step
-                frame.last_access_time = self.current_step
+                if self._evicted_by_prefetch:
+                    prefetch_pollution = page in self._evicted_by_prefetch
+                    self._evicted_by_prefetch.discard(page)
 
-                pte.present = True
-                pte.frame_index = frame.index
-                pte.referenced = True
+                frame, victim_frame_index, evicted_page, write_back = self._allocate_frame(page=page)
+                self._map(frame, pte)
                 if operation == "W":
                     pte.dirty = True
 
                 frame_index = frame.index
 
-                self.tlb.insert(page, frame_index, self.current_step)
+                self.tlb.insert(page, frame_index, self.current_step, fetch)
 
-        result = SimulationStepResult(
-            step_index=self.current_step,
-            virtual_address=virtual_address,
-            operation=operation,
-            page=page,
-            offset=offset,
-            hit=hit,
-            fault=fault,
-            tlb_hit=tlb_hit,
-            frame_index=frame_index,
-            victim_frame_index=victim_frame_index if not tlb_hit else None,
-            evicted_page=evicted_page if not tlb_hit else None,
-            write_back=write_back,
-            frames_snapshot=self._frames_snapshot()
+        frame_updates = ()
+        migration_write_back = False
+        if self.numa is not None:
+            node = self.numa.record_access(frame_index, page, self.current_step, fault)
+            if node is not None:
+                frame_updates, migration_write_back = self._migrate(frame_index, node)
+
+        prefetched = ()
+        prefetch_write_backs = 0
+        if self.page_prefetcher is not None:
+            # Exclude the frame the page lives in now, after any migration.
+            prefetched, prefetch_write_backs = self._prefetch_pages(page, fault, pte.frame_index)
+
+        tlb_prefetches = 0
+        if self.tlb_prefetcher is not None:
+            tlb_prefetches = self._prefetch_tlb(page, tlb_hit, fetch)
+
+        reclaim = {}
+        if self.reclaimer is not None:
+            self._background_reclaim()
+            reclaim = self._reclaim_extras()
+            frame_updates += reclaim.pop("frame_updates")
+
+        if self._policy_hook is not None:
+            self._policy_hook(frame_index, page, self.current_step, fault)
+
+        result = self._make_result(
+            virtual_address, operation, page, offset, hit, fault, tlb_hit, frame_index,
+            victim_frame_index if not tlb_hit else None,
+            evicted_page if not tlb_hit else None,
+            write_back,
+            prefetched=prefetched,
+            prefetch_hit=prefetch_hit,
+            prefetch_pollution=prefetch_pollution,
+            prefetch_write_backs=prefetch_write_backs,
+            tlb_prefetches=tlb_prefetches,
+            tlb_prefetch_hit=tlb_prefetch_hit,
+            tlb_shootdowns=self._step_shootdowns,
+            migration_write_back=migration_write_back,
+            frame_updates=frame_updates,
+            **reclaim
         )
 
+        self._step_shootdowns = 0
         self.current_step += 1
         return result
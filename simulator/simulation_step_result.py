@@ -1,5 +1,8 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterator, Optional, Tuple
+
+# (frame_index, page, evicted_page) for each page loaded by read-ahead.
+PrefetchLoad = Tuple[int, int, Optional[int]]
 
 @dataclass
 class SimulationStepResult:
@@ -15,4 +18,27 @@ class SimulationStepResult:
     victim_frame_index: Optional[int]
     evicted_page: Optional[int]
     write_back: bool
-    frames_snapshot: List[Optional[int]]
+    prefetched: Tuple[PrefetchLoad, ...] = ()
+    prefetch_hit: bool = False
+    prefetch_pollution: bool = False
+    prefetch_write_backs: int = 0
+    tlb_prefetches: int = 0
+    tlb_prefetch_hit: bool = False
+    cow_fault: bool = False
+    cow_copy: bool = False
+    tlb_shootdowns: int = 0
+    direct_reclaimed: int = 0
+    background_reclaimed: int = 0
+    reclaim_write_backs: int = 0
+    # A NUMA migration evicted a dirty page on the destination node.
+    migration_write_back: bool = False
+    # Other (frame_index, page) changes, e.g. the private frame of a COW copy.
+    frame_updates: Tuple[Tuple[int, Optional[int]], ...] = ()
+
+    def frame_deltas(self) -> Iterator[Tuple[int, Optional[int]]]:
+        """Yield (frame_index, new_page) for every frame changed by this step."""
+        if self.fault and self.frame_index is not None:
+            yield self.frame_index, self.page
+        for frame_index, page, _ in self.prefetched:
+            yield frame_index, page
+        yield from self.frame_updates
@@ -6,6 +6,24 @@ class StatisticsTracker:
         self.tlb_hits = 0
         self.tlb_misses = 0
         self.disk_writes = 0
+        self.prefetches_issued = 0
+        self.prefetch_hits = 0
+        self.prefetch_pollution = 0
+        self.tlb_prefetches_issued = 0
+        self.tlb_prefetch_hits = 0
+        self.cow_faults = 0
+        self.cow_copies = 0
+        self.tlb_shootdowns = 0
+        self.direct_reclaim_stalls = 0
+        self.direct_reclaimed = 0
+        self.background_reclaimed = 0
+        self.tlb_levels = {}
+        self._tlb = None
+
+    def attach_tlb(self, tlb):
+        """Expose the per-level hit/miss/conflict counters kept by the engine's TLB."""
+        self._tlb = tlb
+        self.tlb_levels = tlb.level_stats()
 
     def record_step(self, step):
         if step.tlb_hit:
@@ -21,6 +39,40 @@ class StatisticsTracker:
         else:
             self.page_faults += 1
 
+        if step.prefetched:
+            self.prefetches_issued += len(step.prefetched)
+            self.disk_writes += step.prefetch_write_backs
+        if step.prefetch_hit:
+            self.prefetch_hits += 1
+        if step.prefetch_pollution:
+            self.prefetch_pollution += 1
+        if step.tlb_prefetches:
+            self.tlb_prefetches_issued += step.tlb_prefetches
+        if step.tlb_prefetch_hit:
+            self.tlb_prefetch_hits += 1
+        if step.direct_reclaimed:
+            self.direct_reclaim_stalls += 1
+            self.direct_reclaimed += step.direct_reclaimed
+        if step.background_reclaimed:
+            self.background_reclaimed += step.background_reclaimed
+        if step.reclaim_write_backs:
+            self.disk_writes += step.reclaim_write_backs
+        if step.migration_write_back:
+            self.disk_writes += 1
+        if step.tlb_shootdowns:
+            self.tlb_shootdowns += step.tlb_shootdowns
+        if step.cow_fault:
+            self.cow_faults += 1
+            if step.cow_copy:
+                self.cow_copies += 1
+
+    def record_counts(self, counts):
+        self.tlb_hits += counts.tlb_hits
+        self.tlb_misses += counts.tlb_misses
+        self.page_hits += counts.page_hits
+        self.page_faults += counts.page_faults
+        self.disk_writes += counts.disk_writes
+
     @property
     def total_accesses(self):
         return self.page_hits + self.page_faults
@@ -29,6 +81,10 @@ class StatisticsTracker:
     def tlb_total(self):
         return self.tlb_hits + self.tlb_misses
 
+    @property
+    def translation_cycles(self):
+        return getattr(self._tlb, "cycles", 0)
+
     @property
     def tlb_hit_ratio(self):
         return self.tlb_hits / max(1, self.tlb_total)
@@ -37,5 +93,23 @@ class StatisticsTracker:
     def page_fault_ratio(self):
         return self.page_faults / max(1, self.total_accesses)
 
+    @property
+    def prefetch_accuracy(self):
+        """Share of prefetched pages that were used before being evicted."""
+        return self.prefetch_hits / max(1, self.prefetches_issued)
+
+    @property
+    def prefetch_coverage(self):
+        """Share of would-be page faults that prefetching turned into hits."""
+        return self.prefetch_hits / max(1, self.prefetch_hits + self.page_faults)
+
+    @property
+    def tlb_prefetch_accuracy(self):
+        return self.tlb_prefetch_hits / max(1, self.tlb_prefetches_issued)
+
+    @property
+    def tlb_prefetch_coverage(self):
+        return self.tlb_prefetch_hits / max(1, self.tlb_prefetch_hits + self.tlb_misses)
+
     def reset(self):
         self.__init__()
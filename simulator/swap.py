@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from math import ceil
+from typing import Deque, List, Optional
+
+from simulator.page_table import PageTable, PageTableEntry
+from simulator.units import format_bytes
+
+
+@dataclass
+class SwapStats:
+    pages_written: int = 0
+    pages_read: int = 0
+    bytes_written: int = 0
+    bytes_read: int = 0
+    sequential_ios: int = 0
+    random_ios: int = 0
+    io_time: float = 0.0
+    zswap_stores: int = 0
+    zswap_loads: int = 0
+    zswap_writebacks: int = 0
+    zero_fills: int = 0
+
+    @property
+    def bytes_moved(self) -> int:
+        return self.bytes_written + self.bytes_read
+
+    @property
+    def sequential_fraction(self) -> float:
+        return self.sequential_ios / max(1, self.sequential_ios + self.random_ios)
+
+    @property
+    def effective_bandwidth(self) -> float:
+        """Bytes moved to and from the swap device per unit of I/O time."""
+        return self.bytes_moved / self.io_time if self.io_time else 0.0
+
+
+class SwapSpace:
+    """Swap device with Linux-style cluster slot allocation.
+
+    Slots are handed out sequentially from the current cluster, then from a
+    cluster that is entirely free, and only then from any free slot, so pages
+    swapped out together sit next to each other on the device. An I/O at the
+    slot right after the previous one is sequential and costs
+    ``transfer_time``; anything else also pays ``seek_time``.
+    """
+
+    def __init__(self, num_slots: int, cluster_size: int = 256, seek_time: float = 100.0, transfer_time: float = 10.0):
+        if num_slots <= 0 or cluster_size <= 0:
+            raise ValueError("Swap space needs a positive number of slots and cluster size.")
+
+        self.num_slots = num_slots
+        self.cluster_size = cluster_size
+        self.seek_time = seek_time
+        self.transfer_time = transfer_time
+        self.reset()
+
+    def reset(self):
+        num_clusters = -(-self.num_slots // self.cluster_size)
+        self.used = bytearray(self.num_slots)
+        self.free_slots = self.num_slots
+        self._cluster_free = [self._cluster_len(c) for c in range(num_clusters)]
+        self._free_clusters: Deque[int] = deque(range(num_clusters))
+        self._cluster: Optional[int] = None
+        self._next = 0
+        self._head: Optional[int] = None
+
+    def _cluster_len(self, cluster: int) -> int:
+        return min(self.cluster_size, self.num_slots - cluster * self.cluster_size)
+
+    def _take(self, slot: int) -> int:
+        self.used[slot] = 1
+        self.free_slots -= 1
+        self._cluster_free[slot // self.cluster_size] -= 1
+        return slot
+
+    def allocate(self) -> int:
+        if self._cluster is not None:
+            end = self._cluster * self.cluster_size + self._cluster_len(self._cluster)
+            while self._next < end:
+                slot = self._next
+                self._next += 1
+                if not self.used[slot]:
+                    return self._take(slot)
+            # free() skips the current cluster, so queue it here if it emptied meanwhile.
+            if self._cluster_free[self._cluster] == self._cluster_len(self._cluster):
+                self._free_clusters.append(self._cluster)
+            self._cluster = None
+
+        while self._free_clusters:
+            cluster = self._free_clusters.popleft()
+            if self._cluster_free[cluster] == self._cluster_len(cluster):
+                self._cluster = cluster
+                self._next = cluster * self.cluster_size + 1
+                return self._take(cluster * self.cluster_size)
+
+        if not self.free_slots:
+            raise RuntimeError("Swap space is full.")
+        return self._take(self.used.index(0))
+
+    def free(self, slot: int):
+        if not self.used[slot]:
+            return
+        self.used[slot] = 0
+        self.free_slots += 1
+        cluster = slot // self.cluster_size
+        self._cluster_free[cluster] += 1
+        if self._cluster_free[cluster] == self._cluster_len(cluster) and cluster != self._cluster:
+            self._free_clusters.append(cluster)
+
+    def io(self, slot: int, stats: SwapStats) -> float:
+        """Account for one page transfer at ``slot`` and return its cost."""
+        if self._head is not None and slot == self._head + 1:
+            stats.sequential_ios += 1
+            cost = self.transfer_time
+        else:
+            stats.random_ios += 1
+            cost = self.seek_time + self.transfer_time
+        self._head = slot
+        stats.io_time += cost
+        return cost
+
+
+class CompressedCache:
+    """zswap-like compressed tier in front of the swap device.
+
+    Every page takes ``page_size / compression_ratio`` bytes out of
+    ``max_bytes``. When the pool is full the least recently stored or loaded
+    entries are written back to the swap device.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        page_size: int,
+        compression_ratio: float = 3.0,
+        compress_time: float = 5.0,
+        decompress_time: float = 2.0,
+    ):
+        if compression_ratio <= 0:
+            raise ValueError("Compression ratio must be positive.")
+
+        self.max_bytes = max_bytes
+        self.entry_size = min(page_size, max(1, ceil(page_size / compression_ratio)))
+        self.capacity = max_bytes // self.entry_size
+        self.compress_time = compress_time
+        self.decompress_time = decompress_time
+        self._entries: OrderedDict[int, None] = OrderedDict()
+
+    def reset(self):
+        self._entries.clear()
+
+    def __contains__(self, page: int) -> bool:
+        return page in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def used_bytes(self) -> int:
+        return len(self._entries) * self.entry_size
+
+    def store(self, page: int) -> List[int]:
+        """Store ``page`` and return the pages pushed out to make room."""
+        self._entries[page] = None
+        self._entries.move_to_end(page)
+        evicted = []
+        while len(self._entries) > self.capacity:
+            evicted.append(self._entries.popitem(last=False)[0])
+        return evicted
+
+    def load(self, page: int) -> bool:
+        if page not in self._entries:
+            return False
+        self._entries.move_to_end(page)
+        return True
+
+
+class BackingStore:
+    """Where evicted pages go, and what it costs to bring them back.
+
+    Only dirty pages are written on eviction: a clean page either still has
+    a valid copy (swap-ins keep theirs, like the Linux swap cache) or was
+    never written and comes back as a zero-filled page. A dirty page is
+    compressed into ``zswap`` when there is one, otherwise it is written to
+    its swap slot, allocating one first if needed. The slot is kept in the
+    page table entry.
+    """
+
+    def __init__(self, page_size: int, swap: SwapSpace, zswap: Optional[CompressedCache] = None):
+        self.page_size = page_size
+        self.swap = swap
+        self.zswap = zswap if zswap is not None and zswap.capacity else None
+        self.page_table: Optional[PageTable] = None
+        self.stats = SwapStats()
+
+    def attach(self, page_table: PageTable):
+        """Start over for a new engine and its page table."""
+        self.page_table = page_table
+        self.swap.reset()
+        if self.zswap is not None:
+            self.zswap.reset()
+        self.stats = SwapStats()
+
+    def _write(self, pte: PageTableEntry):
+        if pte.swap_slot is None:
+            pte.swap_slot = self.swap.allocate()
+        self.swap.io(pte.swap_slot, self.stats)
+        self.stats.pages_written += 1
+        self.stats.bytes_written += self.page_size
+
+    def page_out(self, pte: PageTableEntry, dirty: bool):
+        if not dirty:
+            return
+
+        if self.zswap is None:
+            self._write(pte)
+            return
+
+        # The copy on the device is stale now that the page lives in the pool.
+        if pte.swap_slot is not None:
+            self.swap.free(pte.swap_slot)
+            pte.swap_slot = None
+        self.stats.zswap_stores += 1
+        self.stats.io_time += self.zswap.compress_time
+        for page in self.zswap.store(pte.page):
+            self._write(self.page_table.get_or_create(page))
+            self.stats.zswap_writebacks += 1
+
+    def page_in(self, pte: PageTableEntry):
+        if self.zswap is not None and self.zswap.load(pte.page):
+            self.stats.zswap_loads += 1
+            self.stats.io_time += self.zswap.decompress_time
+        elif pte.swap_slot is not None:
+            self.swap.io(pte.swap_slot, self.stats)
+            self.stats.pages_read += 1
+            self.stats.bytes_read += self.page_size
+        else:
+            self.stats.zero_fills += 1
+
+
+def format_swap_stats(stats: SwapStats) -> str:
+    return "\n".join([
+        f"written     {stats.pages_written:>10,} pages  {format_bytes(stats.bytes_written):>12}",
+        f"read        {stats.pages_read:>10,} pages  {format_bytes(stats.bytes_read):>12}",
+        f"sequential  {stats.sequential_fraction:>10.1%}",
+        f"zswap       {stats.zswap_stores:>10,} stored {stats.zswap_loads:>8,} loaded {stats.zswap_writebacks:>8,} written back",
+        f"zero fills  {stats.zero_fills:>10,}",
+        f"I/O time    {stats.io_time:>10,.0f}",
+    ])
@@ -1,5 +1,10 @@
+from __future__ import annotations
+
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Dict, List, Optional
+
+EMPTY = -1
 
 
 @dataclass
@@ -9,30 +14,234 @@ class TLBEntry:
     last_access: int
 
 
+@dataclass
+class TLBLevelStats:
+    hits: int = 0
+    misses: int = 0
+    conflict_misses: int = 0
+
+    @property
+    def accesses(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / max(1, self.accesses)
+
+
 class TLB:
+    """Set-associative TLB with LRU replacement inside each set.
+
+    Entries live in flat tag/frame/time arrays where set ``s`` owns the slots
+    ``[s * ways, (s + 1) * ways)``. A page -> slot index makes lookups O(1)
+    and victim selection only scans the ways of one set. ``ways=None`` (the
+    default) makes it fully associative.
+    """
+
+    def __init__(self, size: int, ways: Optional[int] = None, name: str = "TLB", hit_latency: int = 1):
+        ways = size if ways is None else ways
+        if ways <= 0 or size % ways:
+            raise ValueError("TLB size must be a positive multiple of the number of ways.")
 
-    def __init__(self, size: int):
         self.size = size
-        self.entries: Dict[int, TLBEntry] = {}
+        self.ways = ways
+        self.num_sets = size // ways
+        self.name = name
+        self.hit_latency = hit_latency
+        self.stats = TLBLevelStats()
+
+        self._tags: List[int] = [EMPTY] * size
+        self._frames: List[int] = [EMPTY] * size
+        self._times: List[int] = [EMPTY] * size
+        self._index: Dict[int, int] = {}
+        # Fully associative LRU shadow of the same capacity; a miss that would
+        # have hit there is a conflict miss.
+        self._shadow: Optional[OrderedDict] = OrderedDict() if self.num_sets > 1 else None
 
-    def lookup(self, page: int, current_step: int) -> Optional[int]:
+    def lookup(self, page: int, current_step: int, fetch: bool = False) -> Optional[int]:
         """Return frame number if TLB hit, else None."""
-        if page in self.entries:
-            self.entries[page].last_access = current_step
-            return self.entries[page].frame
+        shadow = self._shadow
+        in_shadow = False
+        if shadow is not None and page in shadow:
+            shadow.move_to_end(page)
+            in_shadow = True
+
+        slot = self._index.get(page)
+        if slot is not None:
+            self._times[slot] = current_step
+            self.stats.hits += 1
+            return self._frames[slot]
+
+        self.stats.misses += 1
+        if in_shadow:
+            self.stats.conflict_misses += 1
         return None
 
-    def insert(self, page: int, frame: int, current_step: int):
-        """Insert or update a TLB entry using LRU replacement."""
-        if page in self.entries:
-            self.entries[page].frame = frame
-            self.entries[page].last_access = current_step
-            return
+    def insert(self, page: int, frame: int, current_step: int, fetch: bool = False):
+        """Insert or update a TLB entry using LRU replacement within its set."""
+        if self._shadow is not None:
+            self._shadow[page] = None
+            self._shadow.move_to_end(page)
+            if len(self._shadow) > self.size:
+                self._shadow.popitem(last=False)
+
+        slot = self._index.get(page)
+        if slot is None:
+            base = (page % self.num_sets) * self.ways
+            end = base + self.ways
+            try:
+                slot = self._tags.index(EMPTY, base, end)
+            except ValueError:
+                times = self._times
+                slot = times.index(min(times[base:end]), base, end)
+                del self._index[self._tags[slot]]
+            self._tags[slot] = page
+            self._index[page] = slot
+
+        self._frames[slot] = frame
+        self._times[slot] = current_step
+
+    def invalidate(self, page: int) -> bool:
+        """Drop the entry for ``page``; return whether one was present."""
+        if self._shadow is not None:
+            self._shadow.pop(page, None)
+
+        slot = self._index.pop(page, None)
+        if slot is None:
+            return False
+        self._tags[slot] = EMPTY
+        self._frames[slot] = EMPTY
+        self._times[slot] = EMPTY
+        return True
+
+    def invalidate_range(self, start: int, end: int) -> int:
+        """Drop the entries for pages in ``[start, end)``; return how many were present."""
+        return sum(self.invalidate(page) for page in self._pages_in(start, end))
+
+    def _pages_in(self, start: int, end: int):
+        """Pages in ``[start, end)`` that may have an entry, shadow included."""
+        if end - start <= len(self._index):
+            return range(start, end)
+        pages = [p for p in self._index if start <= p < end]
+        if self._shadow is not None:
+            pages += [p for p in self._shadow if start <= p < end and p not in self._index]
+        return pages
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, page: int) -> bool:
+        return page in self._index
+
+    @property
+    def entries(self) -> Dict[int, TLBEntry]:
+        """Snapshot of the valid entries keyed by page."""
+        return {
+            page: TLBEntry(page, self._frames[slot], self._times[slot])
+            for page, slot in self._index.items()
+        }
+
+    def level_stats(self) -> Dict[str, TLBLevelStats]:
+        return {self.name: self.stats}
+
+
+class TLBHierarchy:
+    """Two-level TLB: split L1 instruction/data TLBs backed by a shared L2.
+
+    ``cycles`` accumulates the latency of every translation: the latency of
+    each level probed, plus ``walk_latency`` when all levels miss.
+    """
+
+    def __init__(self, l1d: TLB, l2: TLB, l1i: Optional[TLB] = None, walk_latency: int = 30):
+        self.l1d = l1d
+        self.l1i = l1i
+        self.l2 = l2
+        self.walk_latency = walk_latency
+        self.cycles = 0
+
+    @classmethod
+    def from_sizes(
+        cls,
+        l1_entries: int = 64,
+        l1_ways: int = 4,
+        l2_entries: int = 1536,
+        l2_ways: int = 12,
+        l1i_entries: Optional[int] = None,
+        l1i_ways: Optional[int] = None,
+        l1_latency: int = 1,
+        l2_latency: int = 7,
+        walk_latency: int = 30,
+    ) -> TLBHierarchy:
+        l1i = None
+        if l1i_entries:
+            l1i = TLB(l1i_entries, l1i_ways or l1_ways, name="L1i", hit_latency=l1_latency)
+        return cls(
+            l1d=TLB(l1_entries, l1_ways, name="L1d", hit_latency=l1_latency),
+            l2=TLB(l2_entries, l2_ways, name="L2", hit_latency=l2_latency),
+            l1i=l1i,
+            walk_latency=walk_latency,
+        )
+
+    @property
+    def levels(self) -> List[TLB]:
+        return [t for t in (self.l1i, self.l1d, self.l2) if t is not None]
+
+    @property
+    def size(self) -> int:
+        return self.l2.size
+
+    def _l1(self, fetch: bool) -> TLB:
+        return self.l1i if fetch and self.l1i is not None else self.l1d
+
+    def lookup(self, page: int, current_step: int, fetch: bool = False) -> Optional[int]:
+        l1 = self._l1(fetch)
+        self.cycles += l1.hit_latency
+        frame = l1.lookup(page, current_step)
+        if frame is not None:
+            return frame
+
+        self.cycles += self.l2.hit_latency
+        frame = self.l2.lookup(page, current_step)
+        if frame is not None:
+            l1.insert(page, frame, current_step)
+            return frame
+
+        self.cycles += self.walk_latency
+        return None
+
+    def insert(self, page: int, frame: int, current_step: int, fetch: bool = False):
+        self._l1(fetch).insert(page, frame, current_step)
+        self.l2.insert(page, frame, current_step)
+
+    def invalidate(self, page: int) -> bool:
+        removed = False
+        for level in self.levels:
+            removed = level.invalidate(page) or removed
+        return removed
+
+    def invalidate_range(self, start: int, end: int) -> int:
+        """Drop the entries for pages in ``[start, end)`` from every level; return how many pages went."""
+        pages = set()
+        for level in self.levels:
+            pages.update(level._pages_in(start, end))
+        return sum(self.invalidate(page) for page in pages)
+
+    def __len__(self) -> int:
+        return len(self.l2)
+
+    def __contains__(self, page: int) -> bool:
+        return any(page in level for level in self.levels)
 
-        if len(self.entries) < self.size:
-            self.entries[page] = TLBEntry(page, frame, current_step)
-            return
+    @property
+    def entries(self) -> Dict[int, TLBEntry]:
+        merged = self.l2.entries
+        for level in (self.l1i, self.l1d):
+            if level is not None:
+                merged.update(level.entries)
+        return merged
 
-        lru_page = min(self.entries.values(), key=lambda e: e.last_access).page
-        del self.entries[lru_page]
-        self.entries[page] = TLBEntry(page, frame, current_step)
+    def level_stats(self) -> Dict[str, TLBLevelStats]:
+        stats = {}
+        for level in self.levels:
+            stats.update(level.level_stats())
+        return stats
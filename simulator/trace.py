@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+TRACE_MAGIC = b"VMTRACE1"
+TRACE_HEADER_SIZE = len(TRACE_MAGIC) + 8
+# The "write" byte is an operation code; files written before fetches were
+# supported only contain reads and writes.
+RECORD_DTYPE = np.dtype([("address", "<u8"), ("write", "u1")])
+OP_READ, OP_WRITE, OP_FETCH = 0, 1, 2
+
+
+class Trace:
+    """Compact reference string stored as parallel NumPy arrays.
+
+    Indexing returns ``(address, "R" | "W" | "X")`` tuples, so a Trace can be
+    passed anywhere a list of reference tuples is accepted. ``fetches`` marks
+    instruction fetches and is None for traces without any.
+    """
+
+    def __init__(self, addresses: np.ndarray, writes: np.ndarray, fetches: Optional[np.ndarray] = None):
+        if len(addresses) != len(writes) or (fetches is not None and len(fetches) != len(writes)):
+            raise ValueError("addresses, writes and fetches must have the same length.")
+        self.addresses = np.asarray(addresses, dtype=np.uint64)
+        self.writes = np.asarray(writes, dtype=np.bool_)
+        self.fetches = None if fetches is None else np.asarray(fetches, dtype=np.bool_)
+
+    @classmethod
+    def empty(cls, length: int) -> Trace:
+        return cls(np.zeros(length, dtype=np.uint64), np.zeros(length, dtype=np.bool_))
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[int, str]]) -> Trace:
+        pairs = list(pairs)
+        addresses = np.fromiter((addr for addr, _ in pairs), dtype=np.uint64, count=len(pairs))
+        codes = np.fromiter(
+            (OP_WRITE if op == "W" else OP_FETCH if op == "X" else OP_READ for _, op in pairs),
+            dtype=np.uint8, count=len(pairs),
+        )
+        return cls.from_codes(addresses, codes)
+
+    @classmethod
+    def from_codes(cls, addresses: np.ndarray, codes: np.ndarray) -> Trace:
+        fetches = codes == OP_FETCH
+        return cls(addresses, codes == OP_WRITE, fetches if fetches.any() else None)
+
+    @property
+    def codes(self) -> np.ndarray:
+        codes = self.writes.astype(np.uint8)
+        if self.fetches is not None:
+            codes[self.fetches] = OP_FETCH
+        return codes
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            fetches = None if self.fetches is None else self.fetches[index]
+            return Trace(self.addresses[index], self.writes[index], fetches)
+        if self.writes[index]:
+            return int(self.addresses[index]), "W"
+        if self.fetches is not None and self.fetches[index]:
+            return int(self.addresses[index]), "X"
+        return int(self.addresses[index]), "R"
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        if self.fetches is None:
+            for addr, write in zip(self.addresses.tolist(), self.writes.tolist()):
+                yield addr, "W" if write else "R"
+            return
+        for addr, code in zip(self.addresses.tolist(), self.codes.tolist()):
+            yield addr, "RWX"[code]
+
+    def pages(self, offset_bits: int) -> np.ndarray:
+        return self.addresses >> np.uint64(offset_bits)
+
+    def to_list(self) -> List[Tuple[int, str]]:
+        return list(self)
+
+    def save(self, path: str):
+        with TraceWriter(path) as writer:
+            writer.write(self.addresses, self.codes)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> Trace:
+        with open(path, "rb") as fh:
+            header = fh.read(TRACE_HEADER_SIZE)
+        if header[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+            raise ValueError(f"'{path}' is not a binary trace file.")
+        count = int.from_bytes(header[len(TRACE_MAGIC):], "little")
+
+        if mmap:
+            records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=TRACE_HEADER_SIZE, shape=(count,))
+        else:
+            records = np.fromfile(path, dtype=RECORD_DTYPE, count=count, offset=TRACE_HEADER_SIZE)
+        return cls.from_codes(records["address"], records["write"])
+
+
+class TraceWriter:
+    """Streams trace chunks to a binary trace file without holding them in memory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._fh = open(path, "wb")
+        self._fh.write(TRACE_MAGIC + (0).to_bytes(8, "little"))
+
+    def write(self, addresses: np.ndarray, codes: np.ndarray):
+        """Append records; ``codes`` holds operation codes or write flags."""
+        records = np.empty(len(addresses), dtype=RECORD_DTYPE)
+        records["address"] = addresses
+        records["write"] = codes
+        records.tofile(self._fh)
+        self.count += len(records)
+
+    def close(self):
+        if self._fh.closed:
+            return
+        self._fh.seek(len(TRACE_MAGIC))
+        self._fh.write(self.count.to_bytes(8, "little"))
+        self._fh.close()
+
+    def __enter__(self) -> TraceWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def is_trace_file(path: str) -> bool:
+    with open(path, "rb") as fh:
+        return fh.read(len(TRACE_MAGIC)) == TRACE_MAGIC
+
+
+def as_trace(reference_string) -> Trace:
+    if isinstance(reference_string, Trace):
+        return reference_string
+    return Trace.from_pairs(reference_string)
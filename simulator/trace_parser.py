@@ -0,0 +1,234 @@
+"""Text trace parsing shared by the GUI and the command-line runner.
+
+A text trace is a list of accesses separated by commas, semicolons or
+newlines; ``#`` starts a comment. Each access is an address, decimal or
+0x-prefixed hex, optionally followed by its operation: ``12``, ``12 W``,
+``12:W``, ``12W`` or ``0x1f X``. The operation defaults to a read.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from simulator.trace import OP_FETCH, OP_READ, OP_WRITE, Trace, is_trace_file
+
+# One access per match. Anything that is not an access or a separator lands in
+# the third group so errors are found without a second pass over the text.
+_ACCESS = re.compile(
+    r"[\s,;]*(?:(0[xX][0-9a-fA-F]+|[0-9]+)[ \t]*:?[ \t]*([RWXrwx]?)(?=[\s,;]|$)|([^\s,;]+))"
+)
+_COMMENT = re.compile(r"#[^\n]*")
+_OP_CODES = np.zeros(256, dtype=np.uint8)
+for _op, _code in (("R", OP_READ), ("W", OP_WRITE), ("X", OP_FETCH)):
+    _OP_CODES[ord(_op)] = _OP_CODES[ord(_op.lower())] = _code
+
+Progress = Callable[[int, int], None]
+
+
+class TraceParser:
+    """Incremental text trace parser producing a compact ``Trace``.
+
+    Text can be fed in arbitrary chunks; an access split across two chunks is
+    held back until the next chunk (or ``finish``) completes it.
+    """
+
+    def __init__(self):
+        self._addresses: List[np.ndarray] = []
+        self._codes: List[np.ndarray] = []
+        self._pending = ""
+        self._line = 1
+        self.count = 0
+
+    def feed(self, text: str):
+        text = self._pending + text
+        # Cut after the last complete access, never inside a comment.
+        line_start = text.rfind("\n") + 1
+        cut = line_start - 1
+        if "#" not in text[line_start:]:
+            cut = max(cut, text.rfind(",", line_start), text.rfind(";", line_start))
+        self._pending = text[cut + 1:]
+        if cut >= 0:
+            self._parse(text[:cut + 1])
+
+    def finish(self) -> Trace:
+        if self._pending:
+            self._parse(self._pending)
+            self._pending = ""
+        if not self._addresses:
+            return Trace.empty(0)
+        return Trace.from_codes(np.concatenate(self._addresses), np.concatenate(self._codes))
+
+    def _parse(self, text: str):
+        if "#" in text:
+            text = _COMMENT.sub("", text)
+        parsed = _parse_decimal(text)
+        if parsed is not None:
+            self._addresses.append(parsed[0])
+            self._codes.append(parsed[1])
+            self.count += len(parsed[0])
+            self._line += text.count("\n")
+            return
+
+        matches = _ACCESS.findall(text)
+        addresses = [addr for addr, _, _ in matches]
+        if not all(addresses):
+            self._error(text)
+
+        if "x" in text or "X" in text:
+            values = map(_hex_or_decimal, addresses)
+        else:
+            values = map(int, addresses)
+        try:
+            self._addresses.append(np.fromiter(values, dtype=np.uint64, count=len(addresses)))
+        except OverflowError:
+            raise ValueError(f"line {self._line}: address does not fit in 64 bits") from None
+        ops = "".join([op or "R" for _, op, _ in matches]).encode("ascii")
+        self._codes.append(_OP_CODES[np.frombuffer(ops, dtype=np.uint8)])
+
+        self.count += len(addresses)
+        self._line += text.count("\n")
+
+    def _error(self, text: str):
+        for match in _ACCESS.finditer(text):
+            if match.group(3):
+                line = self._line + text.count("\n", 0, match.start(3))
+                raise ValueError(f"line {line}: invalid access '{match.group(3)}'; use 'address [R|W|X]'")
+
+
+def _parse_decimal(text: str):
+    """Vectorised parse of the common case: decimal addresses with optional ``addr op`` operations.
+
+    Returns None for anything else (hex, ``addr:op``, errors) so the regex
+    path can handle it.
+    """
+    try:
+        b = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        return None
+    digit = (b - ord("0")) < 10
+    lower = b | 0x20
+    op = (lower == ord("r")) | (lower == ord("w")) | (lower == ord("x"))
+    blank = (b == ord(" ")) | (b == ord("\t")) | (b == ord("\r"))
+    sep = blank | (b == ord("\n")) | (b == ord(",")) | (b == ord(";"))
+    if not (digit | op | sep).all():
+        return None
+
+    starts = np.flatnonzero(digit[1:] & ~digit[:-1]) + 1
+    if len(digit) and digit[0]:
+        starts = np.concatenate(([0], starts))
+    if not len(starts):
+        return None if op.any() else (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint8))
+    ends = np.flatnonzero(digit[:-1] & ~digit[1:]) + 1
+    if digit[-1]:
+        ends = np.append(ends, len(digit))
+    lengths = ends - starts
+    if lengths.max() > 19:
+        return None
+    # Horner's rule, one digit column at a time.
+    addresses = np.zeros(len(starts), dtype=np.uint64)
+    for k in range(lengths.max()):
+        more = lengths > k
+        if more.all():
+            addresses = addresses * 10 + (b[starts + k] - ord("0"))
+        else:
+            addresses[more] = addresses[more] * 10 + (b[starts[more] + k] - ord("0"))
+
+    codes = np.zeros(len(addresses), dtype=np.uint8)
+    ops = np.flatnonzero(op)
+    if len(ops):
+        # An operation must follow its address, with only blanks in between,
+        # and be followed by a separator.
+        after = ops + 1
+        if not sep[after[after < len(b)]].all():
+            return None
+        before = ops - 1
+        while True:
+            if (before < 0).any():
+                return None
+            skip = blank[before]
+            if not skip.any():
+                break
+            before[skip] -= 1
+        if not digit[before].all():
+            return None
+        codes[np.searchsorted(ends, before, side="right")] = _OP_CODES[b[ops]]
+    return addresses, codes
+
+
+def _hex_or_decimal(token: str) -> int:
+    return int(token, 16) if token[1:2] in ("x", "X") else int(token)
+
+
+def parse_trace_text(text: str) -> Trace:
+    parser = TraceParser()
+    parser.feed(text)
+    return parser.finish()
+
+
+def parse_trace_file(path: str, chunk_size: int = 1 << 20, progress: Optional[Progress] = None) -> Trace:
+    """Load a binary trace, or parse a text one ``chunk_size`` characters at a time.
+
+    ``progress(done, total)`` is called after each chunk with the bytes read so far.
+    """
+    if is_trace_file(path):
+        return Trace.load(path, mmap=True)
+
+    total = os.path.getsize(path)
+    parser = TraceParser()
+    with open(path) as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            if progress is not None:
+                progress(fh.buffer.tell(), total)
+    return parser.finish()
+
+
+class TraceParseJob:
+    """Parses a trace file or a long text on a background thread.
+
+    Poll ``done``; afterwards either ``trace`` or ``error`` is set.
+    ``progress`` goes from 0 to 1 as the input is consumed.
+    """
+
+    def __init__(self, path: Optional[str] = None, text: Optional[str] = None, chunk_size: int = 1 << 20):
+        if (path is None) == (text is None):
+            raise ValueError("Give exactly one of path or text.")
+        self.path = path
+        self.text = text
+        self.chunk_size = chunk_size
+        self.progress = 0.0
+        self.trace: Optional[Trace] = None
+        self.error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def _set_progress(self, done: int, total: int):
+        self.progress = min(done, total) / total if total else 1.0
+
+    def _run(self):
+        try:
+            if self.path is not None:
+                self.trace = parse_trace_file(self.path, self.chunk_size, self._set_progress)
+            else:
+                parser = TraceParser()
+                for start in range(0, len(self.text), self.chunk_size):
+                    parser.feed(self.text[start:start + self.chunk_size])
+                    self._set_progress(start + self.chunk_size, len(self.text))
+                self.trace = parser.finish()
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+        self.progress = 1.0
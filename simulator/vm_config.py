@@ -1,10 +1,55 @@
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Tuple
+
+@dataclass(frozen=True)
+class PageRegion:
+    start: int
+    size: int
+    offset_bits: int
+
+    @property
+    def page_size(self) -> int:
+        return 1 << self.offset_bits
+
+    @property
+    def end(self) -> int:
+        return self.start + self.size
+
+@dataclass(frozen=True)
+class NumaNode:
+    """A NUMA node owning ``num_frames`` consecutive frames.
+
+    Costs are relative, as in the ACPI SLIT table: ``local_cost`` for an
+    access from a CPU on this node, ``remote_cost`` from any other node.
+    """
+    num_frames: int
+    local_cost: int = 10
+    remote_cost: int = 20
 
 @dataclass
 class VMConfig:
     virtual_memory_size: int
     physical_memory_size: int
     offset_bits: int
+    page_regions: Tuple[PageRegion, ...] = field(default_factory=tuple)
+    numa_nodes: Tuple[NumaNode, ...] = field(default_factory=tuple)
+
+    def __post_init__(self):
+        self.page_regions = tuple(sorted(self.page_regions, key=lambda r: r.start))
+        for prev, region in zip(self.page_regions, self.page_regions[1:]):
+            if region.start < prev.end:
+                raise ValueError("Page regions must not overlap.")
+        for region in self.page_regions:
+            if region.offset_bits < self.offset_bits:
+                raise ValueError("Region pages cannot be smaller than the base page size.")
+            if region.start % region.page_size or region.size % region.page_size:
+                raise ValueError("Page regions must be aligned to their page size.")
+        self._region_starts = [r.start for r in self.page_regions]
+
+        self.numa_nodes = tuple(self.numa_nodes)
+        if self.numa_nodes and sum(n.num_frames for n in self.numa_nodes) != self.num_frames:
+            raise ValueError("NUMA nodes must cover all physical frames.")
 
     @property
     def page_size(self) -> int:
@@ -17,3 +62,20 @@ class VMConfig:
     @property
     def num_virtual_pages(self) -> int:
         return self.virtual_memory_size // self.page_size
+
+    @property
+    def num_nodes(self) -> int:
+        return max(1, len(self.numa_nodes))
+
+    def access_cost(self, cpu_node: int, memory_node: int) -> int:
+        if not self.numa_nodes:
+            return 1
+        node = self.numa_nodes[memory_node]
+        return node.local_cost if cpu_node == memory_node else node.remote_cost
+
+    def page_shift_for(self, address: int) -> int:
+        """Offset bits of the page backing ``address`` (base pages outside any region)."""
+        i = bisect_right(self._region_starts, address) - 1
+        if i >= 0 and address < self.page_regions[i].end:
+            return self.page_regions[i].offset_bits
+        return self.offset_bits
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from simulator.simulation_step_result import SimulationStepResult
+
+
+@dataclass
+class WorkerBatch:
+    results: List[SimulationStepResult]
+    # True on the last batch of a job.
+    done: bool
+
+
+class SimulationWorker:
+    """Runs a controller on a background thread for batch jobs.
+
+    A job (``fast_forward``, ``run_to_step`` or ``run_to_fault``) steps the
+    controller in batches of ``batch_size`` accesses and publishes each batch
+    on ``updates``. The queue holds at most ``queue_size`` batches, so a
+    consumer that falls behind stalls the worker instead of letting results
+    pile up. Each batch is simulated while holding ``lock``; anything that
+    reads the engine state during a job must hold it as well.
+    """
+
+    def __init__(self, controller, batch_size: int = 512, queue_size: int = 8):
+        if controller.is_fast:
+            raise ValueError("The worker needs per-step results; use the reference engine.")
+        if batch_size <= 0 or queue_size <= 0:
+            raise ValueError("Batch and queue sizes must be positive.")
+
+        self.controller = controller
+        self.batch_size = batch_size
+        self.updates: queue.Queue[WorkerBatch] = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def fast_forward(self, steps: int):
+        self._start(steps, until_fault=False)
+
+    def run_to_step(self, step: int):
+        """Run until ``step`` accesses have been simulated in total."""
+        self._start(max(0, step - self.controller.engine.current_step), until_fault=False)
+
+    def run_to_fault(self):
+        """Run up to and including the next page fault."""
+        self._start(None, until_fault=True)
+
+    def _start(self, limit: Optional[int], until_fault: bool):
+        if self.busy:
+            raise RuntimeError("The worker is already running a job.")
+        self._cancel.clear()
+        self._thread = threading.Thread(target=self._run, args=(limit, until_fault), daemon=True)
+        self._thread.start()
+
+    def _run(self, limit: Optional[int], until_fault: bool):
+        controller = self.controller
+        done = 0
+        finished = False
+        while not finished:
+            batch = []
+            with self.lock:
+                while len(batch) < self.batch_size:
+                    if self._cancel.is_set() or controller.is_finished() or (limit is not None and done >= limit):
+                        finished = True
+                        break
+                    result = controller.step()
+                    batch.append(result)
+                    done += 1
+                    if until_fault and result.fault:
+                        finished = True
+                        break
+            self._publish(WorkerBatch(batch, finished))
+
+    def _publish(self, batch: WorkerBatch):
+        while True:
+            try:
+                self.updates.put(batch, timeout=0.05)
+                return
+            except queue.Full:
+                if self._cancel.is_set():
+                    return
+
+    def drain(self) -> Tuple[List[SimulationStepResult], bool]:
+        """Collect the published results without blocking; also report whether a job ended."""
+        results: List[SimulationStepResult] = []
+        job_done = False
+        while True:
+            try:
+                batch = self.updates.get_nowait()
+            except queue.Empty:
+                return results, job_done
+            results += batch.results
+            job_done = job_done or batch.done
+
+    def cancel(self) -> List[SimulationStepResult]:
+        """Stop the current job and return the results it produced but nobody drained."""
+        self._cancel.set()
+        results: List[SimulationStepResult] = []
+        while self.busy:
+            results += self.drain()[0]
+            self._thread.join(timeout=0.01)
+        results += self.drain()[0]
+        self._thread = None
+        return results
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from simulator.trace import Trace, TraceWriter
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class Workload(ABC):
+    """Vectorized generator of page references.
+
+    Subclasses produce page numbers in chunks and keep whatever position they
+    need between chunks, so a stream can be generated piecewise.
+    """
+
+    def __init__(self, write_ratio: float = 0.25):
+        if not 0.0 <= write_ratio <= 1.0:
+            raise ValueError("write_ratio must be between 0 and 1.")
+        self.write_ratio = write_ratio
+
+    @abstractmethod
+    def generate_pages(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def generate(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        pages = self.generate_pages(rng, count)
+        writes = rng.random(count) < self.write_ratio
+        return pages, writes
+
+    def reset(self):
+        pass
+
+
+class ZipfWorkload(Workload):
+    def __init__(self, num_pages: int, alpha: float = 1.0, base_page: int = 0, write_ratio: float = 0.25):
+        super().__init__(write_ratio)
+        self.num_pages = num_pages
+        self.alpha = alpha
+        self.base_page = base_page
+        weights = 1.0 / np.arange(1, num_pages + 1, dtype=np.float64) ** alpha
+        self._cdf = np.cumsum(weights)
+        self._cdf /= self._cdf[-1]
+
+    def generate_pages(self, rng, count):
+        ranks = np.searchsorted(self._cdf, rng.random(count), side="right")
+        np.minimum(ranks, self.num_pages - 1, out=ranks)
+        return ranks + self.base_page
+
+
+class SequentialWorkload(Workload):
+    def __init__(self, num_pages: int, base_page: int = 0, accesses_per_page: int = 1, write_ratio: float = 0.25):
+        super().__init__(write_ratio)
+        self.num_pages = num_pages
+        self.base_page = base_page
+        self.accesses_per_page = accesses_per_page
+        self._position = 0
+
+    def generate_pages(self, rng, count):
+        index = np.arange(self._position, self._position + count, dtype=np.int64)
+        self._position += count
+        return (index // self.accesses_per_page) % self.num_pages + self.base_page
+
+    def reset(self):
+        self._position = 0
+
+
+class StridedWorkload(Workload):
+    def __init__(self, num_pages: int, stride: int, base_page: int = 0, write_ratio: float = 0.25):
+        super().__init__(write_ratio)
+        self.num_pages = num_pages
+        self.stride = stride
+        self.base_page = base_page
+        self._position = 0
+
+    def generate_pages(self, rng, count):
+        index = np.arange(self._position, self._position + count, dtype=np.int64)
+        self._position += count
+        return (index * self.stride) % self.num_pages + self.base_page
+
+    def reset(self):
+        self._position = 0
+
+
+class LoopWorkload(Workload):
+    def __init__(self, body: Sequence[int], write_ratio: float = 0.25):
+        super().__init__(write_ratio)
+        if not len(body):
+            raise ValueError("Loop body must contain at least one page.")
+        self.body = np.asarray(body, dtype=np.int64)
+        self._position = 0
+
+    def generate_pages(self, rng, count):
+        index = np.arange(self._position, self._position + count, dtype=np.int64) % len(self.body)
+        self._position += count
+        return self.body[index]
+
+    def reset(self):
+        self._position = 0
+
+
+class WorkingSetWorkload(Workload):
+    """Accesses concentrated on a window of pages that drifts every phase."""
+
+    def __init__(
+        self,
+        num_pages: int,
+        working_set_size: int,
+        phase_length: int,
+        drift: int,
+        locality: float = 0.9,
+        base_page: int = 0,
+        write_ratio: float = 0.25,
+    ):
+        super().__init__(write_ratio)
+        self.num_pages = num_pages
+        self.working_set_size = working_set_size
+        self.phase_length = phase_length
+        self.drift = drift
+        self.locality = locality
+        self.base_page = base_page
+        self._position = 0
+
+    def generate_pages(self, rng, count):
+        index = np.arange(self._position, self._position + count, dtype=np.int64)
+        self._position += count
+
+        window_start = (index // self.phase_length) * self.drift
+        pages = (window_start + rng.integers(0, self.working_set_size, count)) % self.num_pages
+
+        outside = rng.random(count) >= self.locality
+        pages[outside] = rng.integers(0, self.num_pages, int(outside.sum()))
+        return pages + self.base_page
+
+    def reset(self):
+        self._position = 0
+
+
+class MixtureWorkload(Workload):
+    """Interleaves component workloads in bursts chosen by weight."""
+
+    def __init__(self, components: Sequence[Tuple[Workload, float]], burst: int = 1):
+        super().__init__()
+        if not components:
+            raise ValueError("Mixture needs at least one component.")
+        self.components = [w for w, _ in components]
+        weights = np.asarray([weight for _, weight in components], dtype=np.float64)
+        self.weights = weights / weights.sum()
+        self.burst = burst
+
+    def generate(self, rng, count):
+        bursts = -(-count // self.burst)
+        choice = np.repeat(rng.choice(len(self.components), size=bursts, p=self.weights), self.burst)[:count]
+
+        pages = np.empty(count, dtype=np.int64)
+        writes = np.empty(count, dtype=np.bool_)
+        for i, component in enumerate(self.components):
+            mask = choice == i
+            n = int(mask.sum())
+            if n:
+                pages[mask], writes[mask] = component.generate(rng, n)
+        return pages, writes
+
+    def generate_pages(self, rng, count):
+        return self.generate(rng, count)[0]
+
+    def reset(self):
+        for component in self.components:
+            component.reset()
+
+
+def iter_chunks(
+    workload: Workload,
+    count: int,
+    page_size: int,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(addresses, writes)`` chunks; the same seed and chunk size reproduce the stream."""
+    rng = np.random.default_rng(seed)
+    workload.reset()
+    remaining = count
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        pages, writes = workload.generate(rng, n)
+        offsets = rng.integers(0, page_size, n, dtype=np.uint64)
+        addresses = pages.astype(np.uint64) * np.uint64(page_size) + offsets
+        yield addresses, writes
+        remaining -= n
+
+
+def fill_trace(
+    trace: Trace,
+    workload: Workload,
+    page_size: int,
+    seed: Optional[int] = None,
+    start: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Trace:
+    position = start
+    for addresses, writes in iter_chunks(workload, len(trace) - start, page_size, seed, chunk_size):
+        end = position + len(addresses)
+        trace.addresses[position:end] = addresses
+        trace.writes[position:end] = writes
+        position = end
+    return trace
+
+
+def generate_trace(
+    workload: Workload,
+    count: int,
+    page_size: int,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Trace:
+    return fill_trace(Trace.empty(count), workload, page_size, seed, chunk_size=chunk_size)
+
+
+def write_trace_file(
+    path: str,
+    workload: Workload,
+    count: int,
+    page_size: int,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    with TraceWriter(path) as writer:
+        for addresses, writes in iter_chunks(workload, count, page_size, seed, chunk_size):
+            writer.write(addresses, writes)
+    return writer.count
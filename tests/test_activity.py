@@ -0,0 +1,48 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+from simulator.activity import FrameActivity, RateTimeline
+
+class TestActivity(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=1024, physical_memory_size=48, offset_bits=4)
+        ref = [(0, "R"), (16, "W"), (0, "R"), (32, "R"), (48, "R"), (0, "R")]
+        self.results = SimulationController(self.config, ref, FIFOAlgorithm(), tlb_entries=2).run_all()
+
+    def test_frame_activity_follows_loads_and_writes(self):
+        activity = FrameActivity(self.config.num_frames)
+        for result in self.results:
+            activity.record(result)
+
+        # Page 48 replaced page 0 in frame 0, then page 0 replaced page 16 in frame 1.
+        self.assertEqual(activity.resident.tolist(), [True, True, True])
+        self.assertEqual(activity.dirty.tolist(), [False, False, False])
+        self.assertEqual(activity.accesses.tolist(), [1, 1, 1])
+        self.assertEqual(activity.last_access.tolist(), [4, 5, 3])
+
+        rgb = activity.colors()
+        self.assertGreater(rgb[1, 2], rgb[2, 2])
+
+    def test_heatmap_aggregates_when_frames_exceed_cells(self):
+        activity = FrameActivity(100)
+        activity.resident[37] = activity.dirty[37] = True
+        grid, per_cell = activity.heatmap(5, 4)
+
+        self.assertEqual(per_cell, 5)
+        self.assertLessEqual(grid.shape[0], 5)
+        self.assertLessEqual(grid.shape[1], 4)
+        self.assertEqual((grid[:, :, 0] == 230).sum(), 1)
+
+    def test_rate_timeline_keeps_fixed_window_count(self):
+        timeline = RateTimeline(window=2, capacity=2)
+        for result in self.results + self.results[:1]:
+            timeline.record(result)
+
+        faults, tlb_hits = timeline.points()
+        self.assertEqual(faults, [0.5, 1.0, 1.0])
+        self.assertEqual(len(timeline.fault_rates), 2)
+        self.assertEqual(len(tlb_hits), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.async_engine import AsyncSimulation, compare_queue_depths, format_async_reports
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+from simulator.replacement_policies.lru import LRUAlgorithm
+from simulator.replacement_policies.optimal import OptimalAlgorithm
+
+class TestAsyncSimulation(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=1024, physical_memory_size=128, offset_bits=4)
+        self.trace = [(0, "R"), (16, "R"), (0, "W"), (32, "R"), (16, "R")]
+
+    def test_single_process_is_serial(self):
+        report = AsyncSimulation(
+            self.config, [self.trace], FIFOAlgorithm(), tlb_entries=4, io_latency=100, hit_latency=1
+        ).run()
+        self.assertEqual(report.page_faults, 3)
+        self.assertEqual(report.accesses, 5)
+        self.assertEqual(report.makespan, 3 * 100 + 5)
+        self.assertEqual(report.processes[0].blocked_time, 300)
+
+    def test_queue_depth_overlaps_faults(self):
+        traces = [self.trace] * 4
+        config = VMConfig(virtual_memory_size=1024, physical_memory_size=256, offset_bits=4)
+        reports = compare_queue_depths(
+            config, traces, LRUAlgorithm, tlb_entries=4, depths=(1, 4), io_latency=100
+        )
+        serial, parallel = reports
+        self.assertEqual(serial.page_faults, parallel.page_faults)
+        self.assertGreater(serial.max_queue_length, 0)
+        self.assertEqual(parallel.max_queue_length, 0)
+        self.assertLess(parallel.makespan, serial.makespan)
+        self.assertGreater(parallel.throughput, serial.throughput)
+        self.assertIn("depth", format_async_reports(reports))
+
+    def test_shared_pages_coalesce(self):
+        sim = AsyncSimulation(
+            self.config, [self.trace] * 3, FIFOAlgorithm(), tlb_entries=4,
+            queue_depth=2, io_latency=100, shared_address_space=True
+        )
+        report = sim.run()
+        self.assertEqual(report.io_requests, 3)
+        self.assertGreater(report.coalesced_faults, 0)
+        self.assertEqual(report.accesses, 15)
+        self.assertEqual(sim.stats.page_faults, 3)
+
+    def test_rejects_optimal(self):
+        with self.assertRaises(ValueError):
+            AsyncSimulation(self.config, [self.trace], OptimalAlgorithm(), tlb_entries=4)
+
+    def test_rejects_any_policy_needing_the_future(self):
+        class Clairvoyant(FIFOAlgorithm):
+            needs_future_knowledge = True
+
+        with self.assertRaises(ValueError):
+            AsyncSimulation(self.config, [self.trace], Clairvoyant(), tlb_entries=4)
+
+if __name__ == "__main__":
+    unittest.main()
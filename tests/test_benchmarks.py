@@ -0,0 +1,65 @@
+import unittest
+from dataclasses import asdict
+from benchmarks.harness import BenchmarkResult, compare, longer_prefixes, measure, run_case
+
+def make_result(rate, peak=1000, measured=1000):
+    return BenchmarkResult(
+        case="engine.step[fifo]",
+        accesses=1000,
+        capacity=4,
+        measured_accesses=measured,
+        seconds=measured / rate,
+        accesses_per_sec=rate,
+        peak_bytes=peak,
+    )
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_measure_runs_full_trace_within_budget(self):
+        sizes = []
+
+        def prepare(n):
+            sizes.append(n)
+            return lambda: None
+
+        n, _ = measure(prepare, 5000, budget=10.0)
+        self.assertEqual(n, 5000)
+        self.assertEqual(sizes, [1000, 5000])
+
+    def test_compare_flags_slowdown_and_memory_growth(self):
+        baseline = {make_result(100_000).key: asdict(make_result(100_000))}
+
+        self.assertEqual(compare([make_result(95_000)], baseline), [])
+
+        slow = compare([make_result(50_000)], baseline)
+        self.assertEqual([r.metric for r in slow], ["accesses_per_sec"])
+        self.assertAlmostEqual(slow[0].change, -0.5)
+
+        heavy = compare([make_result(100_000, peak=2000)], baseline)
+        self.assertEqual([r.metric for r in heavy], ["peak_bytes"])
+
+    def test_compare_ignores_unknown_cases(self):
+        self.assertEqual(compare([make_result(1)], {}), [])
+
+    def test_compare_flags_shorter_prefix(self):
+        baseline = {make_result(100_000).key: asdict(make_result(100_000))}
+        shorter = compare([make_result(1, peak=10**6, measured=500)], baseline)
+        self.assertEqual([r.metric for r in shorter], ["measured_accesses"])
+        self.assertEqual(longer_prefixes([make_result(1, measured=500)], baseline), [])
+
+        longer = [make_result(1, peak=10**6, measured=2000)]
+        self.assertEqual(compare(longer, baseline), [])
+        self.assertEqual(longer_prefixes(longer, baseline), [make_result(1).key])
+
+    def test_run_case_measures_given_prefix(self):
+        sizes = []
+
+        def prepare(n):
+            sizes.append(n)
+            return lambda: None
+
+        result = run_case("noop", prepare, 100_000, 4, budget=10.0, memory=False, measured=8000)
+        self.assertEqual(sizes, [8000])
+        self.assertEqual(result.measured_accesses, 8000)
+
+if __name__ == "__main__":
+    unittest.main()
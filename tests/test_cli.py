@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from simulator.cli import main
+from simulator.results import read_manifest, read_step_columns
+from simulator.trace import Trace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pairs = [(p * 16, "W" if p % 3 == 0 else "R") for p in [0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2]]
+        self.text_path = os.path.join(self.tmp.name, "trace.txt")
+        with open(self.text_path, "w") as fh:
+            fh.write("# page, op\n")
+            fh.writelines(f"{hex(a)} {op}\n" for a, op in self.pairs)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *args, stderr=None):
+        out = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(stderr or io.StringIO()):
+            code = main([*args, "--virtual", "1024", "--physical", "48", "--offset-bits", "4", "--tlb", "2", "--no-progress"])
+        self.assertEqual(code, 0)
+        return out.getvalue()
+
+    def test_json_summary_picks_fast_engine(self):
+        fast = json.loads(self.run_cli(self.text_path, "--policy", "fifo", "--format", "json"))
+        reference = json.loads(self.run_cli(self.text_path, "--policy", "fifo", "--format", "json", "--engine", "reference"))
+
+        self.assertEqual(fast["engine"], "fast")
+        self.assertEqual(fast["accesses"], len(self.pairs))
+        for key in ("tlb_hits", "page_faults", "disk_writes"):
+            self.assertEqual(fast[key], reference[key])
+
+    def test_binary_trace_and_csv_steps(self):
+        path = os.path.join(self.tmp.name, "trace.vmt")
+        Trace.from_pairs(self.pairs).save(path)
+        err = io.StringIO()
+        rows = list(csv.DictReader(io.StringIO(self.run_cli(path, "--policy", "lru", "--format", "csv", "--steps", stderr=err))))
+
+        # Only step records on stdout; the summary goes to stderr.
+        self.assertEqual(list(rows[0])[:3], ["step", "virtual_address", "operation"])
+        self.assertEqual([int(r["step"]) for r in rows], list(range(len(self.pairs))))
+        summary = dict(line.split(None, 1) for line in err.getvalue().splitlines())
+        self.assertEqual(summary["engine"].strip(), "reference")
+        self.assertEqual(int(summary["page_faults"]), sum(r["hit"] == "False" for r in rows))
+
+    def test_json_steps_are_json_lines(self):
+        out = self.run_cli(self.text_path, "--policy", "fifo", "--format", "json", "--steps")
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual([r["step"] for r in records], list(range(len(self.pairs))))
+
+    def test_compare_policies(self):
+        rows = json.loads(self.run_cli(self.text_path, "--compare", "fifo", "optimal", "--format", "json"))
+        self.assertEqual([row["policy"] for row in rows], ["FIFO", "Optimal"])
+        fifo = json.loads(self.run_cli(self.text_path, "--policy", "fifo", "--format", "json"))
+        self.assertEqual(rows[0]["page_faults"], fifo["page_faults"])
+        self.assertLessEqual(rows[1]["page_faults"], rows[0]["page_faults"])
+
+    def test_sampled_miss_ratio_curve(self):
+        data = json.loads(self.run_cli(
+            self.text_path, "--mrc", "--sample-rate", "0.5", "--exact", "--sizes", "1", "2", "3", "--format", "json"
+        ))
+        self.assertEqual([row["frames"] for row in data["curve"]], [1, 2, 3])
+        self.assertEqual(data["accesses"], len(self.pairs))
+        self.assertIn("max_abs", data["error"])
+        lru = json.loads(self.run_cli(self.text_path, "--policy", "lru", "--format", "json"))
+        self.assertAlmostEqual(data["curve"][2]["exact_miss_ratio"], lru["page_fault_ratio"])
+
+    def test_export_selected_columns(self):
+        path = os.path.join(self.tmp.name, "run")
+        summary = json.loads(self.run_cli(self.text_path, "--export", path, "--columns", "step", "fault", "--format", "json"))
+        columns = read_step_columns(path)
+        self.assertEqual(list(columns), ["step", "fault"])
+        self.assertEqual(int(columns["fault"].sum()), summary["page_faults"])
+        self.assertEqual(read_manifest(path)["summary"]["page_faults"], summary["page_faults"])
+
+    def test_does_not_import_gui(self):
+        code = "import sys, simulator.cli; print('pygame' in sys.modules or any(m.startswith('ui') for m in sys.modules))"
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from simulator.comparison import PolicyComparison
+from simulator.registry import create_policy
+from simulator.replacement_policies.lru import LRUAlgorithm
+from simulator.simulation_controller import SimulationController
+from simulator.vm_config import VMConfig
+from simulator.workload import ZipfWorkload, generate_trace
+
+class PlainLRU(LRUAlgorithm):
+    # No fast kernel, so it runs on the reference engine.
+    pass
+
+class TestPolicyComparison(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=1 << 20, physical_memory_size=8 * 64, offset_bits=6)
+        self.trace = generate_trace(ZipfWorkload(40, alpha=0.8), 3000, 64, seed=7)
+
+    def test_matches_separate_runs(self):
+        comparison = PolicyComparison(
+            self.config, self.trace, ["fifo", "lru", "optimal", PlainLRU()], tlb_entries=4, chunk_size=500
+        )
+        self.assertEqual(comparison.run(1200), 1200)
+        comparison.run()
+        self.assertTrue(comparison.is_finished())
+
+        rows = comparison.rows()
+        self.assertEqual([row["engine"] for row in rows], ["fast", "fast", "fast", "reference"])
+        # The fast lanes decode the trace once between them.
+        decoded = {id(lane.controller.engine.trace) for lane in comparison.lanes[:3]}
+        self.assertEqual(decoded, {id(comparison.decoded)})
+
+        for name, row in zip(["fifo", "lru", "optimal", "lru"], rows):
+            alone = SimulationController(self.config, self.trace, create_policy(name), 4, record_history=False)
+            alone.run()
+            self.assertEqual(row["accesses"], len(self.trace))
+            self.assertEqual(row["page_faults"], alone.stats.page_faults)
+            self.assertEqual(row["disk_writes"], alone.stats.disk_writes)
+            self.assertEqual(row["tlb_hit_ratio"], alone.stats.tlb_hit_ratio)
+
+    def test_table(self):
+        comparison = PolicyComparison(self.config, self.trace, ["lru", "optimal"], tlb_entries=4)
+        comparison.run()
+        lines = comparison.table().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("Policy"))
+        self.assertTrue(lines[2].startswith("LRU"))
+        self.assertTrue(lines[3].startswith("Optimal"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.cow import ForkingEngine
+from simulator.frame_history import FrameHistory
+from simulator.statistics_tracker import StatisticsTracker
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+
+class TestForkingEngine(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=256, physical_memory_size=64, offset_bits=4)
+
+    def run_engine(self, ref, forks):
+        engine = ForkingEngine(self.config, ref, FIFOAlgorithm(), tlb_entries=4, forks=forks)
+        stats = StatisticsTracker()
+        history = FrameHistory(self.config.num_frames)
+        results = []
+        while not engine.has_finished():
+            result = engine.step()
+            stats.record_step(result)
+            history.record(result)
+            results.append(result)
+            self.assertEqual(history.latest(), [f.page for f in engine.frames])
+        return engine, stats, results
+
+    def test_fork_shares_then_copies_on_write(self):
+        ref = [
+            (1, 0, "W"), (1, 16, "R"),   # parent touches pages 0 and 1
+            (2, 0, "R"), (2, 16, "R"),   # child reads the shared frames
+            (2, 0, "W"),                 # COW copy for the child
+            (1, 0, "W"),                 # parent is now the last sharer
+        ]
+        engine, stats, results = self.run_engine(ref, forks=[(2, 1, 2)])
+
+        self.assertEqual(stats.page_faults, 2)
+        self.assertTrue(results[2].hit)
+        self.assertEqual(results[2].frame_index, results[0].frame_index)
+        self.assertEqual(stats.cow_faults, 2)
+        self.assertEqual(stats.cow_copies, 1)
+        self.assertTrue(results[4].cow_copy)
+        self.assertNotEqual(results[4].frame_index, results[0].frame_index)
+        self.assertFalse(results[5].cow_copy)
+
+        self.assertEqual(engine.shared_frames(), 1)
+        self.assertEqual(engine.resident_set(2), (2, 1.5))
+        self.assertEqual(engine.split_key(results[4].page), (2, 0))
+
+    def test_evicting_shared_frame_unmaps_all_sharers(self):
+        ref = [(1, 0, "W")] + [(2, 0, "R")] + [(1, p * 16, "R") for p in range(1, 5)]
+        engine, stats, _ = self.run_engine(ref, forks=[(1, 1, 2)])
+
+        for pid in (1, 2):
+            pte = engine.page_table.get(engine.key(pid, 0))
+            self.assertFalse(pte.present)
+            self.assertNotIn(engine.key(pid, 0), engine.tlb)
+        self.assertEqual(stats.disk_writes, 1)
+        self.assertEqual(sum(len(s) for s in engine.rmap.values()), 4)
+
+    def test_fork_twice_is_rejected(self):
+        engine = ForkingEngine(self.config, [(1, 0, "R")], FIFOAlgorithm(), tlb_entries=4)
+        engine.fork(1, 2)
+        with self.assertRaises(ValueError):
+            engine.fork(1, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -55,6 +55,18 @@ class TestSimulationEngine(unittest.TestCase):
         self.assertEqual(res.evicted_page, 0)
         self.assertEqual(res.victim_frame_index, 0)
         self.assertTrue(res.write_back)
+        self.assertEqual(res.tlb_shootdowns, 0)
+
+    def test_eviction_uses_reverse_map(self):
+        for _ in range(6):
+            self.engine.step()
+        self.assertEqual(self.engine.rmap[0], {4})
+        self.assertEqual(sorted(p for keys in self.engine.rmap.values() for p in keys), [1, 2, 3, 4])
+        # Page 0 was still cached in the 2-entry TLB when it was evicted.
+        engine = SimulationEngine(self.config, [(0, "R"), (16, "R"), (32, "R"), (48, "R"), (64, "R")],
+                                  FIFOAlgorithm(), tlb_entries=8)
+        results = [engine.step() for _ in range(5)]
+        self.assertEqual([r.tlb_shootdowns for r in results], [0, 0, 0, 0, 1])
 
     def test_tlb_usage(self):
         res = self.engine.step()
@@ -0,0 +1,83 @@
+import random
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.fast_engine import FastSimulationEngine
+from simulator.base_policy import ReplacementPolicy
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+from simulator.replacement_policies.lru import LRUAlgorithm
+from simulator.replacement_policies.optimal import OptimalAlgorithm
+from simulator.trace import Trace
+
+POLICIES = [FIFOAlgorithm, LRUAlgorithm, OptimalAlgorithm]
+
+def random_reference(seed, length, pages, offset_bits=4):
+    rng = random.Random(seed)
+    hot = [rng.randrange(pages) for _ in range(4)]
+    ref = []
+    for _ in range(length):
+        page = rng.choice(hot) if rng.random() < 0.6 else rng.randrange(pages)
+        addr = (page << offset_bits) + rng.randrange(1 << offset_bits)
+        ref.append((addr, "W" if rng.random() < 0.3 else "R"))
+    return ref
+
+def stats_tuple(stats):
+    return (stats.tlb_hits, stats.tlb_misses, stats.page_hits, stats.page_faults, stats.disk_writes)
+
+class TestFastEngine(unittest.TestCase):
+    def assert_same_stats(self, config, ref, policy_cls, tlb_entries):
+        reference = SimulationController(config, ref, policy_cls(), tlb_entries)
+        reference.run_all()
+        fast = SimulationController(config, ref, policy_cls(), tlb_entries, engine_mode="fast")
+        fast.run()
+        self.assertEqual(stats_tuple(fast.stats), stats_tuple(reference.stats))
+        self.assertEqual(fast.engine.frame_pages(), [f.page for f in reference.engine.frames])
+
+    def test_differential_against_reference_engine(self):
+        for seed in range(6):
+            for frames in (1, 3, 8):
+                for tlb_entries in (1, 2, 6):
+                    config = VMConfig(virtual_memory_size=4096, physical_memory_size=frames * 16, offset_bits=4)
+                    ref = random_reference(seed, 300, pages=20)
+                    for policy_cls in POLICIES:
+                        with self.subTest(seed=seed, frames=frames, tlb=tlb_entries, policy=policy_cls.__name__):
+                            self.assert_same_stats(config, ref, policy_cls, tlb_entries)
+
+    def test_trace_input_and_batches(self):
+        config = VMConfig(virtual_memory_size=4096, physical_memory_size=64, offset_bits=4)
+        ref = random_reference(42, 500, pages=30)
+        reference = SimulationController(config, ref, LRUAlgorithm(), 4)
+        reference.run_all()
+
+        fast = SimulationController(config, Trace.from_pairs(ref), LRUAlgorithm(), 4, engine_mode="fast")
+        steps = [fast.run(128) for _ in range(5)]
+        self.assertEqual(steps, [128, 128, 128, 116, 0])
+        self.assertTrue(fast.is_finished())
+        self.assertEqual(stats_tuple(fast.stats), stats_tuple(reference.stats))
+
+    def test_reset(self):
+        config = VMConfig(virtual_memory_size=4096, physical_memory_size=64, offset_bits=4)
+        fast = SimulationController(config, random_reference(1, 100, 10), FIFOAlgorithm(), 2, engine_mode="fast")
+        fast.run()
+        first = stats_tuple(fast.stats)
+        fast.reset()
+        fast.run()
+        self.assertEqual(stats_tuple(fast.stats), first)
+
+    def test_step_unavailable_in_fast_mode(self):
+        config = VMConfig(virtual_memory_size=256, physical_memory_size=32, offset_bits=4)
+        fast = SimulationController(config, [(0, "R")], FIFOAlgorithm(), 2, engine_mode="fast")
+        with self.assertRaises(RuntimeError):
+            fast.step()
+
+    def test_unsupported_policy(self):
+        class FirstFrame(ReplacementPolicy):
+            def select_victim(self, frames, reference_string, current_index):
+                return 0
+
+        config = VMConfig(virtual_memory_size=256, physical_memory_size=32, offset_bits=4)
+        with self.assertRaises(ValueError):
+            FastSimulationEngine(config, [(0, "R")], FirstFrame(), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.frame_history import FrameHistory
+from simulator.replacement_policies.lru import LRUAlgorithm
+
+class TestFrameHistory(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(
+            virtual_memory_size=256,
+            physical_memory_size=48,
+            offset_bits=4
+        )
+        pages = [0, 1, 2, 0, 3, 4, 1, 0, 5, 2, 2, 6, 0, 1, 7, 3]
+        self.ref_string = [(p * 16, "W" if i % 3 == 0 else "R") for i, p in enumerate(pages)]
+
+    def test_reconstruction_matches_engine(self):
+        controller = SimulationController(self.config, self.ref_string, LRUAlgorithm(), tlb_entries=2)
+        controller.history = FrameHistory(self.config.num_frames, checkpoint_interval=4)
+
+        expected = []
+        while not controller.is_finished():
+            controller.step()
+            expected.append([f.page for f in controller.engine.frames])
+
+        for step_index, frames in enumerate(expected):
+            self.assertEqual(controller.frames_at(step_index), frames)
+        self.assertEqual(controller.history.latest(), expected[-1])
+
+    def test_only_faults_are_recorded(self):
+        controller = SimulationController(self.config, self.ref_string, LRUAlgorithm(), tlb_entries=2)
+        results = controller.run_all()
+        faults = sum(1 for r in results if r.fault)
+        self.assertEqual(len(controller.history._delta_frames), faults)
+        self.assertEqual(len(controller.history), len(results))
+
+    def test_unrecorded_step(self):
+        history = FrameHistory(4)
+        with self.assertRaises(IndexError):
+            history.frames_at(0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+try:
+    import pygame
+    from simulator.activity import RateTimeline
+    from ui.gui import COLOR_ACCENT, COLOR_GREEN, MemoryVisualizer, TextCache, STEP_PANELS, init_fonts
+except ImportError:
+    pygame = None
+
+class FakeFont:
+    def __init__(self):
+        self.calls = 0
+
+    def render(self, text, antialias, color):
+        self.calls += 1
+        return (text, color)
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestTextCache(unittest.TestCase):
+    def test_hits_and_lru_eviction(self):
+        cache = TextCache(max_entries=2)
+        font = FakeFont()
+        cache.render(font, "a", (1, 1, 1))
+        cache.render(font, "b", (1, 1, 1))
+        cache.render(font, "a", (1, 1, 1))
+        cache.render(font, "a", (2, 2, 2))
+
+        self.assertEqual(font.calls, 3)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(len(cache), 2)
+        cache.render(font, "b", (1, 1, 1))
+        self.assertEqual(font.calls, 4)
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestDirtyPanels(unittest.TestCase):
+    def setUp(self):
+        self.viz = MemoryVisualizer()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_only_changed_panels_are_redrawn(self):
+        self.assertEqual(self.viz.draw(), [self.viz.screen.get_rect()])
+        self.assertEqual(self.viz.draw(), [])
+
+        self.viz.next_step()
+        rects = self.viz.panel_rects(self.viz.compute_layout())
+        self.assertEqual(self.viz.draw(), [rects[name] for name in STEP_PANELS])
+
+        field = self.viz.input_fields["tlb_entries"]
+        self.viz.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=field.rect.center, button=1))
+        self.assertEqual(self.viz.draw(), [rects["config"]])
+        self.viz.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=(5, 5), rel=(0, 0), buttons=(0, 0, 0)))
+        self.assertEqual(self.viz.draw(), [])
+
+    def test_fast_forward_runs_on_the_worker(self):
+        self.viz.input_fields["batch_steps"].text = "7"
+        self.viz.fast_forward()
+        self.viz.worker._thread.join()
+        self.viz.poll_worker()
+
+        self.assertEqual(self.viz.controller.engine.current_step, 7)
+        self.assertEqual(self.viz.last_step_result.step_index, 6)
+        self.assertIn("page_table", self.viz.dirty)
+
+    def test_trace_file_is_parsed_in_the_background(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as fh:
+            fh.write("0x10 W\n0x20\n")
+        self.addCleanup(os.remove, fh.name)
+        self.viz.input_fields["reference"].text = fh.name
+        self.viz.apply_inputs()
+        self.viz.parse_job.join()
+        self.viz.poll_parse_job()
+
+        self.assertIsNone(self.viz.parse_job)
+        self.assertEqual(self.viz.reference_string.to_list(), [(16, "W"), (32, "R")])
+        self.assertEqual(self.viz.controller.reference_string, self.viz.reference_string)
+
+    def test_rate_sparkline_stays_inside_its_box(self):
+        init_fonts()
+        x, y, w, h = 0, 0, 400, 300
+        for capacity in (1, 2):
+            with self.subTest(capacity=capacity):
+                # Full windows up to the capacity plus the one in progress.
+                self.viz.timeline = RateTimeline(window=2, capacity=capacity)
+                for _ in range(2 * capacity + 1):
+                    self.viz.next_step()
+                self.viz.screen.fill((0, 0, 0))
+                self.viz.draw_memory_heatmap(x, y, w, h)
+
+                # The sparkline box ends 15 pixels before the panel edge.
+                outside = {
+                    tuple(self.viz.screen.get_at((px, py)))[:3]
+                    for px in range(x + w - 13, x + w) for py in range(y, y + h)
+                }
+                self.assertFalse(outside & {COLOR_ACCENT, COLOR_GREEN})
+
+if __name__ == "__main__":
+    unittest.main()
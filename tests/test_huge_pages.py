@@ -0,0 +1,69 @@
+import unittest
+from simulator.vm_config import VMConfig, PageRegion
+from simulator.huge_pages import (
+    BasePagePolicy,
+    StaticRegionPolicy,
+    ThresholdPromotionPolicy,
+    compare_page_sizes,
+    format_reports,
+    simulate_page_sizes,
+)
+
+MB = 1 << 20
+
+class TestHugePages(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(
+            virtual_memory_size=1 << 32,
+            physical_memory_size=64 * MB,
+            offset_bits=12,
+            page_regions=(PageRegion(start=4 * MB, size=4 * MB, offset_bits=21),)
+        )
+        # Two passes over a 4 MiB hot region: 1024 base pages, 2 huge pages.
+        self.trace = [(4 * MB + i * 4096, "R") for i in range(1024)] * 2
+
+    def test_page_shift_for(self):
+        self.assertEqual(self.config.page_shift_for(0), 12)
+        self.assertEqual(self.config.page_shift_for(4 * MB), 21)
+        self.assertEqual(self.config.page_shift_for(8 * MB - 1), 21)
+        self.assertEqual(self.config.page_shift_for(8 * MB), 12)
+
+    def test_region_validation(self):
+        with self.assertRaises(ValueError):
+            VMConfig(1 << 32, MB, 12, page_regions=(PageRegion(start=4096, size=2 * MB, offset_bits=21),))
+        with self.assertRaises(ValueError):
+            VMConfig(1 << 32, MB, 12, page_regions=(
+                PageRegion(start=0, size=4 * MB, offset_bits=21),
+                PageRegion(start=2 * MB, size=2 * MB, offset_bits=21),
+            ))
+
+    def test_static_regions_extend_reach(self):
+        base = simulate_page_sizes("base", BasePagePolicy(self.config), self.trace, tlb_entries=64)
+        huge = simulate_page_sizes("huge", StaticRegionPolicy(self.config), self.trace, tlb_entries=64)
+
+        self.assertEqual(base.tlb_misses, len(self.trace))
+        self.assertEqual(huge.tlb_misses, 2)
+        self.assertEqual(huge.max_reach_bytes, 4 * MB)
+        self.assertEqual(base.max_reach_bytes, 64 * 4096)
+        self.assertEqual(huge.huge_fraction, 1.0)
+
+    def test_threshold_promotion_and_demotion(self):
+        policy = ThresholdPromotionPolicy(self.config, promote_fraction=0.25, demote_fraction=0.05, window=600)
+        report = simulate_page_sizes("promo", policy, self.trace, tlb_entries=64)
+
+        self.assertEqual(report.promotions, 2)
+        self.assertLess(report.tlb_misses, len(self.trace))
+        self.assertGreater(report.huge_accesses, 0)
+
+        idle = self.trace + [(0, "R")] * 1200
+        policy = ThresholdPromotionPolicy(self.config, promote_fraction=0.25, demote_fraction=0.05, window=600)
+        report = simulate_page_sizes("idle", policy, idle, tlb_entries=64)
+        self.assertEqual(report.demotions, 2)
+
+    def test_compare_report(self):
+        reports = compare_page_sizes(self.config, self.trace, tlb_entries=64)
+        self.assertEqual([r.name for r in reports], ["base pages", "static regions", "promotion (2M)"])
+        self.assertIn("miss rate", format_reports(reports))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.simulation_engine import SimulationEngine
+from simulator.instrumentation import EngineProfiler
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=256, physical_memory_size=32, offset_bits=4)
+        self.ref_string = [(p * 16, "R") for p in [0, 1, 0, 2, 3, 0, 1]]
+
+    def test_phase_counts(self):
+        profiler = EngineProfiler()
+        controller = SimulationController(self.config, self.ref_string, FIFOAlgorithm(), tlb_entries=2, profiler=profiler)
+        results = controller.run_all()
+
+        faults = sum(r.fault for r in results)
+        evictions = sum(r.evicted_page is not None for r in results)
+        stats = profiler.stats
+        self.assertEqual(stats["step"].calls, len(self.ref_string))
+        self.assertEqual(stats["tlb.lookup"].calls, len(self.ref_string))
+        self.assertEqual(stats["result"].calls, len(self.ref_string))
+        self.assertEqual(stats["_find_free_frame"].calls, faults)
+        self.assertEqual(stats["policy.select_victim"].calls, evictions)
+        self.assertGreater(stats["step"].total_ns, 0)
+        self.assertIn("policy.select_victim", profiler.report())
+
+    def test_detach_restores_methods(self):
+        engine = SimulationEngine(self.config, self.ref_string, FIFOAlgorithm(), 2)
+        profiler = EngineProfiler().attach(engine)
+        engine.step()
+        profiler.detach()
+        engine.step()
+
+        self.assertFalse(profiler.attached)
+        self.assertNotIn("step", vars(engine))
+        self.assertNotIn("lookup", vars(engine.tlb))
+        self.assertEqual(profiler.stats["step"].calls, 1)
+
+    def test_reset_reattaches(self):
+        profiler = EngineProfiler(phases=["step"])
+        controller = SimulationController(self.config, self.ref_string, FIFOAlgorithm(), tlb_entries=2, profiler=profiler)
+        controller.step()
+        controller.reset()
+        controller.step()
+        self.assertEqual(profiler.stats["step"].calls, 2)
+
+    def test_chrome_trace_export(self):
+        profiler = EngineProfiler(trace_events=True, max_events=5)
+        controller = SimulationController(self.config, self.ref_string, FIFOAlgorithm(), tlb_entries=2, profiler=profiler)
+        controller.run_all()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            profiler.write_chrome_trace(path)
+            with open(path) as fh:
+                data = json.load(fh)
+        self.assertEqual(len(data["traceEvents"]), 5)
+        self.assertEqual(data["traceEvents"][0]["ph"], "X")
+        self.assertGreater(data["otherData"]["dropped_events"], 0)
+
+    def test_unknown_phase(self):
+        with self.assertRaises(ValueError):
+            EngineProfiler(phases=["nope"])
+
+if __name__ == "__main__":
+    unittest.main()
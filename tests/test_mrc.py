@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from simulator.mrc import (
+    StackDistances, default_sizes, exact_lru_curve, miniature_curve, sample_trace, shards_lru_curve
+)
+from simulator.registry import create_policy
+from simulator.simulation_controller import SimulationController
+from simulator.vm_config import VMConfig
+from simulator.workload import ZipfWorkload, generate_trace
+
+class TestMissRatioCurves(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.trace = generate_trace(ZipfWorkload(20000, alpha=0.7), 40000, 64, seed=3)
+        cls.sizes = np.array([64, 128, 256, 512, 1024, 2048])
+
+    def fault_ratio(self, policy, frames):
+        config = VMConfig(1 << 64, frames << 6, 6)
+        controller = SimulationController(config, self.trace, create_policy(policy), 4, record_history=False, engine_mode="fast")
+        controller.run()
+        return controller.stats.page_fault_ratio
+
+    def test_stack_distances(self):
+        stack = StackDistances(capacity=2)
+        self.assertEqual([stack.access(p) for p in [1, 2, 3, 1, 1, 3]], [-1, -1, -1, 2, 0, 1])
+        stack.forget(2)
+        self.assertEqual(len(stack), 2)
+        self.assertEqual(stack.access(2), -1)
+
+    def test_stack_distances_stay_compact(self):
+        stack = StackDistances(capacity=4)
+        for step in range(10000):
+            stack.access(step % 1000)
+            stack.forget((step - 7) % 1000)
+        self.assertLessEqual(len(stack), 8)
+        self.assertLessEqual(stack.capacity, 32)
+
+    def test_empty_sample_is_an_error(self):
+        with self.assertRaises(ValueError):
+            shards_lru_curve(self.trace[:2], 6, self.sizes, rate=1e-6)
+        with self.assertRaises(ValueError):
+            miniature_curve(self.trace[:2], 6, "fifo", self.sizes, rate=1e-6)
+
+    def test_default_sizes(self):
+        self.assertEqual(default_sizes(20).tolist(), [1, 2, 4, 8, 16, 20])
+
+    def test_exact_lru_matches_simulation(self):
+        curve = exact_lru_curve(self.trace, 6, self.sizes)
+        self.assertEqual((curve.rate, curve.sampled), (1.0, len(self.trace)))
+        for size, ratio in zip(self.sizes[::2], curve.miss_ratios[::2]):
+            self.assertAlmostEqual(ratio, self.fault_ratio("lru", int(size)))
+
+    def test_shards_close_to_exact(self):
+        exact = exact_lru_curve(self.trace, 6, self.sizes)
+        fixed_rate = shards_lru_curve(self.trace, 6, self.sizes, rate=0.1)
+        self.assertEqual(fixed_rate.rate, round(0.1 * (1 << 24)) / (1 << 24))
+        self.assertLess(fixed_rate.sampled, len(self.trace) // 5)
+        self.assertLess(fixed_rate.error(exact).mean_abs, 0.05)
+
+        fixed_size = shards_lru_curve(self.trace, 6, self.sizes, max_pages=2000)
+        self.assertLess(fixed_size.rate, 0.2)
+        self.assertLess(fixed_size.error(exact).mean_abs, 0.05)
+
+    def test_miniature_simulation(self):
+        exact = miniature_curve(self.trace, 6, "fifo", self.sizes)
+        self.assertAlmostEqual(exact.miss_ratios[1], self.fault_ratio("fifo", 128))
+        approx = miniature_curve(self.trace, 6, "fifo", self.sizes, rate=0.1)
+        self.assertEqual(approx.sampled, len(sample_trace(self.trace, 6, 0.1)))
+        self.assertLess(approx.error(exact).mean_abs, 0.05)
+
+if __name__ == "__main__":
+    unittest.main()
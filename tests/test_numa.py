@@ -0,0 +1,101 @@
+import unittest
+from simulator.vm_config import VMConfig, NumaNode
+from simulator.numa import NumaAllocator
+from simulator.simulation_controller import SimulationController
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+
+class TestNuma(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(
+            virtual_memory_size=1024,
+            physical_memory_size=128,
+            offset_bits=4,
+            numa_nodes=(NumaNode(4), NumaNode(4, local_cost=10, remote_cost=30)),
+        )
+        self.ref = [(p * 16, "R") for p in range(6)]
+
+    def run_with(self, numa, ref=None):
+        controller = SimulationController(self.config, ref or self.ref, FIFOAlgorithm(), tlb_entries=4, numa=numa)
+        controller.run_all()
+        return controller
+
+    def test_nodes_must_cover_memory(self):
+        with self.assertRaises(ValueError):
+            VMConfig(1024, 128, 4, numa_nodes=(NumaNode(4),))
+
+    def test_first_touch_places_on_faulting_node(self):
+        cpus = [1, 1, 1, 0, 0, 0]
+        numa = NumaAllocator(self.config, "first-touch", cpu_nodes=cpus)
+        controller = self.run_with(numa)
+        frames = [r.frame_index for r in controller.engine.page_table.all_entries().values()]
+        self.assertEqual([numa.node_of(f) for f in frames], cpus)
+        self.assertEqual(numa.stats[1].locality, 1.0)
+        self.assertEqual(numa.access_cost, 60)
+
+    def test_first_touch_falls_back_when_node_is_full(self):
+        numa = NumaAllocator(self.config, "first-touch", cpu_nodes=0)
+        self.run_with(numa)
+        self.assertEqual(numa.stats[0].allocations, 4)
+        self.assertEqual(numa.stats[1].allocations, 2)
+        self.assertEqual(numa.stats[1].remote_accesses, 2)
+
+    def test_faults_per_node_after_memory_fills(self):
+        # Ten distinct pages fault on node 1's CPU; only four fit there.
+        ref = [(p * 16, "R") for p in range(10)]
+        numa = NumaAllocator(self.config, "first-touch", cpu_nodes=1)
+        controller = self.run_with(numa, ref)
+        # The first eight faults fill node 1, then node 0. After that the
+        # victims come from node 1 again.
+        self.assertEqual([numa.stats[0].faults, numa.stats[1].faults], [4, 6])
+        self.assertEqual(sum(s.faults for s in numa.stats), controller.stats.page_faults)
+        self.assertEqual([s.allocations for s in numa.stats], [4, 6])
+
+    def test_placement_decides_the_node_when_memory_is_full(self):
+        # Sixteen distinct pages: the last eight fault with memory full.
+        ref = [(p * 16, "R") for p in range(16)]
+        expected = {"first-touch": [12, 4], "interleave": [8, 8], "preferred": [4, 12]}
+        for placement, faults in expected.items():
+            with self.subTest(placement=placement):
+                numa = NumaAllocator(self.config, placement, cpu_nodes=0, preferred_node=1)
+                self.run_with(numa, ref)
+                self.assertEqual([s.faults for s in numa.stats], faults)
+
+    def test_interleave_and_preferred(self):
+        numa = NumaAllocator(self.config, "interleave")
+        self.run_with(numa)
+        self.assertEqual([s.allocations for s in numa.stats], [3, 3])
+
+        numa = NumaAllocator(self.config, "preferred", preferred_node=1)
+        self.run_with(numa)
+        self.assertEqual([s.allocations for s in numa.stats], [2, 4])
+        self.assertIn("locality", numa.report())
+
+    def test_migration_follows_remote_accesses(self):
+        ref = [(0, "R")] * 4
+        numa = NumaAllocator(self.config, "first-touch", cpu_nodes=[0, 1, 1, 1], migrate_threshold=2)
+        controller = self.run_with(numa, ref)
+
+        self.assertEqual(numa.stats[0].migrations_out, 1)
+        self.assertEqual(numa.stats[1].migrations_in, 1)
+        self.assertEqual(numa.stats[1].local_accesses, 1)
+        pte = controller.engine.page_table.get(0)
+        self.assertEqual(numa.node_of(pte.frame_index), 1)
+        self.assertEqual(controller.frames_at(3), [None] * 4 + [0, None, None, None])
+        self.assertGreater(controller.stats.tlb_shootdowns, 0)
+
+    def test_migration_evicts_on_full_node(self):
+        # Pages 0-3 fill node 0 from CPU 0, pages 4-7 fill node 1 from CPU 1,
+        # then CPU 1 keeps writing page 0 until it moves to node 1.
+        ref = [(p * 16, "R") for p in range(8)] + [(0, "W")] * 3
+        cpus = [0] * 4 + [1] * 4 + [1] * 3
+        numa = NumaAllocator(self.config, "first-touch", cpu_nodes=cpus, migrate_threshold=2)
+        controller = self.run_with(numa, ref)
+
+        self.assertEqual(numa.stats[1].migrations_in, 1)
+        self.assertEqual(numa.node_of(controller.engine.page_table.get(0).frame_index), 1)
+        # FIFO evicted page 4, the oldest page on node 1.
+        self.assertFalse(controller.engine.page_table.get(4).present)
+        self.assertEqual(numa.stats[1].local_accesses, 4 + 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,5 +33,20 @@ class TestPageTable(unittest.TestCase):
         self.assertIn(1, entries)
         self.assertIn(2, entries)
 
+    def test_sorted_window(self):
+        for page in (40, 3, 17, 3, 8):
+            self.pt.get_or_create(page)
+        self.assertEqual(len(self.pt), 4)
+        self.assertEqual(self.pt.index_of(17), 2)
+        self.assertEqual(self.pt.index_of(10), 2)
+        self.assertEqual([e.page for e in self.pt.entries_from(1, 2)], [8, 17])
+        self.assertEqual([e.page for e in self.pt.entries_from(3, 5)], [40])
+
+        # Pages touched after a lookup are merged in on the next one.
+        for page in (50, 1, 17, 20):
+            self.pt.get_or_create(page)
+        self.assertEqual(self.pt.index_of(20), 4)
+        self.assertEqual([e.page for e in self.pt.entries_from(0, 10)], [1, 3, 8, 17, 20, 40, 50])
+
 if __name__ == "__main__":
     unittest.main()
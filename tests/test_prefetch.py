@@ -0,0 +1,94 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.prefetch import MarkovPrefetcher, SequentialPrefetcher, StridePrefetcher
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+from simulator.replacement_policies.lru import LRUAlgorithm
+from simulator.replacement_policies.optimal import OptimalAlgorithm
+
+class TestPrefetchers(unittest.TestCase):
+    def test_sequential_window_grows(self):
+        p = SequentialPrefetcher(initial_window=2, max_window=8)
+        self.assertEqual(p.on_access(0, True, 0), [])
+        self.assertEqual(p.on_access(1, True, 1), [2, 3, 4, 5])
+        self.assertEqual(p.on_access(2, False, 2), [])
+        self.assertEqual(p.on_access(3, False, 3), [])
+        self.assertEqual(p.on_access(4, False, 4), [6, 7, 8, 9, 10, 11, 12])
+        self.assertEqual(p.on_access(40, True, 5), [])
+        self.assertEqual(p.window, 2)
+
+    def test_stride_needs_confidence(self):
+        p = StridePrefetcher(degree=2, confidence=2)
+        self.assertEqual(p.on_access(10, True, 0), [])
+        self.assertEqual(p.on_access(13, True, 1), [])
+        self.assertEqual(p.on_access(16, True, 2), [19, 22])
+        self.assertEqual(p.on_access(17, True, 3), [])
+
+    def test_markov_learns_miss_successors(self):
+        p = MarkovPrefetcher(degree=1)
+        for page in [1, 5, 9, 1, 5, 9]:
+            p.on_access(page, True, 0)
+        self.assertEqual(p.on_access(1, True, 0), [5])
+        self.assertEqual(p.on_access(1, False, 0), [])
+
+class TestEnginePrefetch(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=4096, physical_memory_size=128, offset_bits=4)
+        self.scan = [(p * 16, "R") for p in range(40)]
+
+    def test_read_ahead_removes_scan_faults(self):
+        plain = SimulationController(self.config, self.scan, FIFOAlgorithm(), tlb_entries=4)
+        plain.run_all()
+        ahead = SimulationController(
+            self.config, self.scan, FIFOAlgorithm(), tlb_entries=4, page_prefetcher=SequentialPrefetcher()
+        )
+        ahead.run_all()
+
+        self.assertEqual(plain.stats.page_faults, 40)
+        self.assertLess(ahead.stats.page_faults, 10)
+        self.assertGreater(ahead.stats.prefetch_accuracy, 0.8)
+        self.assertGreater(ahead.stats.prefetch_coverage, 0.8)
+
+    def test_history_includes_prefetched_frames(self):
+        controller = SimulationController(
+            self.config, self.scan, LRUAlgorithm(), tlb_entries=4, page_prefetcher=SequentialPrefetcher()
+        )
+        while not controller.is_finished():
+            result = controller.step()
+            self.assertEqual(
+                controller.frames_at(result.step_index),
+                [f.page for f in controller.engine.frames]
+            )
+
+    def test_pollution_is_counted(self):
+        ref = [(0, "R"), (16, "R"), (0, "R"), (16, "R"), (0, "R")]
+        config = VMConfig(virtual_memory_size=4096, physical_memory_size=32, offset_bits=4)
+        controller = SimulationController(
+            config, ref, LRUAlgorithm(), tlb_entries=4, page_prefetcher=StridePrefetcher(degree=1, confidence=1)
+        )
+        controller.run_all()
+        self.assertGreater(controller.stats.prefetch_pollution, 0)
+
+    def test_read_ahead_works_under_every_policy(self):
+        # LRU and OPT rank the page just demanded or just read ahead first,
+        # so read-ahead must keep those frames out of the choice.
+        for policy_class in (FIFOAlgorithm, LRUAlgorithm, OptimalAlgorithm):
+            with self.subTest(policy=policy_class.__name__):
+                ahead = SimulationController(
+                    self.config, self.scan, policy_class(), tlb_entries=4, page_prefetcher=SequentialPrefetcher()
+                )
+                ahead.run_all()
+                self.assertLess(ahead.stats.page_faults, 10)
+
+    def test_tlb_prefetch(self):
+        ref = self.scan[:8] * 3
+        controller = SimulationController(
+            self.config, ref, LRUAlgorithm(), tlb_entries=2, tlb_prefetcher=StridePrefetcher(degree=1)
+        )
+        controller.run_all()
+        self.assertGreater(controller.stats.tlb_prefetches_issued, 0)
+        self.assertGreater(controller.stats.tlb_prefetch_hits, 0)
+        self.assertLessEqual(controller.stats.tlb_prefetch_hits, controller.stats.tlb_prefetches_issued)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.reclaim import Reclaimer
+from simulator.simulation_controller import SimulationController
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+
+class TestReclaim(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=4096, physical_memory_size=128, offset_bits=4)
+        # Page 0 stays hot while a scan streams through 40 other pages.
+        self.ref = []
+        for p in range(1, 41):
+            self.ref += [(0, "R"), (p * 16, "W")]
+
+    def run_with(self, reclaimer):
+        controller = SimulationController(self.config, self.ref, FIFOAlgorithm(), tlb_entries=4, reclaimer=reclaimer)
+        while not controller.is_finished():
+            result = controller.step()
+            self.assertEqual(controller.frames_at(result.step_index), [f.page for f in controller.engine.frames])
+        return controller
+
+    def test_without_kswapd_every_fault_stalls(self):
+        reclaimer = Reclaimer(low_watermark=0, high_watermark=0)
+        controller = self.run_with(reclaimer)
+        stats = controller.stats
+
+        self.assertEqual(stats.direct_reclaim_stalls, stats.page_faults - 8)
+        self.assertEqual(stats.background_reclaimed, 0)
+        self.assertEqual(reclaimer.stats.direct_stalls, stats.direct_reclaim_stalls)
+        self.assertEqual(stats.disk_writes, reclaimer.stats.write_backs)
+
+    def test_kswapd_keeps_a_free_pool(self):
+        reclaimer = Reclaimer(low_watermark=2, high_watermark=4, kswapd_batch=4)
+        controller = self.run_with(reclaimer)
+
+        self.assertEqual(controller.stats.direct_reclaim_stalls, 0)
+        self.assertGreater(controller.stats.background_reclaimed, 0)
+        self.assertGreater(reclaimer.stats.kswapd_wakeups, 0)
+        self.assertGreaterEqual(reclaimer.free_frames, 2)
+        self.assertEqual(reclaimer.stats.direct_fraction, 0.0)
+
+    def test_referenced_page_is_activated(self):
+        plain = SimulationController(self.config, self.ref, FIFOAlgorithm(), tlb_entries=4)
+        plain.run_all()
+        reclaimer = Reclaimer(low_watermark=0, high_watermark=0)
+        controller = self.run_with(reclaimer)
+
+        # FIFO keeps evicting the hot page; aging only does so while every page looks referenced.
+        self.assertLess(controller.stats.page_faults, plain.stats.page_faults)
+        self.assertTrue(controller.engine.page_table.get(0).present)
+        self.assertGreater(reclaimer.stats.activations, 0)
+        self.assertEqual(reclaimer.stats.stall_percentile(0.99), max(reclaimer.stats.stall_scans))
+
+    def test_watermarks_are_validated(self):
+        with self.assertRaises(ValueError):
+            Reclaimer(low_watermark=3, high_watermark=2)
+        with self.assertRaises(ValueError):
+            self.run_with(Reclaimer(low_watermark=2, high_watermark=8))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from simulator import registry
+from simulator.base_policy import ReplacementPolicy
+from simulator.fast_engine import fast_policy_kind
+from simulator.registry import available_policies, create_policy, fastest_engine, get_policy, policy_info
+from simulator.replacement_policies.lru import LRUAlgorithm
+from simulator.simulation_controller import SimulationController
+from simulator.vm_config import VMConfig
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestPolicyRegistry(unittest.TestCase):
+    def test_lists_bundled_policies(self):
+        self.assertEqual(available_policies(), ["fifo", "lru", "optimal"])
+
+    def test_lookup_is_case_insensitive(self):
+        self.assertIs(get_policy("LRU"), LRUAlgorithm)
+        for name in available_policies():
+            self.assertIsInstance(create_policy(name.upper()), ReplacementPolicy)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            get_policy("clock")
+
+    def test_metadata(self):
+        optimal = policy_info("optimal")
+        self.assertEqual(optimal.display_name, "Optimal")
+        self.assertTrue(optimal.needs_future_knowledge)
+        self.assertEqual(optimal.fast_kernel, "optimal")
+        self.assertEqual(optimal.source, "builtin")
+        self.assertFalse(policy_info("lru").needs_future_knowledge)
+        self.assertEqual(fastest_engine("fifo"), "fast")
+        self.assertEqual(fastest_engine("fifo", per_step=True), "reference")
+
+    def test_fast_kernel_is_not_inherited(self):
+        class TweakedLRU(LRUAlgorithm):
+            pass
+        self.assertEqual(fast_policy_kind(LRUAlgorithm()), "lru")
+        self.assertIsNone(fast_policy_kind(TweakedLRU()))
+
+    def test_import_is_cheap(self):
+        # Importing the package must not pull in numpy or any policy module.
+        check = (
+            "import sys, simulator; "
+            "assert 'numpy' not in sys.modules; "
+            "assert not [m for m in sys.modules if m.startswith('simulator.replacement_policies')]"
+        )
+        timings = []
+        for _ in range(3):
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", check],
+                cwd=ROOT, capture_output=True, text=True,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr[-500:])
+            match = re.search(r"\|\s*(\d+) \| simulator$", proc.stderr, re.M)
+            timings.append(int(match.group(1)))
+        self.assertLess(min(timings), 20000)
+
+PLUGIN = textwrap.dedent("""
+    from simulator.base_policy import ReplacementPolicy
+
+    class RecentPolicy(ReplacementPolicy):
+        incremental = True
+
+        def __init__(self):
+            self.last_use = {}
+
+        def on_access(self, frame_index, page, step, fault):
+            self.last_use[frame_index] = step
+
+        def select_victim(self, frames, reference_string, current_index):
+            return min(self.last_use, key=self.last_use.get)
+
+    class FastFIFO(ReplacementPolicy):
+        fast_kernel = "fifo"
+
+        def select_victim(self, frames, reference_string, current_index):
+            raise AssertionError("the fast engine should have been used")
+""")
+
+class TestPolicyPlugins(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        with open(os.path.join(root, "vmsim_test_plugin.py"), "w") as fh:
+            fh.write(PLUGIN)
+        dist_info = os.path.join(root, "vmsim_test_plugin-1.0.dist-info")
+        os.mkdir(dist_info)
+        with open(os.path.join(dist_info, "METADATA"), "w") as fh:
+            fh.write("Metadata-Version: 2.1\nName: vmsim-test-plugin\nVersion: 1.0\n")
+        with open(os.path.join(dist_info, "entry_points.txt"), "w") as fh:
+            fh.write(
+                f"[{registry.ENTRY_POINT_GROUP}]\n"
+                "recent = vmsim_test_plugin:RecentPolicy\n"
+                "fastfifo = vmsim_test_plugin:FastFIFO\n"
+                "lru = vmsim_test_plugin:RecentPolicy\n"
+            )
+        sys.path.insert(0, root)
+        registry.refresh()
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        sys.modules.pop("vmsim_test_plugin", None)
+        registry.refresh()
+        self.tmp.cleanup()
+
+    def test_discovered_through_entry_points(self):
+        self.assertEqual(available_policies(), ["fastfifo", "fifo", "lru", "optimal", "recent"])
+        info = policy_info("Recent")
+        self.assertEqual(info.source, "vmsim-test-plugin")
+        self.assertTrue(info.incremental)
+        self.assertIsNone(info.fast_kernel)
+        # Bundled policies win name clashes.
+        self.assertIs(get_policy("lru"), LRUAlgorithm)
+
+    def test_incremental_policy_matches_lru(self):
+        config = VMConfig(virtual_memory_size=4096, physical_memory_size=48, offset_bits=4)
+        ref = [((p * 7 % 11) * 16, "R") for p in range(200)]
+        plugin = SimulationController(config, ref, create_policy("recent"), tlb_entries=2)
+        plugin.run_all()
+        lru = SimulationController(config, ref, LRUAlgorithm(), tlb_entries=2)
+        lru.run_all()
+        self.assertEqual(plugin.stats.page_faults, lru.stats.page_faults)
+
+    def test_fastest_engine_for_plugin_kernel(self):
+        self.assertEqual(fastest_engine("fastfifo"), "fast")
+        config = VMConfig(virtual_memory_size=4096, physical_memory_size=48, offset_bits=4)
+        ref = [((p * 7 % 11) * 16, "R") for p in range(200)]
+        fast = SimulationController(config, ref, create_policy("fastfifo"), tlb_entries=2, engine_mode="fast")
+        fast.run()
+        fifo = SimulationController(config, ref, create_policy("fifo"), tlb_entries=2)
+        fifo.run_all()
+        self.assertEqual(fast.stats.page_faults, fifo.stats.page_faults)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from simulator.registry import create_policy
+from simulator.results import (
+    DEFAULT_COLUMNS, ColumnarStepWriter, CsvStepWriter, JsonLinesStepWriter, read_manifest, read_step_columns
+)
+from simulator.simulation_controller import SimulationController
+from simulator.trace import OP_WRITE
+from simulator.vm_config import VMConfig
+
+class TestResultWriters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        config = VMConfig(virtual_memory_size=4096, physical_memory_size=48, offset_bits=4)
+        ref = [((p * 7 % 11) * 16, "W" if p % 4 == 0 else "R") for p in range(50)]
+        self.results = SimulationController(config, ref, create_policy("fifo"), tlb_entries=2).run_all()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_columnar_round_trip(self):
+        path = os.path.join(self.tmp.name, "run")
+        with ColumnarStepWriter(path, ["step", "operation", "fault", "evicted_page"]) as writer:
+            for start in range(0, len(self.results), 16):
+                writer.write(self.results[start:start + 16])
+            writer.close({"page_faults": 7})
+
+        self.assertEqual(sorted(os.listdir(path)), ["columns.json", "evicted_page.bin", "fault.bin", "operation.bin", "step.bin"])
+        self.assertEqual(read_manifest(path)["summary"], {"page_faults": 7})
+        columns = read_step_columns(path, ["fault", "evicted_page", "operation"], mmap=True)
+        self.assertEqual(columns["fault"].tolist(), [r.fault for r in self.results])
+        self.assertEqual(columns["evicted_page"].tolist(), [-1 if r.evicted_page is None else r.evicted_page for r in self.results])
+        self.assertEqual(int(columns["operation"][0]), OP_WRITE)
+        self.assertEqual(read_step_columns(path)["step"].tolist(), list(range(len(self.results))))
+        with self.assertRaises(ValueError):
+            read_step_columns(path, ["page"])
+
+    def test_csv_matches_csv_module(self):
+        out = io.StringIO()
+        writer = CsvStepWriter(out, buffer_rows=20)
+        writer.write(self.results[:10])
+        # Buffered until 20 rows are pending.
+        self.assertEqual(out.getvalue(), "")
+        writer.write(self.results[10:])
+        writer.close()
+
+        expected = io.StringIO()
+        reference = csv.writer(expected)
+        reference.writerow(DEFAULT_COLUMNS)
+        for r in self.results:
+            reference.writerow([
+                r.step_index, r.virtual_address, r.operation, r.page, r.offset,
+                r.tlb_hit, r.hit, r.frame_index, r.evicted_page, r.write_back,
+            ])
+        self.assertEqual(out.getvalue(), expected.getvalue())
+
+    def test_json_lines_selected_columns(self):
+        out = io.StringIO()
+        JsonLinesStepWriter(out, ["step", "fault"]).write(self.results)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(rows[3], {"step": 3, "fault": self.results[3].fault})
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            CsvStepWriter(io.StringIO(), ["step", "latency"])
+
+if __name__ == "__main__":
+    unittest.main()
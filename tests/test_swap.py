@@ -0,0 +1,89 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.swap import BackingStore, CompressedCache, SwapSpace, SwapStats, format_swap_stats
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+
+class TestSwapSpace(unittest.TestCase):
+    def test_cluster_allocation(self):
+        swap = SwapSpace(num_slots=8, cluster_size=4)
+        self.assertEqual([swap.allocate() for _ in range(3)], [0, 1, 2])
+        swap.free(1)
+        # The current cluster is filled before the freed hole is reused.
+        self.assertEqual(swap.allocate(), 3)
+        self.assertEqual(swap.allocate(), 4)
+        self.assertEqual([swap.allocate() for _ in range(3)], [5, 6, 7])
+        self.assertEqual(swap.allocate(), 1)
+        with self.assertRaises(RuntimeError):
+            swap.allocate()
+
+    def test_freed_clusters_are_reused(self):
+        swap = SwapSpace(num_slots=16, cluster_size=4)
+        for _ in range(4):
+            slots = [swap.allocate() for _ in range(4)]
+            for slot in slots:
+                swap.free(slot)
+        # Every cluster is whole again, so allocation fills a cluster in
+        # order instead of falling back to the first free slot.
+        self.assertEqual([swap.allocate() for _ in range(2)], [0, 1])
+        swap.free(0)
+        self.assertEqual(swap.allocate(), 2)
+
+    def test_sequential_io_is_cheaper(self):
+        swap = SwapSpace(num_slots=8, seek_time=100, transfer_time=10)
+        stats = SwapStats()
+        self.assertEqual(swap.io(3, stats), 110)
+        self.assertEqual(swap.io(4, stats), 10)
+        self.assertEqual(swap.io(0, stats), 110)
+        self.assertEqual((stats.sequential_ios, stats.random_ios), (1, 2))
+
+    def test_compressed_cache_writes_back_oldest(self):
+        zswap = CompressedCache(max_bytes=64, page_size=64, compression_ratio=2)
+        self.assertEqual(zswap.capacity, 2)
+        self.assertEqual(zswap.store(1), [])
+        self.assertEqual(zswap.store(2), [])
+        self.assertTrue(zswap.load(1))
+        self.assertEqual(zswap.store(3), [2])
+
+class TestEngineSwap(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=1024, physical_memory_size=32, offset_bits=4)
+        # Two frames; pages 0-3 are written, then read back in order.
+        self.ref = [(p * 16, "W") for p in range(4)] + [(p * 16, "R") for p in range(4)]
+
+    def run_with(self, store):
+        controller = SimulationController(self.config, self.ref, FIFOAlgorithm(), tlb_entries=2, backing_store=store)
+        controller.run_all()
+        return controller
+
+    def test_dirty_pages_get_slots(self):
+        store = BackingStore(16, SwapSpace(num_slots=16, cluster_size=4))
+        controller = self.run_with(store)
+        stats = store.stats
+
+        self.assertEqual(stats.pages_written, controller.stats.disk_writes)
+        self.assertEqual(stats.zero_fills, 4)
+        self.assertEqual(stats.pages_read, 4)
+        self.assertEqual(stats.bytes_moved, 16 * (stats.pages_written + stats.pages_read))
+        pte = controller.engine.page_table.get(0)
+        self.assertIsNotNone(pte.swap_slot)
+        self.assertIn("written", format_swap_stats(stats))
+
+    def test_zswap_absorbs_device_io(self):
+        zswap = CompressedCache(max_bytes=1024, page_size=16, compression_ratio=4)
+        store = BackingStore(16, SwapSpace(num_slots=16), zswap=zswap)
+        self.run_with(store)
+        self.assertEqual(store.stats.bytes_moved, 0)
+        self.assertGreater(store.stats.zswap_stores, 0)
+        self.assertEqual(store.stats.zswap_loads, 4)
+
+    def test_reset_starts_over(self):
+        store = BackingStore(16, SwapSpace(num_slots=16))
+        controller = self.run_with(store)
+        first = store.stats
+        controller.reset()
+        controller.run_all()
+        self.assertEqual(store.stats, first)
+
+if __name__ == "__main__":
+    unittest.main()
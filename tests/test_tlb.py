@@ -1,5 +1,8 @@
 import unittest
-from simulator.tlb import TLB
+from simulator.tlb import TLB, TLBHierarchy
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.replacement_policies.lru import LRUAlgorithm
 
 class TestTLB(unittest.TestCase):
     def setUp(self):
@@ -47,5 +50,110 @@ class TestTLB(unittest.TestCase):
         self.assertIsNotNone(self.tlb.lookup(3, 6))
         self.assertIsNotNone(self.tlb.lookup(4, 6))
 
+    def test_invalidate(self):
+        self.tlb.insert(1, 10, current_step=1)
+        self.assertTrue(self.tlb.invalidate(1))
+        self.assertFalse(self.tlb.invalidate(1))
+        self.assertIsNone(self.tlb.lookup(1, 2))
+        self.assertEqual(len(self.tlb), 0)
+
+    def test_invalidate_range(self):
+        tlb = TLB(8)
+        for page in [1, 2, 3, 10, 11]:
+            tlb.insert(page, page, current_step=page)
+        self.assertEqual(tlb.invalidate_range(2, 11), 3)
+        self.assertEqual(sorted(tlb.entries), [1, 11])
+        self.assertEqual(tlb.invalidate_range(0, 1000), 2)
+        self.assertEqual(len(tlb), 0)
+
+class TestSetAssociativeTLB(unittest.TestCase):
+    def setUp(self):
+        self.tlb = TLB(size=4, ways=2)
+
+    def test_invalid_geometry(self):
+        with self.assertRaises(ValueError):
+            TLB(size=6, ways=4)
+
+    def test_pages_map_to_sets(self):
+        for step, page in enumerate([0, 2, 4]):
+            self.tlb.insert(page, page * 10, step)
+        self.tlb.insert(1, 10, 3)
+
+        self.assertIsNone(self.tlb.lookup(0, 4))
+        self.assertEqual(self.tlb.lookup(2, 5), 20)
+        self.assertEqual(self.tlb.lookup(4, 6), 40)
+        self.assertEqual(self.tlb.lookup(1, 7), 10)
+
+    def test_conflict_misses(self):
+        for step, page in enumerate([0, 2, 4]):
+            self.tlb.insert(page, page, step)
+
+        self.tlb.lookup(0, 3)
+        self.assertEqual(self.tlb.stats.misses, 1)
+        self.assertEqual(self.tlb.stats.conflict_misses, 1)
+
+        self.tlb.lookup(6, 4)
+        self.assertEqual(self.tlb.stats.misses, 2)
+        self.assertEqual(self.tlb.stats.conflict_misses, 1)
+
+class TestTLBHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.tlb = TLBHierarchy(
+            l1d=TLB(2, name="L1d", hit_latency=1),
+            l1i=TLB(2, name="L1i", hit_latency=1),
+            l2=TLB(8, ways=2, name="L2", hit_latency=5),
+            walk_latency=20,
+        )
+
+    def test_l2_hit_refills_l1(self):
+        for step, page in enumerate([1, 2, 3]):
+            self.tlb.insert(page, page * 10, step)
+
+        self.assertEqual(self.tlb.lookup(1, 3), 10)
+        self.assertEqual(self.tlb.l1d.stats.misses, 1)
+        self.assertEqual(self.tlb.l2.stats.hits, 1)
+        self.assertEqual(self.tlb.cycles, 6)
+
+        self.assertEqual(self.tlb.lookup(1, 4), 10)
+        self.assertEqual(self.tlb.l1d.stats.hits, 1)
+        self.assertEqual(self.tlb.cycles, 7)
+
+        self.assertIsNone(self.tlb.lookup(9, 5))
+        self.assertEqual(self.tlb.cycles, 7 + 1 + 5 + 20)
+
+    def test_instruction_side(self):
+        self.tlb.insert(7, 70, 0, fetch=True)
+        self.assertIn(7, self.tlb.l1i)
+        self.assertNotIn(7, self.tlb.l1d)
+        self.assertEqual(self.tlb.lookup(7, 1, fetch=True), 70)
+        self.assertTrue(self.tlb.invalidate(7))
+        self.assertNotIn(7, self.tlb)
+
+        self.tlb.insert(8, 80, 2)
+        self.assertEqual(self.tlb.invalidate_range(0, 16), 1)
+        self.assertNotIn(8, self.tlb)
+
+    def test_invalidate_range_counts_pages_once(self):
+        self.tlb.insert(5, 50, 0)
+        self.assertIn(5, self.tlb.l1d)
+        self.assertIn(5, self.tlb.l2)
+        self.assertEqual(self.tlb.invalidate_range(0, 10), 1)
+        self.assertNotIn(5, self.tlb)
+
+    def test_level_stats_in_tracker(self):
+        config = VMConfig(virtual_memory_size=1024, physical_memory_size=64, offset_bits=4)
+        ref = [(p * 16, "R") for p in [0, 1, 2, 0, 3, 1, 0, 2]]
+        controller = SimulationController(
+            config, ref, LRUAlgorithm(), tlb_entries=8,
+            tlb_factory=lambda: TLBHierarchy.from_sizes(l1_entries=2, l1_ways=2, l2_entries=4, l2_ways=2)
+        )
+        controller.run_all()
+
+        levels = controller.stats.tlb_levels
+        self.assertEqual(set(levels), {"L1d", "L2"})
+        self.assertEqual(levels["L1d"].accesses, len(ref))
+        self.assertEqual(levels["L1d"].hits + levels["L2"].hits, controller.stats.tlb_hits)
+        self.assertGreater(controller.stats.translation_cycles, 0)
+
 if __name__ == "__main__":
     unittest.main()
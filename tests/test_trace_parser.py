@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from simulator.trace import Trace
+from simulator.trace_parser import TraceParser, TraceParseJob, parse_trace_file, parse_trace_text
+
+class TestTraceParser(unittest.TestCase):
+    def test_formats_and_hex(self):
+        trace = parse_trace_text("0 R, 4 W; 8:w, 12W,16\n0x1F X # fetch\n  0X20 r\n")
+        self.assertEqual(trace.to_list(), [(0, "R"), (4, "W"), (8, "W"), (12, "W"), (16, "R"), (31, "X"), (32, "R")])
+        self.assertEqual(trace.fetches.tolist(), [False] * 5 + [True, False])
+
+    def test_errors_report_the_line(self):
+        with self.assertRaisesRegex(ValueError, "line 2: invalid access '12Q'"):
+            parse_trace_text("1 R\n12Q\n")
+        with self.assertRaisesRegex(ValueError, "line 1"):
+            parse_trace_text("1 R W")
+        self.assertEqual(len(parse_trace_text(" ,\n# nothing\n")), 0)
+
+    def test_incremental_feed_matches_whole_text(self):
+        text = "".join(f"{i * 7} {'RW'[i % 2]}, # c, d\n" if i % 5 == 0 else f"{hex(i * 7)}{'RWX'[i % 3]},"
+                       for i in range(300))
+        whole = parse_trace_text(text)
+        parser = TraceParser()
+        for start in range(0, len(text), 11):
+            parser.feed(text[start:start + 11])
+        chunked = parser.finish()
+
+        self.assertEqual(parser.count, 300)
+        self.assertEqual(chunked.to_list(), whole.to_list())
+
+    def test_files_and_background_job(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            text_path = os.path.join(tmp, "trace.txt")
+            with open(text_path, "w") as fh:
+                fh.write("\n".join(f"{i} {'RWX'[i % 3]}" for i in range(1000)))
+            seen = []
+            trace = parse_trace_file(text_path, chunk_size=512, progress=lambda done, total: seen.append(done / total))
+            self.assertEqual(len(trace), 1000)
+            self.assertEqual(seen[-1], 1.0)
+
+            binary_path = os.path.join(tmp, "trace.vmt")
+            trace.save(binary_path)
+            self.assertEqual(Trace.load(binary_path).to_list(), trace.to_list())
+
+            job = TraceParseJob(path=binary_path)
+            job.join()
+            self.assertEqual(job.trace.to_list(), trace.to_list())
+
+            job = TraceParseJob(text="1 R, oops", chunk_size=4)
+            job.join()
+            self.assertIsNone(job.trace)
+            self.assertIn("oops", job.error)
+            self.assertEqual(job.progress, 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.replacement_policies.lru import LRUAlgorithm
+from simulator.worker import SimulationWorker
+
+class TestSimulationWorker(unittest.TestCase):
+    def setUp(self):
+        self.config = VMConfig(virtual_memory_size=4096, physical_memory_size=64, offset_bits=4)
+        # Four frames: the first 4 pages fault, then 40 hits, then a new page.
+        self.ref = [(p * 16, "R") for p in range(4)] + [(0, "R")] * 40 + [(200 * 16, "W")] + [(8, "R")] * 20
+
+    def make_worker(self, **kw):
+        controller = SimulationController(self.config, self.ref, LRUAlgorithm(), tlb_entries=2)
+        return SimulationWorker(controller, **kw)
+
+    def finish(self, worker):
+        results = []
+        while True:
+            batch, done = worker.drain()
+            results += batch
+            if done:
+                return results
+
+    def test_fast_forward_matches_stepping(self):
+        worker = self.make_worker(batch_size=7, queue_size=1)
+        worker.fast_forward(30)
+        results = self.finish(worker)
+
+        expected = SimulationController(self.config, self.ref, LRUAlgorithm(), tlb_entries=2).run_all()[:30]
+        self.assertEqual(results, expected)
+        self.assertEqual(worker.controller.engine.current_step, 30)
+
+    def test_run_to_step_and_next_fault(self):
+        worker = self.make_worker(batch_size=8)
+        worker.run_to_step(10)
+        self.assertEqual(len(self.finish(worker)), 10)
+
+        worker.run_to_fault()
+        results = self.finish(worker)
+        self.assertEqual(results[-1].step_index, 44)
+        self.assertTrue(results[-1].fault)
+        self.assertFalse(any(r.fault for r in results[:-1]))
+
+        worker.run_to_fault()
+        self.assertEqual(len(self.finish(worker)), 20)
+        self.assertTrue(worker.controller.is_finished())
+
+    def test_cancel_returns_undrained_results(self):
+        worker = self.make_worker(batch_size=1, queue_size=2)
+        worker.fast_forward(50)
+        results = worker.cancel()
+
+        self.assertFalse(worker.busy)
+        self.assertEqual(len(results), worker.controller.engine.current_step)
+        self.assertLess(len(results), 50)
+
+if __name__ == "__main__":
+    unittest.main()
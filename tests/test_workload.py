@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from simulator.trace import Trace
+from simulator.workload import (
+    LoopWorkload,
+    MixtureWorkload,
+    SequentialWorkload,
+    StridedWorkload,
+    WorkingSetWorkload,
+    ZipfWorkload,
+    generate_trace,
+    iter_chunks,
+    write_trace_file,
+)
+from simulator.vm_config import VMConfig
+from simulator.simulation_controller import SimulationController
+from simulator.replacement_policies.fifo import FIFOAlgorithm
+
+class TestWorkload(unittest.TestCase):
+    def test_seed_reproducible(self):
+        a = generate_trace(ZipfWorkload(1000, alpha=1.2), 5000, page_size=16, seed=7)
+        b = generate_trace(ZipfWorkload(1000, alpha=1.2), 5000, page_size=16, seed=7)
+        np.testing.assert_array_equal(a.addresses, b.addresses)
+        np.testing.assert_array_equal(a.writes, b.writes)
+
+    def test_zipf_skew(self):
+        trace = generate_trace(ZipfWorkload(1000, alpha=1.2), 20000, page_size=16, seed=1)
+        pages = trace.pages(4)
+        self.assertTrue((pages < 1000).all())
+        self.assertGreater(np.count_nonzero(pages == 0), np.count_nonzero(pages == 500))
+
+    def test_sequential_strided_loop(self):
+        seq = generate_trace(SequentialWorkload(4, accesses_per_page=2), 10, page_size=16, seed=0)
+        self.assertEqual(seq.pages(4).tolist(), [0, 0, 1, 1, 2, 2, 3, 3, 0, 0])
+
+        strided = generate_trace(StridedWorkload(10, stride=3), 5, page_size=16, seed=0)
+        self.assertEqual(strided.pages(4).tolist(), [0, 3, 6, 9, 2])
+
+        loop = generate_trace(LoopWorkload([5, 7, 9]), 7, page_size=16, seed=0)
+        self.assertEqual(loop.pages(4).tolist(), [5, 7, 9, 5, 7, 9, 5])
+
+    def test_working_set_drifts(self):
+        workload = WorkingSetWorkload(1000, working_set_size=8, phase_length=100, drift=50, locality=1.0)
+        pages = generate_trace(workload, 300, page_size=16, seed=3).pages(4)
+        self.assertTrue(((pages[:100] >= 0) & (pages[:100] < 8)).all())
+        self.assertTrue(((pages[200:] >= 100) & (pages[200:] < 108)).all())
+
+    def test_write_ratio(self):
+        trace = generate_trace(ZipfWorkload(100, write_ratio=0.0), 1000, page_size=16, seed=0)
+        self.assertFalse(trace.writes.any())
+        trace = generate_trace(SequentialWorkload(100, write_ratio=1.0), 1000, page_size=16, seed=0)
+        self.assertTrue(trace.writes.all())
+
+    def test_mixture_streams_in_chunks(self):
+        mixture = MixtureWorkload([
+            (SequentialWorkload(50, base_page=0), 1.0),
+            (ZipfWorkload(50, base_page=1000), 1.0),
+        ], burst=4)
+        chunks = list(iter_chunks(mixture, 1000, page_size=16, seed=2, chunk_size=300))
+        self.assertEqual([len(a) for a, _ in chunks], [300, 300, 300, 100])
+        pages = np.concatenate([a for a, _ in chunks]) >> np.uint64(4)
+        scan = pages[pages < 1000]
+        self.assertEqual(scan[:10].tolist(), list(range(10)))
+
+    def test_write_trace_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.bin")
+            count = write_trace_file(path, ZipfWorkload(100), 2500, page_size=16, seed=4, chunk_size=1000)
+            self.assertEqual(count, 2500)
+            loaded = Trace.load(path)
+            expected = generate_trace(ZipfWorkload(100), 2500, page_size=16, seed=4, chunk_size=1000)
+            np.testing.assert_array_equal(loaded.addresses, expected.addresses)
+            np.testing.assert_array_equal(loaded.writes, expected.writes)
+
+    def test_trace_drives_engine(self):
+        config = VMConfig(virtual_memory_size=4096, physical_memory_size=64, offset_bits=4)
+        trace = generate_trace(ZipfWorkload(32), 200, page_size=config.page_size, seed=5)
+        from_trace = SimulationController(config, trace, FIFOAlgorithm(), tlb_entries=4)
+        from_list = SimulationController(config, trace.to_list(), FIFOAlgorithm(), tlb_entries=4)
+        from_trace.run_all()
+        from_list.run_all()
+        self.assertEqual(from_trace.stats.page_faults, from_list.stats.page_faults)
+        self.assertEqual(from_trace.stats.tlb_hits, from_list.stats.tlb_hits)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,15 @@
 import pygame
-import sys
 import os
-from typing import Dict, Optional
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
+from collections import OrderedDict
+from typing import Dict, List, Optional
 
+from simulator.registry import available_policies, create_policy, policy_info
 from simulator.vm_config import VMConfig
 from simulator.simulation_controller import SimulationController
-from simulator.replacement_policies.lru import LRUAlgorithm
-from simulator.replacement_policies.fifo import FIFOAlgorithm
-from simulator.replacement_policies.optimal import OptimalAlgorithm
 from simulator.simulation_step_result import SimulationStepResult
+from simulator.worker import SimulationWorker
+from simulator.activity import FrameActivity, RateTimeline
+from simulator.trace_parser import TraceParseJob, parse_trace_text
 
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -36,14 +32,61 @@ CONFIG_PANEL_H = 180
 CONTENT_TOP = CONFIG_PANEL_Y + CONFIG_PANEL_H + 20
 BUTTON_AREA_Y = WINDOW_HEIGHT - 70
 
+# Longer reference strings, and trace files, are parsed on a background thread.
+BACKGROUND_PARSE_CHARS = 100_000
+
 FONT_MAIN = None
 FONT_HEADER = None
 FONT_SMALL = None
 FONT_LARGE = None
 
+PANELS = ("header", "config", "tlb", "page_table", "stats", "memory")
+# Panels whose contents change after a simulation step.
+STEP_PANELS = ("header", "tlb", "page_table", "stats", "memory")
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, font, color)."""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, color):
+        key = (text, font, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color):
+    return TEXT_CACHE.render(font, text, color)
+
+
 def init_fonts():
     global FONT_MAIN, FONT_HEADER, FONT_SMALL, FONT_LARGE
     pygame.font.init()
+    TEXT_CACHE.clear()
     available_fonts = pygame.font.get_fonts()
     font_name = "segoeui" if "segoeui" in available_fonts else None
     
@@ -64,7 +107,7 @@ class Button:
         pygame.draw.rect(surface, color, self.rect, border_radius=8)
         pygame.draw.rect(surface, (255, 255, 255), self.rect, 1, border_radius=8)
         
-        text_surf = FONT_MAIN.render(self.text, True, COLOR_TEXT_MAIN)
+        text_surf = render_text(FONT_MAIN, self.text, COLOR_TEXT_MAIN)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -85,7 +128,7 @@ class TextInput:
         self.numeric = numeric
 
     def draw(self, surface):
-        label_surf = FONT_SMALL.render(self.label, True, COLOR_TEXT_DIM)
+        label_surf = render_text(FONT_SMALL, self.label, COLOR_TEXT_DIM)
         surface.blit(label_surf, (self.rect.x, self.rect.y - 24))
 
         pygame.draw.rect(surface, COLOR_BORDER, self.rect, 2 if self.active else 1, border_radius=6)
@@ -97,7 +140,7 @@ class TextInput:
 
         txt = self.text if self.text else self.placeholder
         color = COLOR_TEXT_MAIN if self.text else COLOR_TEXT_DIM
-        text_surf = FONT_MAIN.render(txt, True, color)
+        text_surf = render_text(FONT_MAIN, txt, color)
         text_rect = text_surf.get_rect(midleft=(self.rect.x + 8, self.rect.centery))
         surface.blit(text_surf, text_rect)
 
@@ -130,7 +173,7 @@ class Dropdown:
         return self.options[self.selected_index] if self.options else None
 
     def draw(self, surface):
-        label_surf = FONT_SMALL.render(self.label, True, COLOR_TEXT_DIM)
+        label_surf = render_text(FONT_SMALL, self.label, COLOR_TEXT_DIM)
         surface.blit(label_surf, (self.rect.x, self.rect.y - 24))
 
         pygame.draw.rect(surface, COLOR_BORDER, self.rect, 2 if self.active else 1, border_radius=6)
@@ -139,7 +182,7 @@ class Dropdown:
 
         txt = self.selected_option
         color = COLOR_TEXT_MAIN
-        text_surf = FONT_MAIN.render(txt, True, color)
+        text_surf = render_text(FONT_MAIN, txt, color)
         text_rect = text_surf.get_rect(midleft=(self.rect.x + 8, self.rect.centery))
         surface.blit(text_surf, text_rect)
         
@@ -164,7 +207,7 @@ class Dropdown:
             if opt_rect.collidepoint(mouse_pos):
                 pygame.draw.rect(surface, (60, 60, 60), opt_rect)
                 
-            txt_surf = FONT_MAIN.render(option, True, COLOR_TEXT_MAIN)
+            txt_surf = render_text(FONT_MAIN, option, COLOR_TEXT_MAIN)
             txt_rect = txt_surf.get_rect(midleft=(opt_rect.x + 8, opt_rect.centery))
             surface.blit(txt_surf, txt_rect)
 
@@ -193,8 +236,8 @@ class Dropdown:
 
 class MemoryVisualizer:
     def __init__(self):
-        pygame.init()
-        init_fonts()
+        # Only the display is needed up front; fonts are loaded on the first draw.
+        pygame.display.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Virtual Memory Simulator")
         self.clock = pygame.time.Clock()
@@ -218,10 +261,11 @@ class MemoryVisualizer:
         }
         self.tlb_entries = 10
 
-        self.policy = LRUAlgorithm()
+        self.policy = create_policy("lru")
         self.controller = SimulationController(
             self.vm_config, self.reference_string, self.policy, tlb_entries=self.tlb_entries
         )
+        self.worker = SimulationWorker(self.controller)
         self.last_step_result: Optional[SimulationStepResult] = None
         self.auto_run = False
         self.auto_run_delay = 500
@@ -229,10 +273,16 @@ class MemoryVisualizer:
         self.simulation_finished = False
         self.info_message = ""
         self.page_writes: Dict[int, Dict[str, int]] = {}
+        self.parse_job: Optional[TraceParseJob] = None
+        self.pending_inputs = None
+        self.activity = FrameActivity(self.vm_config.num_frames)
+        self.timeline = RateTimeline()
+        self.dirty = set(PANELS)
 
         self.input_fields = self.build_input_fields()
-        
 
+    def mark_dirty(self, *panels):
+        self.dirty.update(panels or PANELS)
 
     def build_input_fields(self):
         start_y = 125 
@@ -247,9 +297,15 @@ class MemoryVisualizer:
             "offset": TextInput(x, start_y + spacing * 2, width, height, "Offset Bits", self.vm_config.offset_bits, numeric=True),
             "tlb_entries": TextInput(x, start_y + spacing * 3, width, height, "TLB Entries", self.tlb_entries, numeric=True),
             "reference": TextInput(x, start_y + spacing * 5, width, height, "Reference String", self.default_reference_text, placeholder="120 R, ..."),
+            # N for the fast-forward / run-to buttons next to it.
+            "batch_steps": TextInput(x, start_y + spacing * 6, 60, height, "", 1000, numeric=True),
         }
         
-        self.policy_dropdown = Dropdown(x, start_y + spacing * 4, width, height, "Policy", ["LRU", "FIFO", "Optimal"], 0)
+        self.policy_names = available_policies()
+        self.policy_dropdown = Dropdown(
+            x, start_y + spacing * 4, width, height, "Policy",
+            [policy_info(name).display_name for name in self.policy_names], self.policy_names.index("lru")
+        )
         
         btn_y = start_y + spacing * 5 + 10
         self.submit_button = Button(x, btn_y, 105, 30, "Submit", self.apply_inputs)
@@ -261,7 +317,10 @@ class MemoryVisualizer:
         self.buttons = [
             Button(x, ctrl_y, 105, 35, "Next Step", self.next_step),
             Button(x + 115, ctrl_y, 105, 35, "Auto Run", self.toggle_auto),
-            Button(x, ctrl_y + 45, width, 30, "Reset Sim", self.reset_sim),
+            Button(x, ctrl_y + 45, 105, 30, "Reset Sim", self.reset_sim),
+            Button(x + 115, ctrl_y + 45, 105, 30, "Next Fault", self.run_to_fault),
+            Button(x + 70, ctrl_y + 85, 70, 30, "FF +N", self.fast_forward),
+            Button(x + 150, ctrl_y + 85, 70, 30, "Run to N", self.run_to_step),
         ]
         
         return fields
@@ -269,37 +328,10 @@ class MemoryVisualizer:
     def parse_reference_string(self, text: str):
         if not text.strip():
             raise ValueError("Reference string is empty.")
-
-        cleaned = text.replace(";", ",")
-        pairs = []
-        for raw in cleaned.split(","):
-            token = raw.strip()
-            if not token:
-                continue
-            if token.isdigit():
-                addr_str = token
-                op = "R"
-            elif " " in token:
-                parts = token.split()
-                if len(parts) != 2:
-                    raise ValueError(f"Invalid token '{token}'. Use 'addr op'.")
-                addr_str, op = parts
-            elif ":" in token:
-                addr_str, op = token.split(":")
-            else:
-                addr_str, op = token[:-1], token[-1]
-
-            if not addr_str.isdigit():
-                raise ValueError(f"Address '{addr_str}' is not a number.")
-            addr = int(addr_str)
-            op = op.upper()
-            if op not in ("R", "W"):
-                raise ValueError(f"Operation must be R or W, got '{op}'.")
-            pairs.append((addr, op))
-
-        if not pairs:
+        trace = parse_trace_text(text)
+        if not len(trace):
             raise ValueError("Reference string is empty after parsing.")
-        return pairs
+        return trace
 
     def apply_inputs(self):
         try:
@@ -307,8 +339,6 @@ class MemoryVisualizer:
             physical_size = int(self.input_fields["physical"].text or 0)
             offset_bits = int(self.input_fields["offset"].text or 0)
             tlb_entries = int(self.input_fields["tlb_entries"].text or 0)
-            reference_string = self.parse_reference_string(self.input_fields["reference"].text)
-
             if tlb_entries <= 0:
                 raise ValueError("TLB entries must be positive.")
 
@@ -325,39 +355,72 @@ class MemoryVisualizer:
             if physical_size > virtual_size:
                 raise ValueError("Physical memory cannot exceed virtual memory.")
 
-            self.vm_config = VMConfig(
+            vm_config = VMConfig(
                 virtual_memory_size=virtual_size,
                 physical_memory_size=physical_size,
                 offset_bits=offset_bits
             )
-            self.reference_string = reference_string
-            self.tlb_entries = tlb_entries
-            
-            p_name = self.policy_dropdown.selected_option
-            if p_name == "FIFO":
-                self.policy = FIFOAlgorithm()
-            elif p_name == "Optimal":
-                self.policy = OptimalAlgorithm()
-            else:
-                self.policy = LRUAlgorithm()
-            
-            self.build_controller()
-            self.info_message = "Applied inputs."
+
+            policy = create_policy(self.policy_names[self.policy_dropdown.selected_index])
+
+            source = self.input_fields["reference"].text.strip()
+            if os.path.isfile(source) or len(source) > BACKGROUND_PARSE_CHARS:
+                if os.path.isfile(source):
+                    self.parse_job = TraceParseJob(path=source)
+                else:
+                    self.parse_job = TraceParseJob(text=source)
+                self.pending_inputs = (vm_config, tlb_entries, policy)
+                self.info_message = "Parsing reference string..."
+                self.mark_dirty("header")
+                return
+
+            reference_string = self.parse_reference_string(source)
+            self.commit_inputs(vm_config, tlb_entries, policy, reference_string)
         except ValueError as e:
             self.info_message = f"Input error: {e}"
 
+    def commit_inputs(self, vm_config, tlb_entries, policy, reference_string):
+        self.vm_config = vm_config
+        self.reference_string = reference_string
+        self.tlb_entries = tlb_entries
+        self.policy = policy
+        self.build_controller()
+        self.info_message = "Applied inputs."
+
+    def poll_parse_job(self):
+        job = self.parse_job
+        if job is None:
+            return
+        if not job.done:
+            self.mark_dirty("header")
+            return
+
+        self.parse_job = None
+        self.mark_dirty("header")
+        if job.error:
+            self.info_message = f"Input error: {job.error}"
+        elif not len(job.trace):
+            self.info_message = "Input error: Reference string is empty after parsing."
+        else:
+            self.commit_inputs(*self.pending_inputs, job.trace)
+
     def build_controller(self):
         if not hasattr(self, 'policy'):
-             self.policy = LRUAlgorithm()
-             
+             self.policy = create_policy("lru")
+
+        self.worker.cancel()
         self.controller = SimulationController(
             self.vm_config, self.reference_string, self.policy, tlb_entries=self.tlb_entries
         )
+        self.worker = SimulationWorker(self.controller)
         self.last_step_result = None
         self.simulation_finished = False
         self.auto_run = False
         self.last_step_time = 0
         self.page_writes = {}
+        self.activity = FrameActivity(self.vm_config.num_frames)
+        self.timeline = RateTimeline()
+        self.mark_dirty()
 
     def reset_defaults(self):
         self.input_fields["virtual"].text = str(self.default_config["virtual"])
@@ -373,12 +436,60 @@ class MemoryVisualizer:
         self.info_message = "Simulation reset."
 
     def next_step(self):
+        if self.worker.busy:
+            return
         if not self.controller.is_finished():
             self.last_step_result = self.controller.step()
-            self.record_write(self.last_step_result)
+            self.track_result(self.last_step_result)
+            self.mark_dirty(*STEP_PANELS)
         else:
             self.simulation_finished = True
             self.auto_run = False
+            self.mark_dirty("header", "config")
+
+    def batch_steps(self):
+        return int(self.input_fields["batch_steps"].text or 0)
+
+    def start_batch(self, job, *args):
+        if self.worker.busy:
+            return
+        self.auto_run = False
+        job(*args)
+        self.mark_dirty("header", "config")
+
+    def fast_forward(self):
+        self.start_batch(self.worker.fast_forward, self.batch_steps())
+
+    def run_to_step(self):
+        self.start_batch(self.worker.run_to_step, self.batch_steps())
+
+    def run_to_fault(self):
+        if self.worker.busy:
+            self.apply_results(self.worker.cancel())
+            self.mark_dirty("header", "config")
+            return
+        self.start_batch(self.worker.run_to_fault)
+
+    def apply_results(self, results):
+        for result in results:
+            self.track_result(result)
+        if results:
+            self.last_step_result = results[-1]
+            self.mark_dirty(*STEP_PANELS)
+        if self.controller.is_finished():
+            self.simulation_finished = True
+
+    def poll_worker(self):
+        """Apply whatever the worker published since the last frame."""
+        results, job_done = self.worker.drain()
+        self.apply_results(results)
+        if job_done:
+            self.mark_dirty("header", "config")
+
+    def track_result(self, result: SimulationStepResult):
+        self.record_write(result)
+        self.activity.record(result)
+        self.timeline.record(result)
 
     def record_write(self, result: Optional[SimulationStepResult]):
         if result and result.operation == "W" and result.frame_index is not None:
@@ -414,6 +525,34 @@ class MemoryVisualizer:
 
     def toggle_auto(self):
         self.auto_run = not self.auto_run
+        self.mark_dirty("header", "config")
+
+    def config_state(self):
+        dropdown = self.policy_dropdown
+        return (
+            tuple(btn.hovered for btn in self.buttons + [self.submit_button, self.default_button, self.random_button]),
+            tuple((field.text, field.active) for field in self.input_fields.values()),
+            (dropdown.selected_index, dropdown.is_open, dropdown.active),
+            self.worker.busy,
+            # The open option list highlights the option under the mouse.
+            pygame.mouse.get_pos() if dropdown.is_open else None,
+        )
+
+    def handle_event(self, event):
+        if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.mark_dirty()
+            return
+
+        before = self.config_state()
+        for btn in self.buttons + [self.submit_button, self.default_button, self.random_button]:
+            btn.handle_event(event)
+
+        if not self.policy_dropdown.handle_event(event):
+            for field in self.input_fields.values():
+                field.handle_event(event)
+
+        if self.config_state() != before:
+            self.mark_dirty("config")
 
     def run(self):
         running = True
@@ -423,22 +562,19 @@ class MemoryVisualizer:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-                for btn in self.buttons + [self.submit_button, self.default_button, self.random_button]:
-                    btn.handle_event(event)
-                
-                if self.policy_dropdown.handle_event(event):
-                    continue
-
-                for field in self.input_fields.values():
-                    field.handle_event(event)
+                self.handle_event(event)
 
             if self.auto_run and not self.simulation_finished:
                 if current_time - self.last_step_time > self.auto_run_delay:
                     self.next_step()
                     self.last_step_time = current_time
 
-            self.draw()
-            pygame.display.flip()
+            self.poll_worker()
+            self.poll_parse_job()
+            with self.worker.lock:
+                rects = self.draw()
+            if rects:
+                pygame.display.update(rects)
             self.clock.tick(FPS)
 
         pygame.quit()
@@ -447,7 +583,7 @@ class MemoryVisualizer:
         header_h = 60
         gap = 12
 
-        row2_h = 500
+        row2_h = 530
         
         row2_y = header_h + gap
 
@@ -483,6 +619,20 @@ class MemoryVisualizer:
             "bottom_split_w": bottom_split_w,
         }
 
+    def panel_rects(self, layout):
+        row2_y, row2_h = layout["row2_y"], layout["row2_h"]
+        row3_y, row3_h = layout["row3_y"], layout["row3_h"]
+        bottom_split_w = layout["bottom_split_w"]
+        return {
+            # The header's bottom border is 2px wide.
+            "header": pygame.Rect(0, 0, WINDOW_WIDTH, layout["header_h"] + 2),
+            "config": pygame.Rect(layout["col1_x"], row2_y, layout["col1_w"], row2_h),
+            "tlb": pygame.Rect(layout["col2_x"], row2_y, layout["col2_w"], row2_h),
+            "page_table": pygame.Rect(layout["col3_x"], row2_y, layout["col3_w"], row2_h),
+            "stats": pygame.Rect(20, row3_y, bottom_split_w, row3_h),
+            "memory": pygame.Rect(20 + bottom_split_w + layout["gap"], row3_y, bottom_split_w, row3_h),
+        }
+
     def apply_layout(self, layout):
         base_x = layout["col1_x"] + 14
         base_y = layout["row2_y"] + 70
@@ -520,61 +670,79 @@ class MemoryVisualizer:
         self.buttons[1].rect.update(base_x + half_w + gap_small, btn_y, half_w, btn_h)
         
         btn_y += btn_h + 6
-        self.buttons[2].rect.update(base_x, btn_y, field_w, btn_h)
+        self.buttons[2].rect.update(base_x, btn_y, half_w, btn_h)
+        self.buttons[3].rect.update(base_x + half_w + gap_small, btn_y, half_w, btn_h)
 
-    def draw(self):
-        self.screen.fill(COLOR_BG)
-        self.draw_header()
+        btn_y += btn_h + 6
+        steps_w = 60
+        batch_w = (field_w - steps_w - 2 * gap_small) // 2
+        self.input_fields["batch_steps"].rect.update(base_x, btn_y, steps_w, btn_h)
+        self.buttons[4].rect.update(base_x + steps_w + gap_small, btn_y, batch_w, btn_h)
+        self.buttons[5].rect.update(base_x + steps_w + batch_w + 2 * gap_small, btn_y, batch_w, btn_h)
+
+    def draw(self) -> List[pygame.Rect]:
+        """Redraw the dirty panels and return the screen areas that changed."""
+        if not self.dirty:
+            return []
+        if FONT_MAIN is None:
+            init_fonts()
 
         layout = self.compute_layout()
-        self.apply_layout(layout)
-        self.inst_section_height = 200
-
-        row2_y = layout["row2_y"]
-        row2_h = layout["row2_h"]
-        gap = layout["gap"]
-        col1_x = layout["col1_x"]
-        col1_w = layout["col1_w"]
-        col2_x = layout["col2_x"]
-        col2_w = layout["col2_w"]
-        col3_x = layout["col3_x"]
-        col3_w = layout["col3_w"]
-        row3_y = layout["row3_y"]
-        row3_h = layout["row3_h"]
-        bottom_split_w = layout["bottom_split_w"]
+        rects = self.panel_rects(layout)
+        full = self.dirty.issuperset(PANELS)
+        if full:
+            self.screen.fill(COLOR_BG)
+            self.apply_layout(layout)
+
+        updated = []
+        for name in PANELS:
+            if name not in self.dirty:
+                continue
+            rect = rects[name]
+            if not full:
+                self.screen.fill(COLOR_BG, rect)
+            if name == "header":
+                self.draw_header()
+            elif name == "config":
+                self.draw_config_panel(*rect)
+            elif name == "tlb":
+                self.draw_tlb_view(*rect)
+            elif name == "page_table":
+                self.draw_virtual_memory_view(*rect)
+            elif name == "stats":
+                self.draw_stats_panel(*rect)
+            else:
+                self.draw_memory_view(*rect)
+            updated.append(rect)
+
+        self.dirty.clear()
+        return [self.screen.get_rect()] if full else updated
+
+    def draw_config_panel(self, x, y, w, h):
+        self.draw_panel_rect(x, y, w, h, "Configuration")
 
-        self.draw_panel_rect(col1_x, row2_y, col1_w, row2_h, "Configuration")
-        
         for field in self.input_fields.values():
             field.draw(self.screen)
-        
+
         self.policy_dropdown.draw(self.screen)
-        
+
         self.submit_button.draw(self.screen)
         self.default_button.draw(self.screen)
         self.random_button.draw(self.screen)
         for btn in self.buttons:
             if btn.action == self.toggle_auto:
                 btn.text = "Stop Auto" if self.auto_run else "Auto Run"
+            elif btn.action == self.run_to_fault:
+                btn.text = "Stop" if self.worker.busy else "Next Fault"
             btn.draw(self.screen)
 
-        self.draw_tlb_view(col2_x, row2_y, col2_w, row2_h)
-        
-        self.draw_virtual_memory_view(col3_x, row2_y, col3_w, row2_h)
-        
-        
-        self.draw_stats_panel(20, row3_y, bottom_split_w, row3_h)
-        
-        pm_x = 20 + bottom_split_w + gap
-        self.draw_memory_view(pm_x, row3_y, bottom_split_w, row3_h)
-
         self.policy_dropdown.draw_list(self.screen)
 
     def draw_instruction_breakdown(self, x, y, w, h):
         self.draw_panel_rect(x, y, w, h, "Address Breakdown")
         
         if not self.last_step_result:
-             msg = FONT_MAIN.render("Waiting for step...", True, COLOR_TEXT_DIM)
+             msg = render_text(FONT_MAIN, "Waiting for step...", COLOR_TEXT_DIM)
              self.screen.blit(msg, (x + 20, y + 60))
              return
 
@@ -592,7 +760,7 @@ class MemoryVisualizer:
         pygame.draw.rect(self.screen, COLOR_PANEL, va_rect, border_radius=6)
         pygame.draw.rect(self.screen, COLOR_HIGHLIGHT, va_rect, 1, border_radius=6)
         
-        va_txt = FONT_MAIN.render(f"VA: {va_val}", True, COLOR_TEXT_MAIN)
+        va_txt = render_text(FONT_MAIN, f"VA: {va_val}", COLOR_TEXT_MAIN)
         self.screen.blit(va_txt, va_txt.get_rect(center=va_rect.center))
         
         pygame.draw.line(self.screen, COLOR_TEXT_DIM, (cx, cy + 16), (cx - 50, cy + 52), 2)
@@ -607,8 +775,8 @@ class MemoryVisualizer:
         pygame.draw.rect(self.screen, (60, 60, 80), p_rect, border_radius=6)
         pygame.draw.rect(self.screen, (60, 80, 60), o_rect, border_radius=6)
         
-        p_txt = FONT_SMALL.render(f"Page {page}", True, COLOR_TEXT_MAIN)
-        o_txt = FONT_SMALL.render(f"Off {offset}", True, COLOR_TEXT_MAIN)
+        p_txt = render_text(FONT_SMALL, f"Page {page}", COLOR_TEXT_MAIN)
+        o_txt = render_text(FONT_SMALL, f"Off {offset}", COLOR_TEXT_MAIN)
         
         self.screen.blit(p_txt, p_txt.get_rect(center=p_rect.center))
         self.screen.blit(o_txt, o_txt.get_rect(center=o_rect.center))
@@ -621,7 +789,7 @@ class MemoryVisualizer:
         op_rect.center = (cx, target_bottom)
         pygame.draw.rect(self.screen, COLOR_BG, op_rect, border_radius=6)
         
-        op_surf = FONT_LARGE.render(op_text, True, op_col)
+        op_surf = render_text(FONT_LARGE, op_text, op_col)
         self.screen.blit(op_surf, op_surf.get_rect(center=op_rect.center))
 
     def draw_panel_rect(self, x, y, w, h, title):
@@ -629,7 +797,7 @@ class MemoryVisualizer:
         pygame.draw.rect(self.screen, COLOR_PANEL, rect, border_radius=12)
         pygame.draw.rect(self.screen, COLOR_BORDER, rect, 2, border_radius=12)
         
-        title_surf = FONT_HEADER.render(title, True, COLOR_ACCENT)
+        title_surf = render_text(FONT_HEADER, title, COLOR_ACCENT)
         self.screen.blit(title_surf, (x + 15, y + 10))
         return rect
 
@@ -638,10 +806,10 @@ class MemoryVisualizer:
         pygame.draw.rect(self.screen, (25, 25, 25), header_rect)
         pygame.draw.line(self.screen, COLOR_BORDER, (0, 60), (WINDOW_WIDTH, 60), 2)
         
-        title = FONT_HEADER.render("Virtual Memory Simulator", True, COLOR_TEXT_MAIN)
+        title = render_text(FONT_HEADER, "Virtual Memory Simulator", COLOR_TEXT_MAIN)
         self.screen.blit(title, (20, 10))
         
-        step_txt = FONT_MAIN.render(f"Step: {self.controller.engine.current_step}", True, COLOR_TEXT_DIM)
+        step_txt = render_text(FONT_MAIN, f"Step: {self.controller.engine.current_step}", COLOR_TEXT_DIM)
         self.screen.blit(step_txt, (500, 20))
         
         status_rect = pygame.Rect(650, 10, 200, 40)
@@ -662,15 +830,17 @@ class MemoryVisualizer:
                 
         if status_msg != "READY":
              pygame.draw.rect(self.screen, status_col, status_rect, border_radius=20)
-             stat_txt = FONT_LARGE.render(status_msg, True, (255, 255, 255))
+             stat_txt = render_text(FONT_LARGE, status_msg, (255, 255, 255))
              rect = stat_txt.get_rect(center=status_rect.center)
              self.screen.blit(stat_txt, rect)
              
         r_status = "IDLE"
-        if self.auto_run: r_status = "RUNNING >>"
+        if self.parse_job is not None: r_status = f"PARSING {self.parse_job.progress:.0%}"
+        elif self.auto_run: r_status = "RUNNING >>"
+        elif self.worker.busy: r_status = "BATCH >>"
         elif self.simulation_finished: r_status = "FINISHED"
         
-        s_surf = FONT_MAIN.render(r_status, True, COLOR_HIGHLIGHT if self.auto_run else COLOR_TEXT_DIM)
+        s_surf = render_text(FONT_MAIN, r_status, COLOR_HIGHLIGHT if self.auto_run or self.worker.busy else COLOR_TEXT_DIM)
         self.screen.blit(s_surf, (WINDOW_WIDTH - 150, 20))
 
     def draw_memory_view(self, x, y, w, h):
@@ -689,6 +859,11 @@ class MemoryVisualizer:
         cell_h = min(60, available_h // rows) if rows > 0 else 60
         cell_h = max(40, cell_h)
 
+        if 70 + rows * cell_h > h:
+            self.draw_memory_heatmap(x, y, w, h)
+            self.screen.set_clip(old_clip)
+            return
+
         for i, frame in enumerate(frames):
             col = i % cols
             row = i // cols
@@ -720,11 +895,11 @@ class MemoryVisualizer:
             pygame.draw.rect(self.screen, color, frame_rect, border_radius=6)
             pygame.draw.rect(self.screen, COLOR_BORDER, frame_rect, 1, border_radius=6)
             
-            id_text = FONT_SMALL.render(f"F{i}", True, COLOR_TEXT_DIM)
+            id_text = render_text(FONT_SMALL, f"F{i}", COLOR_TEXT_DIM)
             self.screen.blit(id_text, (cx + 8, cy + 6))
             
             if not frame.is_free:
-                content_text = FONT_MAIN.render(f"Pg {frame.page}", True, COLOR_TEXT_MAIN)
+                content_text = render_text(FONT_MAIN, f"Pg {frame.page}", COLOR_TEXT_MAIN)
                 rect = content_text.get_rect(center=frame_rect.center)
                 self.screen.blit(content_text, rect)
             else:
@@ -732,18 +907,50 @@ class MemoryVisualizer:
         
         self.screen.set_clip(old_clip)
 
+    def draw_memory_heatmap(self, x, y, w, h):
+        """Scalable view for frame counts that don't fit as cells."""
+        map_rect = pygame.Rect(x + 15, y + 50, (w - 45) * 3 // 5, h - 80)
+        grid, per_cell = self.activity.heatmap(map_rect.w, map_rect.h)
+        cols, rows = grid.shape[:2]
+        scale = max(1, min(map_rect.w // cols, map_rect.h // rows))
+        surf = pygame.surfarray.make_surface(grid)
+        if scale > 1:
+            surf = pygame.transform.scale(surf, (cols * scale, rows * scale))
+        self.screen.blit(surf, map_rect.topleft)
+
+        caption = f"{len(self.activity)} frames, {per_cell}/px | R dirty G freq B recent"
+        self.screen.blit(render_text(FONT_SMALL, caption, COLOR_TEXT_DIM), (map_rect.x, map_rect.bottom + 8))
+
+        spark_rect = pygame.Rect(map_rect.right + 15, map_rect.y + 20, x + w - map_rect.right - 30, map_rect.h - 20)
+        pygame.draw.rect(self.screen, (40, 40, 40), spark_rect, border_radius=4)
+        faults, tlb_hits = self.timeline.points()
+        for values, color in ((tlb_hits, COLOR_GREEN), (faults, COLOR_ACCENT)):
+            if len(values) < 2:
+                continue
+            # points() adds the window in progress to up to maxlen full ones.
+            step_x = spark_rect.w / self.timeline.fault_rates.maxlen
+            points = [
+                (spark_rect.x + i * step_x, spark_rect.bottom - 1 - v * (spark_rect.h - 2))
+                for i, v in enumerate(values)
+            ]
+            pygame.draw.lines(self.screen, color, False, points, 2)
+
+        label = "fault / TLB hit rate"
+        if faults:
+            label = f"fault {faults[-1]:.0%} | TLB hit {tlb_hits[-1]:.0%}"
+        self.screen.blit(render_text(FONT_SMALL, label, COLOR_TEXT_DIM), (spark_rect.x, map_rect.y))
+
     def draw_virtual_memory_view(self, x, y, w, h):
         self.draw_panel_rect(x, y, w, h, "Page Table")
-        entries = list(self.controller.engine.page_table.all_entries().values())
-        if not entries:
-            empty = FONT_MAIN.render("No pages touched yet.", True, COLOR_TEXT_DIM)
+        page_table = self.controller.engine.page_table
+        if not len(page_table):
+            empty = render_text(FONT_MAIN, "No pages touched yet.", COLOR_TEXT_DIM)
             self.screen.blit(empty, (x + 20, y + 60))
             return
 
         old_clip = self.screen.get_clip()
         self.screen.set_clip(pygame.Rect(x + 5, y + 50, w - 10, h - 55))
 
-        entries.sort(key=lambda e: e.page)
         highlight_page = self.last_step_result.page if self.last_step_result else None
 
         line_height = 26
@@ -752,11 +959,8 @@ class MemoryVisualizer:
 
         start_index = 0
         if highlight_page is not None:
-            for idx, entry in enumerate(entries):
-                if entry.page == highlight_page:
-                    start_index = max(0, idx - visible // 2)
-                    break
-        entries = entries[start_index:start_index + visible]
+            start_index = max(0, page_table.index_of(highlight_page) - visible // 2)
+        entries = page_table.entries_from(start_index, visible)
 
         for i, entry in enumerate(entries):
             line_y = start_y + i * line_height
@@ -788,7 +992,7 @@ class MemoryVisualizer:
 
             line = f"P{entry.page:03d} | {phys_range} | {flags_text} | {write_info}"
             color = (0, 0, 0) if entry.page == highlight_page else COLOR_TEXT_MAIN
-            text_surf = FONT_SMALL.render(line, True, color)
+            text_surf = render_text(FONT_SMALL, line, color)
             self.screen.blit(text_surf, (x + 15, line_y))
             
         self.screen.set_clip(old_clip)
@@ -833,8 +1037,8 @@ class MemoryVisualizer:
                 color = COLOR_GREEN if is_hit else (70, 70, 70)
                 pygame.draw.rect(self.screen, color, rect, border_radius=8)
                 
-                txt_page = FONT_MAIN.render(f"Page: {entry.page}", True, COLOR_TEXT_MAIN)
-                txt_frame = FONT_MAIN.render(f"Frame: {entry.frame}", True, COLOR_TEXT_MAIN)
+                txt_page = render_text(FONT_MAIN, f"Page: {entry.page}", COLOR_TEXT_MAIN)
+                txt_frame = render_text(FONT_MAIN, f"Frame: {entry.frame}", COLOR_TEXT_MAIN)
                 
                 self.screen.blit(txt_page, (ex + 15, ey + 10))
                 self.screen.blit(txt_frame, (ex + 15, ey + 42))
@@ -842,7 +1046,7 @@ class MemoryVisualizer:
                 pygame.draw.rect(self.screen, (40, 40, 40), rect, border_radius=8)
                 pygame.draw.rect(self.screen, (60, 60, 60), rect, 2, border_radius=8)
                 
-                empty_txt = FONT_MAIN.render("Empty", True, COLOR_TEXT_DIM)
+                empty_txt = render_text(FONT_MAIN, "Empty", COLOR_TEXT_DIM)
                 txt_rect = empty_txt.get_rect(center=rect.center)
                 self.screen.blit(empty_txt, txt_rect)
             
@@ -873,7 +1077,7 @@ class MemoryVisualizer:
         line_height = 22
         start_y = y + 45
         for i, line in enumerate(lines):
-            surf = FONT_MAIN.render(line, True, COLOR_TEXT_MAIN)
+            surf = render_text(FONT_MAIN, line, COLOR_TEXT_MAIN)
             self.screen.blit(surf, (x + 15, start_y + i * line_height))
             
         pygame.draw.line(self.screen, COLOR_BORDER, (split_x, y + 50), (split_x, y + h - 10), 2)
@@ -881,7 +1085,7 @@ class MemoryVisualizer:
         ref_x = split_x + 10
         ref_w = w - (split_x - x) - 20
         
-        self.screen.blit(FONT_MAIN.render("Upcoming Operations:", True, COLOR_ACCENT), (ref_x, y + 50))
+        self.screen.blit(render_text(FONT_MAIN, "Upcoming Operations:", COLOR_ACCENT), (ref_x, y + 50))
         
         current_step = self.controller.engine.current_step
         visible_items = max(1, (h - 90) // 25)
@@ -902,7 +1106,7 @@ class MemoryVisualizer:
                 pygame.draw.rect(self.screen, bg_col, bg_rect, border_radius=4)
                 
             txt = f"{i+1}. {op} @ {addr} (Pg {addr >> self.vm_config.offset_bits})"
-            surf = FONT_SMALL.render(txt, True, col)
+            surf = render_text(FONT_SMALL, txt, col)
             self.screen.blit(surf, (ref_x + 5, line_y))
 
         self.screen.set_clip(old_clip)